@@ -1,4 +1,4 @@
 """MCP Google Tools package."""
 
 __version__ = "1.0.0"
-__all__ = ["config", "auth", "security", "operations", "server", "handlers"]
+__all__ = ["config", "auth", "security", "operations", "services", "server", "handlers"]
@@ -0,0 +1,136 @@
+"""Asyncio execution of googleapiclient requests.
+
+Discovery clients are still used to *build* requests (URL, query string,
+body, response model), but the HTTP round-trip is awaited on a shared
+``httpx.AsyncClient`` instead of blocking a worker thread. Many concurrent
+reads can therefore share one event loop.
+"""
+
+import asyncio
+import weakref
+from typing import Any, List, Optional, Sequence
+
+import httplib2
+import httpx
+from googleapiclient.errors import HttpError
+
+from .auth import get_credential_manager
+from .batching import BatchResult
+from .config import Config
+from .services import cached_service, get_service as _get_service
+from .transport import REQUEST_TIMEOUT
+
+# An httpx client's connections belong to the loop that opened them, so each
+# event loop gets its own client.
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _get_client(config: Config) -> httpx.AsyncClient:
+    """Return the pooled async client bound to the running event loop."""
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None:
+        client = _clients[loop] = httpx.AsyncClient(
+            timeout=REQUEST_TIMEOUT,
+            limits=httpx.Limits(
+                max_keepalive_connections=config.http_pool_size,
+                keepalive_expiry=config.http_idle_timeout,
+            ),
+        )
+    return client
+
+
+async def aclose() -> None:
+    """Close the running loop's client (call before the loop shuts down)."""
+    client = _clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+
+async def _get_creds(config: Config):
+    manager = get_credential_manager(config)
+    creds = manager.peek()
+    if creds is None:
+        # Loading or refreshing touches disk/network; keep it off the loop.
+        creds = await asyncio.to_thread(manager.get)
+    return creds
+
+
+async def _send(config: Config, request: Any, creds: Any) -> httpx.Response:
+    headers = dict(request.headers)
+    headers.pop("content-length", None)
+    creds.apply(headers)
+    return await _get_client(config).request(
+        request.method, request.uri, content=request.body, headers=headers
+    )
+
+
+async def get_service(config: Config, api: str, version: str) -> Any:
+    """Async counterpart of :func:`mcp_google.services.get_service`.
+
+    A client already built for the current, valid credentials is returned
+    on the loop. Otherwise building it (discovery parsing) or loading and
+    refreshing the token runs on a worker thread.
+    """
+    creds = get_credential_manager(config).peek()
+    if creds is not None:
+        service = cached_service(config, api, version, creds)
+        if service is not None:
+            return service
+    return await asyncio.to_thread(_get_service, config, api, version)
+
+
+async def execute(config: Config, request: Any) -> Any:
+    """Await a googleapiclient ``HttpRequest`` and return its parsed result.
+
+    With ``config.async_http`` disabled the request is executed on a worker
+    thread through the regular pooled transport. A 401 refreshes the token
+    once through the credential manager and retries once, as the sync
+    transport does.
+    """
+    if not config.async_http:
+        return await asyncio.to_thread(request.execute)
+
+    creds = await _get_creds(config)
+    resp = await _send(config, request, creds)
+    if resp.status_code == 401:
+        manager = get_credential_manager(config)
+        await asyncio.to_thread(manager.refresh_rejected, creds.token)
+        resp = await _send(config, request, await _get_creds(config))
+
+    info = {key.lower(): value for key, value in resp.headers.items()}
+    info.pop("content-encoding", None)
+    info.pop("content-length", None)
+    info["status"] = str(resp.status_code)
+    response = httplib2.Response(info)
+    response.reason = resp.reason_phrase
+    content = resp.content
+
+    if response.status >= 300:
+        raise HttpError(response, content, uri=request.uri)
+    return request.postproc(response, content)
+
+
+async def execute_all(
+    config: Config, requests: Sequence[Any], concurrency: Optional[int] = None
+) -> List[BatchResult]:
+    """Await many requests with bounded concurrency.
+
+    Async counterpart of :func:`mcp_google.batching.execute_batch`: returns
+    one ``(response, error)`` pair per request, in input order. At most
+    ``concurrency`` (default: ``config.http_pool_size``) requests are in
+    flight, so the fan-out reuses pooled connections instead of opening new
+    ones.
+    """
+    semaphore = asyncio.Semaphore(concurrency or config.http_pool_size)
+
+    async def _one(request: Any) -> BatchResult:
+        async with semaphore:
+            try:
+                return await execute(config, request), None
+            except HttpError as e:
+                return None, e
+
+    return list(await asyncio.gather(*(_one(request) for request in requests)))
@@ -1,46 +1,223 @@
+import logging
 import os
-from typing import Optional
+import tempfile
+import threading
+from datetime import timedelta
+from typing import Dict, Optional, Tuple
 
+from google.auth import _helpers
 from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
 
 from .config import Config
 
+_logger = logging.getLogger("GoogleToolsMCP.auth")
 
-def get_creds(config: Config) -> Credentials:
-    """Get OAuth credentials, refreshing or running auth flow if needed."""
-    creds: Optional[Credentials] = None
 
-    if os.path.exists(config.token_file):
-        try:
-            creds = Credentials.from_authorized_user_file(
-                config.token_file, config.scopes
-            )
-        except Exception:
-            creds = None
+class CredentialManager:
+    """Process-wide holder of OAuth credentials for one token file.
+
+    Credentials are parsed from ``token.json`` once and kept in memory. The
+    file's mtime is checked on every access so that an external re-auth (or a
+    second server process writing the token) is picked up. A daemon timer
+    refreshes the access token ``config.token_refresh_margin`` seconds before
+    it expires, so request paths normally never refresh inline.
+    """
 
-    if not creds or not creds.valid:
-        if creds and creds.expired and creds.refresh_token:
+    def __init__(self, config: Config) -> None:
+        self._config = config
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._creds: Optional[Credentials] = None
+        self._mtime: Optional[float] = None
+        self._timer: Optional[threading.Timer] = None
+
+    def get(self) -> Credentials:
+        """Return valid credentials, loading or refreshing them if needed."""
+        with self._lock:
+            mtime = self._token_mtime()
+            if self._creds is None or mtime != self._mtime:
+                self._creds = self._load()
+                self._mtime = mtime
+                self._schedule_refresh()
+            creds = self._creds
+
+        if creds and creds.valid:
+            return creds
+
+        if creds and creds.refresh_token:
             try:
-                creds.refresh(Request())
-            except Exception:
+                creds = self._refresh(timedelta(0))
+            except Exception as exc:
+                _logger.warning("Token refresh failed: %s", exc)
                 creds = None
 
-        if not creds:
-            if not os.path.exists(config.client_secrets_file):
-                raise FileNotFoundError(
-                    f"Client secrets file not found at {config.client_secrets_file}"
-                )
-            flow = InstalledAppFlow.from_client_secrets_file(
-                config.client_secrets_file, config.scopes
+        if creds and creds.valid:
+            return creds
+
+        with self._refresh_lock:
+            with self._lock:
+                creds = self._creds
+            if creds and creds.valid:
+                return creds
+            creds = self._run_flow()
+            self._store(creds)
+        return creds
+
+    def peek(self) -> Optional[Credentials]:
+        """Return the cached credentials if they are usable without I/O.
+
+        Returns ``None`` when the token file changed or the token needs a
+        refresh; callers on an event loop then fall back to ``get()`` in a
+        worker thread.
+        """
+        with self._lock:
+            if self._creds is None or self._token_mtime() != self._mtime:
+                return None
+            creds = self._creds
+        return creds if creds.valid else None
+
+    def _refresh(self, margin: timedelta) -> Optional[Credentials]:
+        """Single-flight refresh of the cached credentials.
+
+        Only one thread talks to the token endpoint; threads that queue up
+        behind it re-check the cached token and return it once it is fresh.
+        """
+        with self._refresh_lock:
+            with self._lock:
+                creds = self._creds
+            if not creds or not creds.refresh_token:
+                return creds
+            if not _expires_within(creds, margin):
+                return creds
+            creds.refresh(Request())
+            self._store(creds)
+            return creds
+
+    def refresh_rejected(self, token: Optional[str]) -> Optional[Credentials]:
+        """Refresh after the API answered 401 for ``token``.
+
+        Single-flight like ``_refresh``; if another thread has already
+        replaced ``token``, the newer credentials are returned as they are.
+        """
+        with self._refresh_lock:
+            with self._lock:
+                creds = self._creds
+            if not creds or not creds.refresh_token or creds.token != token:
+                return creds
+            creds.refresh(Request())
+            self._store(creds)
+            return creds
+
+    def _token_mtime(self) -> Optional[float]:
+        try:
+            return os.stat(self._config.token_file).st_mtime
+        except OSError:
+            return None
+
+    def _load(self) -> Optional[Credentials]:
+        if not os.path.exists(self._config.token_file):
+            return None
+        try:
+            return Credentials.from_authorized_user_file(
+                self._config.token_file, self._config.scopes
             )
-            creds = flow.run_local_server(port=0)
+        except Exception:
+            return None
+
+    def _run_flow(self) -> Credentials:
+        if not os.path.exists(self._config.client_secrets_file):
+            raise FileNotFoundError(
+                f"Client secrets file not found at {self._config.client_secrets_file}"
+            )
+        flow = InstalledAppFlow.from_client_secrets_file(
+            self._config.client_secrets_file, self._config.scopes
+        )
+        return flow.run_local_server(port=0)
+
+    def _store(self, creds: Credentials) -> None:
+        _atomic_write(self._config.token_file, creds.to_json())
+        with self._lock:
+            self._creds = creds
+            self._mtime = self._token_mtime()
+            self._schedule_refresh()
+
+    def _schedule_refresh(self) -> None:
+        """(Re)arm the background refresh timer. Caller holds ``_lock``."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        creds = self._creds
+        if not creds or not creds.refresh_token or not creds.expiry:
+            return
+
+        margin = timedelta(seconds=self._config.token_refresh_margin)
+        delay = (creds.expiry - margin - _helpers.utcnow()).total_seconds()
+        self._timer = threading.Timer(max(delay, 0.0), self._background_refresh)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _background_refresh(self) -> None:
+        margin = timedelta(seconds=self._config.token_refresh_margin)
+        try:
+            self._refresh(margin)
+        except Exception as exc:
+            # Leave the stale token in place; the next get() retries inline.
+            _logger.warning("Background token refresh failed: %s", exc)
+            return
+        _logger.debug("OAuth token refreshed in background")
+
+
+def _expires_within(creds: Credentials, margin: timedelta) -> bool:
+    if not creds.valid:
+        return True
+    if not creds.expiry:
+        return False
+    return creds.expiry - margin <= _helpers.utcnow()
 
-        token_dir = os.path.dirname(config.token_file)
-        if token_dir:
-            os.makedirs(token_dir, exist_ok=True)
-        with open(config.token_file, "w", encoding="utf-8") as token:
-            token.write(creds.to_json())
 
-    return creds
+def _atomic_write(path: str, data: str) -> None:
+    """Write ``data`` to ``path`` via a temp file and rename.
+
+    Readers (including other server processes) never observe a partially
+    written token file.
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(
+        dir=directory or None, prefix=".token-", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as tmp:
+            tmp.write(data)
+            tmp.flush()
+            os.fsync(tmp.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+_managers: Dict[Tuple[str, Tuple[str, ...]], CredentialManager] = {}
+_managers_lock = threading.Lock()
+
+
+def get_credential_manager(config: Config) -> CredentialManager:
+    """Return the process-wide manager for ``config.token_file``."""
+    key = (config.token_file, tuple(config.scopes))
+    with _managers_lock:
+        manager = _managers.get(key)
+        if manager is None:
+            manager = _managers[key] = CredentialManager(config)
+        return manager
+
+
+def get_creds(config: Config) -> Credentials:
+    """Get OAuth credentials, refreshing or running auth flow if needed."""
+    return get_credential_manager(config).get()
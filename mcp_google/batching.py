@@ -0,0 +1,114 @@
+"""Google HTTP batch requests and chunked bulk calls.
+
+Many Google APIs accept up to 100 calls in one multipart request to their
+batch endpoint. Fetching N items through a batch costs ceil(N / 100) HTTP
+round-trips instead of N. Each sub-request succeeds or fails on its own, so
+results are returned per request rather than raising on the first error.
+
+Bulk endpoints (``batchModify``, ``batchDelete``) take a bounded list of IDs
+per call instead; :func:`run_chunks` spreads a stream of such chunks over a
+few worker threads.
+"""
+
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+)
+
+from googleapiclient.errors import HttpError
+
+# Hard limit of the Google batch endpoint.
+BATCH_SIZE = 100
+
+BatchResult = Tuple[Any, Optional[HttpError]]
+
+
+def execute_batch(
+    service: Any, requests: Sequence[Any], batch_size: int = BATCH_SIZE
+) -> List[BatchResult]:
+    """Execute ``requests`` through ``service``'s batch endpoint.
+
+    Returns one ``(response, error)`` pair per request, in input order.
+    """
+    results: List[BatchResult] = [(None, None)] * len(requests)
+    batch_size = max(1, min(batch_size, BATCH_SIZE))
+
+    def _collect(request_id: str, response: Any, exception: Optional[HttpError]) -> None:
+        results[int(request_id)] = (response, exception)
+
+    for start in range(0, len(requests), batch_size):
+        batch = service.new_batch_http_request(callback=_collect)
+        for index in range(start, min(start + batch_size, len(requests))):
+            batch.add(requests[index], request_id=str(index))
+        batch.execute()
+    return results
+
+
+T = TypeVar("T")
+
+
+def chunked(pages: Iterable[Sequence[T]], size: int) -> Iterator[List[T]]:
+    """Regroup a stream of pages into lists of at most ``size`` items."""
+    chunk: List[T] = []
+    for page in pages:
+        for item in page:
+            chunk.append(item)
+            if len(chunk) == size:
+                yield chunk
+                chunk = []
+    if chunk:
+        yield chunk
+
+
+@dataclass
+class ChunkOutcome:
+    index: int
+    size: int
+    error: Optional[Exception] = None
+
+
+def run_chunks(
+    fn: Callable[[List[T]], Any],
+    chunks: Iterable[List[T]],
+    concurrency: int,
+    on_done: Optional[Callable[[ChunkOutcome], None]] = None,
+) -> List[ChunkOutcome]:
+    """Call ``fn(chunk)`` for every chunk with at most ``concurrency`` running.
+
+    ``chunks`` is consumed lazily: only the chunks currently in flight are
+    held in memory, so an ID stream read page by page never has to be
+    materialised. A failing chunk does not stop the others; its exception is
+    recorded in the returned outcomes (ordered by chunk index).
+    ``on_done`` is called as each chunk finishes, e.g. to log progress.
+    """
+    outcomes: List[ChunkOutcome] = []
+    pending: Dict[Future, ChunkOutcome] = {}
+
+    def _collect(done: Iterable[Future]) -> None:
+        for future in done:
+            outcome = pending.pop(future)
+            outcome.error = future.exception()
+            outcomes.append(outcome)
+            if on_done is not None:
+                on_done(outcome)
+
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+        for index, chunk in enumerate(chunks):
+            if len(pending) >= concurrency:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                _collect(done)
+            pending[pool.submit(fn, chunk)] = ChunkOutcome(index, len(chunk))
+        _collect(wait(pending).done)
+
+    outcomes.sort(key=lambda outcome: outcome.index)
+    return outcomes
@@ -0,0 +1,121 @@
+"""Read-through result cache for read-only tools.
+
+Entries expire after a per-tool TTL and are evicted least-recently-used
+once the cache exceeds its byte budget. Every entry carries *tags* naming
+the Google resources it was built from (``sheet:<id>``, ``doc:<id>``,
+``drive`` ...). Write tools invalidate the tags they touch, and a
+per-tag generation counter keeps a read that raced with a write from
+re-inserting stale data.
+"""
+
+import string
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from .operations import BinaryResult
+
+_formatter = string.Formatter()
+
+
+def expand_tags(templates: Iterable[str], kwargs: Mapping[str, Any]) -> List[str]:
+    """Render tag templates such as ``"sheet:{spreadsheet_id}"``.
+
+    List-valued arguments expand to one tag per item; templates referring to
+    a missing/``None`` argument are skipped.
+    """
+    tags: List[str] = []
+    for template in templates:
+        fields = [name for _, name, _, _ in _formatter.parse(template) if name]
+        if not fields:
+            tags.append(template)
+            continue
+        value = kwargs.get(fields[0])
+        if value is None:
+            continue
+        values = value if isinstance(value, (list, tuple)) else [value]
+        tags.extend(template.format(**{fields[0]: item}) for item in values)
+    return tags
+
+
+def result_size(value: Any) -> int:
+    if isinstance(value, BinaryResult):
+        return len(value.data)
+    return len(str(value).encode("utf-8"))
+
+
+def is_error_result(value: Any) -> bool:
+    """Handlers report failures as text; never cache those."""
+    return isinstance(value, str) and value.lstrip().startswith(("Error", "❌"))
+
+
+@dataclass
+class _Entry:
+    value: Any
+    expires_at: float
+    size: int
+    tags: Tuple[str, ...]
+
+
+class ResultCache:
+    """Bounded TTL/LRU cache keyed by canonical tool-call identity."""
+
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._size = 0
+        self._generations: Dict[str, int] = {}
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return False, None
+        if entry.expires_at <= time.monotonic():
+            self._remove(key)
+            return False, None
+        self._entries.move_to_end(key)
+        return True, entry.value
+
+    def snapshot(self, tags: Iterable[str]) -> Tuple[int, ...]:
+        """Generation of ``tags``; pass to :meth:`put` to detect racing writes."""
+        return tuple(self._generations.get(tag, 0) for tag in tags)
+
+    def put(
+        self,
+        key: str,
+        value: Any,
+        ttl: float,
+        tags: Iterable[str],
+        snapshot: Optional[Tuple[int, ...]] = None,
+    ) -> None:
+        tags = tuple(tags)
+        if snapshot is not None and snapshot != self.snapshot(tags):
+            return
+        size = result_size(value)
+        # A single huge result would flush everything else.
+        if size > self.max_bytes // 4:
+            return
+
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = _Entry(value, time.monotonic() + ttl, size, tags)
+        self._size += size
+        while self._size > self.max_bytes and self._entries:
+            self._remove(next(iter(self._entries)))
+
+    def invalidate(self, tags: Iterable[str]) -> int:
+        """Drop every entry carrying any of ``tags``; return how many."""
+        tags = set(tags)
+        if not tags:
+            return 0
+        for tag in tags:
+            self._generations[tag] = self._generations.get(tag, 0) + 1
+        stale = [key for key, entry in self._entries.items() if tags.intersection(entry.tags)]
+        for key in stale:
+            self._remove(key)
+        return len(stale)
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key)
+        self._size -= entry.size
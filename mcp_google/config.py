@@ -1,7 +1,7 @@
 import json
 import logging as _logging
 import os
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Any, Dict, List, Optional
 
 DEFAULT_SCOPES = [
@@ -24,6 +24,24 @@ class Config:
     mcp_auth_token: Optional[str]
     scopes: List[str]
     log_level: int = _logging.INFO
+    token_refresh_margin: int = 300
+    http_pool_size: int = 10
+    http_idle_timeout: int = 120
+    async_http: bool = True
+    service_workers: Dict[str, int] = field(default_factory=dict)
+    service_queue_depth: int = 32
+    result_cache_max_bytes: int = 32 * 1024 * 1024
+    result_cache_ttls: Dict[str, float] = field(default_factory=dict)
+    gmail_sync: bool = False
+    gmail_sync_db: str = ""
+    gmail_sync_days: int = 30
+    gmail_sync_interval: float = 10
+    gmail_fts: bool = False
+    gmail_fts_interval: float = 60
+    attachment_dir: str = ""
+    drive_sync: bool = False
+    drive_sync_db: str = ""
+    drive_sync_interval: float = 30
 
 
 def _default_path(*parts: str) -> str:
@@ -53,6 +71,12 @@ def _load_config_file(path: str) -> Dict[str, Any]:
     raise ValueError(f"Unsupported config format: {ext}")
 
 
+def _as_bool(value: Any) -> bool:
+    if isinstance(value, str):
+        return value.strip().lower() in ("1", "true", "yes", "on")
+    return bool(value)
+
+
 def load_config() -> Config:
     config_path = os.environ.get("MCP_CONFIG_FILE")
     file_config = _load_config_file(config_path) if config_path else {}
@@ -83,6 +107,81 @@ def load_config() -> Config:
     )
     log_level = getattr(_logging, log_level_str.upper(), _logging.INFO)
 
+    token_refresh_margin = int(
+        os.environ.get(
+            "GOOGLE_TOKEN_REFRESH_MARGIN", file_config.get("token_refresh_margin", 300)
+        )
+    )
+
+    http_pool_size = int(
+        os.environ.get("GOOGLE_HTTP_POOL_SIZE", file_config.get("http_pool_size", 10))
+    )
+    http_idle_timeout = int(
+        os.environ.get(
+            "GOOGLE_HTTP_IDLE_TIMEOUT", file_config.get("http_idle_timeout", 120)
+        )
+    )
+    async_http = _as_bool(
+        os.environ.get("GOOGLE_ASYNC_HTTP", file_config.get("async_http", True))
+    )
+
+    service_workers = {
+        str(name): int(workers)
+        for name, workers in (file_config.get("service_workers") or {}).items()
+    }
+    service_queue_depth = int(
+        os.environ.get(
+            "GOOGLE_SERVICE_QUEUE_DEPTH", file_config.get("service_queue_depth", 32)
+        )
+    )
+    result_cache_max_bytes = int(
+        os.environ.get(
+            "GOOGLE_RESULT_CACHE_MAX_BYTES",
+            file_config.get("result_cache_max_bytes", 32 * 1024 * 1024),
+        )
+    )
+    result_cache_ttls = {
+        str(name): float(ttl)
+        for name, ttl in (file_config.get("result_cache_ttls") or {}).items()
+    }
+    gmail_sync = _as_bool(
+        os.environ.get("GOOGLE_GMAIL_SYNC", file_config.get("gmail_sync", False))
+    )
+    gmail_sync_db = os.environ.get(
+        "GOOGLE_GMAIL_SYNC_DB",
+        file_config.get("gmail_sync_db", _default_path(".google", "gmail_sync.db")),
+    )
+    gmail_sync_days = int(
+        os.environ.get("GOOGLE_GMAIL_SYNC_DAYS", file_config.get("gmail_sync_days", 30))
+    )
+    gmail_sync_interval = float(
+        os.environ.get(
+            "GOOGLE_GMAIL_SYNC_INTERVAL", file_config.get("gmail_sync_interval", 10)
+        )
+    )
+    gmail_fts = _as_bool(
+        os.environ.get("GOOGLE_GMAIL_FTS", file_config.get("gmail_fts", False))
+    )
+    gmail_fts_interval = float(
+        os.environ.get("GOOGLE_GMAIL_FTS_INTERVAL", file_config.get("gmail_fts_interval", 60))
+    )
+    attachment_dir = os.environ.get(
+        "GOOGLE_ATTACHMENT_DIR",
+        file_config.get("attachment_dir", _default_path(".google", "attachments")),
+    )
+    drive_sync = _as_bool(
+        os.environ.get("GOOGLE_DRIVE_SYNC", file_config.get("drive_sync", False))
+    )
+    drive_sync_db = os.environ.get(
+        "GOOGLE_DRIVE_SYNC_DB",
+        file_config.get("drive_sync_db", _default_path(".google", "drive_sync.db")),
+    )
+    drive_sync_interval = float(
+        os.environ.get(
+            "GOOGLE_DRIVE_SYNC_INTERVAL", file_config.get("drive_sync_interval", 30)
+        )
+    )
+
     return Config(
         client_secrets_file=client_secrets_file,
         token_file=token_file,
@@ -91,4 +190,22 @@ def load_config() -> Config:
         mcp_auth_token=mcp_auth_token,
         scopes=scopes,
         log_level=log_level,
+        token_refresh_margin=token_refresh_margin,
+        http_pool_size=http_pool_size,
+        http_idle_timeout=http_idle_timeout,
+        async_http=async_http,
+        service_workers=service_workers,
+        service_queue_depth=service_queue_depth,
+        result_cache_max_bytes=result_cache_max_bytes,
+        result_cache_ttls=result_cache_ttls,
+        gmail_sync=gmail_sync,
+        gmail_sync_db=gmail_sync_db,
+        gmail_sync_days=gmail_sync_days,
+        gmail_sync_interval=gmail_sync_interval,
+        gmail_fts=gmail_fts,
+        gmail_fts_interval=gmail_fts_interval,
+        attachment_dir=attachment_dir,
+        drive_sync=drive_sync,
+        drive_sync_db=drive_sync_db,
+        drive_sync_interval=drive_sync_interval,
     )
@@ -0,0 +1,230 @@
+"""Tool registry: handler lookup, argument binding and schema validation.
+
+The registry is built once at startup from the tool definitions, so a tool
+call costs one dict lookup plus a precompiled validator instead of
+rebuilding a table of closures on every request. Arguments are checked
+against the tool's ``inputSchema`` before any Google traffic happens, and
+identical concurrent read-only calls are coalesced into one.
+"""
+
+import asyncio
+import inspect
+import json
+from dataclasses import dataclass
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+)
+
+import mcp.types as types
+
+from .cache import ResultCache, is_error_result
+
+Validator = Callable[[Any, str], None]
+
+_JSON_TYPES: Dict[str, Callable[[Any], bool]] = {
+    "object": lambda v: isinstance(v, dict),
+    "array": lambda v: isinstance(v, list),
+    "string": lambda v: isinstance(v, str),
+    "boolean": lambda v: isinstance(v, bool),
+    "integer": lambda v: isinstance(v, int) and not isinstance(v, bool),
+    "number": lambda v: isinstance(v, (int, float)) and not isinstance(v, bool),
+}
+
+
+def compile_schema(schema: Mapping[str, Any]) -> Validator:
+    """Compile the JSON Schema subset used by tool definitions.
+
+    Supports ``type``, ``properties``, ``required``, ``enum`` and ``items``.
+    Unknown properties are accepted, and an explicit ``null`` for an optional
+    property is treated as "not provided", matching how handlers read
+    arguments.
+    """
+    checks: List[Validator] = []
+
+    type_name = schema.get("type")
+    if type_name in _JSON_TYPES:
+        is_type = _JSON_TYPES[type_name]
+
+        def check_type(value: Any, path: str) -> None:
+            if not is_type(value):
+                raise ValueError(f"{path} must be of type {type_name}")
+
+        checks.append(check_type)
+
+    if "enum" in schema:
+        allowed = list(schema["enum"])
+
+        def check_enum(value: Any, path: str) -> None:
+            if value not in allowed:
+                raise ValueError(f"{path} must be one of {allowed}")
+
+        checks.append(check_enum)
+
+    if "items" in schema:
+        check_item = compile_schema(schema["items"])
+
+        def check_items(value: Any, path: str) -> None:
+            if isinstance(value, list):
+                for index, item in enumerate(value):
+                    check_item(item, f"{path}[{index}]")
+
+        checks.append(check_items)
+
+    if "properties" in schema or "required" in schema:
+        properties = {
+            name: compile_schema(sub)
+            for name, sub in schema.get("properties", {}).items()
+        }
+        required = list(schema.get("required", []))
+
+        def check_object(value: Any, path: str) -> None:
+            if not isinstance(value, dict):
+                return
+            for name in required:
+                if value.get(name) is None:
+                    raise ValueError(f"{path}.{name} is required")
+            for name, check in properties.items():
+                if value.get(name) is not None:
+                    check(value[name], f"{path}.{name}")
+
+        checks.append(check_object)
+
+    def validate(value: Any, path: str = "arguments") -> None:
+        for check in checks:
+            check(value, path)
+
+    return validate
+
+
+Binder = Callable[[Mapping[str, Any]], Dict[str, Any]]
+
+
+def make_binder(handler: Callable[..., Any], schema: Mapping[str, Any]) -> Binder:
+    """Map tool arguments onto ``handler``'s keyword parameters.
+
+    Parameters after ``(config, logger)`` are bound by name. A missing
+    argument falls back to the schema ``default``, then to the handler's own
+    default, then to ``None``.
+    """
+    properties = schema.get("properties", {})
+    params = []
+    for param in list(inspect.signature(handler).parameters.values())[2:]:
+        if "default" in properties.get(param.name, {}):
+            default = properties[param.name]["default"]
+        elif param.default is not inspect.Parameter.empty:
+            default = param.default
+        else:
+            default = None
+        params.append((param.name, default))
+
+    def bind(arguments: Mapping[str, Any]) -> Dict[str, Any]:
+        return {name: arguments.get(name, default) for name, default in params}
+
+    return bind
+
+
+@dataclass(frozen=True)
+class ToolSpec:
+    name: str
+    service: str
+    read_only: bool
+    handler: Callable[..., Any]
+    async_handler: Optional[Callable[..., Awaitable[Any]]]
+    bind: Binder
+    validate: Validator
+    # Result-cache policy: TTL in seconds (0 = not cached) and the resource
+    # tag templates the result depends on / a write invalidates.
+    cache_ttl: float = 0
+    cache_tags: Tuple[str, ...] = ()
+    invalidates: Tuple[str, ...] = ()
+
+
+def build_registry(
+    tools: List[types.Tool],
+    handlers: Mapping[str, Callable[..., Any]],
+    async_handlers: Mapping[str, Callable[..., Awaitable[Any]]],
+    services: Mapping[str, str],
+    cache_policies: Mapping[str, Tuple[float, Tuple[str, ...]]] = {},
+    invalidations: Mapping[str, Tuple[str, ...]] = {},
+) -> Dict[str, ToolSpec]:
+    """Build the name -> :class:`ToolSpec` table for every declared tool."""
+    registry: Dict[str, ToolSpec] = {}
+    for tool in tools:
+        if tool.name not in handlers:
+            raise ValueError(f"No handler registered for tool: {tool.name}")
+        cache_ttl, cache_tags = cache_policies.get(tool.name, (0, ()))
+        registry[tool.name] = ToolSpec(
+            name=tool.name,
+            service=services[tool.name],
+            read_only=bool(tool.annotations and tool.annotations.readOnlyHint),
+            handler=handlers[tool.name],
+            async_handler=async_handlers.get(tool.name),
+            bind=make_binder(handlers[tool.name], tool.inputSchema),
+            validate=compile_schema(tool.inputSchema),
+            cache_ttl=cache_ttl,
+            cache_tags=tuple(cache_tags),
+            invalidates=tuple(invalidations.get(tool.name, ())),
+        )
+    return registry
+
+
+def call_key(name: str, kwargs: Mapping[str, Any]) -> str:
+    """Canonical identity of a tool call (name + bound arguments)."""
+    return name + ":" + json.dumps(
+        kwargs, sort_keys=True, separators=(",", ":"), default=str
+    )
+
+
+class InflightCoalescer:
+    """Share one in-flight call between identical concurrent requests.
+
+    Agents often fire the same read several times in parallel; every caller
+    that arrives while an identical call is still running awaits the same
+    task instead of issuing its own upstream request. Callers that cancel
+    do not cancel the shared task.
+    """
+
+    def __init__(self) -> None:
+        self._inflight: Dict[str, "asyncio.Future[Any]"] = {}
+
+    async def run(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda _task: self._inflight.pop(key, None))
+        return await asyncio.shield(task)
+
+
+async def cached_call(
+    cache: ResultCache,
+    coalescer: InflightCoalescer,
+    key: str,
+    tags: Iterable[str],
+    ttl: float,
+    fn: Callable[[], Awaitable[Any]],
+) -> Any:
+    """Run a read-only call through ``coalescer`` and store it in ``cache``.
+
+    The tag snapshot is taken by the call that actually runs ``fn``, and
+    only that call stores the result: a caller that joins a read started
+    before a write must not store the pre-write result as fresh.
+    """
+    tags = tuple(tags)
+
+    async def _read() -> Any:
+        snapshot = cache.snapshot(tags)
+        result = await fn()
+        if ttl and not is_error_result(result):
+            cache.put(key, result, ttl, tags, snapshot)
+        return result
+
+    return await coalescer.run(key, _read)
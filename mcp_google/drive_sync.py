@@ -0,0 +1,474 @@
+"""Local Drive metadata mirror kept current with the changes API.
+
+A background worker seeds the mirror once with the metadata of every file
+the account can list (``files.list``, 1,000 files per page), then replays
+``changes.list`` from the start page token read before seeding. Name,
+parent, MIME type and recency queries are answered from SQLite; upstream
+traffic is reduced to one ``changes.list`` call per ``drive_sync_interval``.
+
+Until the first seed has finished, and for any query using operators the
+mirror cannot evaluate (``fullText``, ``owners``, ``or`` ...), callers get
+``None`` and query Drive as before.
+"""
+
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from googleapiclient.errors import HttpError
+
+from .auth import get_credential_manager
+from .config import Config
+from .handlers import drive as drive_api
+from .services import get_service
+
+_logger = logging.getLogger("GoogleToolsMCP.drive_sync")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS files (
+    id TEXT PRIMARY KEY,
+    name TEXT,
+    mime_type TEXT,
+    owners TEXT,
+    modified_time TEXT,
+    created_time TEXT,
+    md5_checksum TEXT,
+    size INTEGER,
+    web_view_link TEXT,
+    trashed INTEGER
+);
+CREATE INDEX IF NOT EXISTS files_by_modified ON files(modified_time DESC);
+CREATE INDEX IF NOT EXISTS files_by_mime ON files(mime_type);
+CREATE TABLE IF NOT EXISTS file_parents (
+    file_id TEXT,
+    parent_id TEXT,
+    PRIMARY KEY (file_id, parent_id)
+);
+CREATE INDEX IF NOT EXISTS files_by_parent ON file_parents(parent_id, file_id);
+"""
+
+FILE_FIELDS = (
+    "id, name, mimeType, parents, owners(emailAddress), modifiedTime, "
+    "createdTime, md5Checksum, size, webViewLink, trashed"
+)
+_CHANGE_FIELDS = (
+    f"nextPageToken, newStartPageToken, changes(fileId, removed, file({FILE_FIELDS}))"
+)
+
+# One "and"-separated clause of the supported Drive query subset.
+_CLAUSE_RE = re.compile(
+    r"""\s*(?:
+        (?P<field>name|mimeType|modifiedTime)\s*
+            (?P<op>contains|!=|<=|>=|=|<|>)\s*'(?P<value>(?:[^'\\]|\\.)*)'
+      | '(?P<parent>(?:[^'\\]|\\.)*)'\s+in\s+parents
+      | trashed\s*=\s*(?P<trashed>true|false)
+    )\s*""",
+    re.VERBOSE | re.IGNORECASE,
+)
+_AND_RE = re.compile(r"and\b", re.IGNORECASE)
+_WORD_START_RE = re.compile(r"(?:^|[^\w])(\w)")
+
+
+def _unquote(value: str) -> str:
+    return re.sub(r"\\(.)", r"\1", value)
+
+
+def _drive_time(value: str) -> Optional[str]:
+    """Normalise an RFC 3339 date/time to Drive's stored UTC form."""
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    parsed = parsed.astimezone(timezone.utc)
+    return parsed.strftime("%Y-%m-%dT%H:%M:%S.") + f"{parsed.microsecond // 1000:03d}Z"
+
+
+def _name_contains(name: Optional[str], term: str) -> bool:
+    # Drive matches ``name contains`` against the start of the name or of
+    # any word in it ("HelloWorld" matches 'Hello' but not 'World').
+    if not name:
+        return False
+    name, term = name.lower(), term.lower()
+    if name.startswith(term):
+        return True
+    return any(
+        name.startswith(term, match.start(1)) for match in _WORD_START_RE.finditer(name)
+    )
+
+
+def _parse_query(
+    q: Optional[str], root_id: Optional[str]
+) -> Optional[Tuple[str, List[Any]]]:
+    """Translate ``q`` into an SQL condition; ``None`` if unsupported."""
+    clauses: List[str] = []
+    params: List[Any] = []
+    text = (q or "").strip()
+    pos = 0
+    while pos < len(text):
+        if clauses:
+            match = _AND_RE.match(text, pos)
+            if match is None:
+                return None
+            pos = match.end()
+        match = _CLAUSE_RE.match(text, pos)
+        if match is None:
+            return None
+        pos = match.end()
+
+        if match.group("parent") is not None:
+            parent = _unquote(match.group("parent"))
+            if parent == "root":
+                if root_id is None:
+                    return None
+                parent = root_id
+            clauses.append(
+                "id IN (SELECT file_id FROM file_parents WHERE parent_id = ?)"
+            )
+            params.append(parent)
+            continue
+        if match.group("trashed") is not None:
+            clauses.append("trashed = ?")
+            params.append(1 if match.group("trashed").lower() == "true" else 0)
+            continue
+
+        field = match.group("field").lower()
+        op = match.group("op").lower()
+        value = _unquote(match.group("value"))
+        if field == "name" and op == "contains":
+            clauses.append("name_contains(name, ?)")
+        elif field in ("name", "mimetype") and op in ("=", "!="):
+            clauses.append(f"{'name' if field == 'name' else 'mime_type'} {op} ?")
+        elif field == "modifiedtime" and op != "contains":
+            value = _drive_time(value)
+            if value is None:
+                return None
+            clauses.append(f"modified_time {op} ?")
+        else:
+            return None
+        params.append(value)
+    return " AND ".join(clauses) or "1", params
+
+
+def _to_file(row: sqlite3.Row) -> Dict[str, Any]:
+    """Shape a stored row like a ``files`` resource."""
+    file: Dict[str, Any] = {
+        "id": row["id"],
+        "name": row["name"],
+        "mimeType": row["mime_type"],
+        "parents": row["parents"].split(",") if row["parents"] else [],
+        "owners": [
+            {"emailAddress": email}
+            for email in (row["owners"] or "").split(",")
+            if email
+        ],
+        "modifiedTime": row["modified_time"],
+        "createdTime": row["created_time"],
+        "trashed": bool(row["trashed"]),
+    }
+    if row["md5_checksum"]:
+        file["md5Checksum"] = row["md5_checksum"]
+    if row["size"] is not None:
+        file["size"] = str(row["size"])
+    if row["web_view_link"]:
+        file["webViewLink"] = row["web_view_link"]
+    return file
+
+
+_SELECT = (
+    "SELECT f.*, (SELECT GROUP_CONCAT(parent_id) FROM file_parents "
+    "WHERE file_id = f.id) AS parents FROM files f"
+)
+
+
+class DriveSync:
+    """SQLite mirror of file metadata for one Drive account."""
+
+    def __init__(self, config: Config) -> None:
+        self.path = config.drive_sync_db
+        self.interval = config.drive_sync_interval
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.row_factory = sqlite3.Row
+        self._db.create_function("name_contains", 2, _name_contains, deterministic=True)
+        self._db.executescript(_SCHEMA)
+        self._lock = threading.RLock()
+        # Held by the one seed or change replay running at a time.
+        self._sync_lock = threading.Lock()
+        self._synced_at = 0.0
+        self._worker: Optional[threading.Thread] = None
+
+    # -- meta -------------------------------------------------------------
+
+    def _meta(self, key: str) -> Optional[str]:
+        row = self._db.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row["value"] if row else None
+
+    def _set_meta(self, key: str, value: Any) -> None:
+        self._db.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, str(value))
+        )
+
+    @property
+    def ready(self) -> bool:
+        """True once a seed has completed (a change token is stored)."""
+        with self._lock:
+            return self._meta("page_token") is not None
+
+    # -- writes -----------------------------------------------------------
+
+    def _store(self, files: List[Dict[str, Any]]) -> None:
+        for file in files:
+            size = file.get("size")
+            self._db.execute(
+                "INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    file["id"],
+                    file.get("name", ""),
+                    file.get("mimeType", ""),
+                    ",".join(
+                        owner.get("emailAddress", "") for owner in file.get("owners", [])
+                    ),
+                    file.get("modifiedTime", ""),
+                    file.get("createdTime", ""),
+                    file.get("md5Checksum"),
+                    int(size) if size is not None else None,
+                    file.get("webViewLink"),
+                    1 if file.get("trashed") else 0,
+                ),
+            )
+            self._db.execute("DELETE FROM file_parents WHERE file_id = ?", (file["id"],))
+            self._db.executemany(
+                "INSERT OR IGNORE INTO file_parents VALUES (?, ?)",
+                [(file["id"], parent) for parent in file.get("parents", [])],
+            )
+
+    def _delete(self, file_ids: List[str]) -> None:
+        for file_id in file_ids:
+            self._db.execute("DELETE FROM files WHERE id = ?", (file_id,))
+            self._db.execute("DELETE FROM file_parents WHERE file_id = ?", (file_id,))
+
+    # -- sync -------------------------------------------------------------
+
+    def _seed(self, service) -> None:
+        """Rebuild the mirror from a full listing (one seed at a time)."""
+        with self._sync_lock:
+            # Read the change token first so edits made while seeding are
+            # replayed afterwards.
+            token = service.changes().getStartPageToken().execute()["startPageToken"]
+            root_id = service.files().get(fileId="root", fields="id").execute()["id"]
+            with self._lock:
+                self._db.executescript(
+                    "DELETE FROM files; DELETE FROM file_parents; DELETE FROM meta;"
+                )
+            for page in drive_api.iter_file_pages(
+                service, None, f"nextPageToken, files({FILE_FIELDS})"
+            ):
+                with self._lock:
+                    self._store(page)
+                    self._db.commit()
+            with self._lock:
+                self._set_meta("root_id", root_id)
+                self._set_meta("page_token", token)
+                self._db.commit()
+                self._synced_at = 0.0
+                count = self._db.execute("SELECT COUNT(*) FROM files").fetchone()[0]
+        _logger.info("Drive sync seeded: %s file(s)", count)
+
+    def _apply_changes(self, service) -> bool:
+        """Replay changes since the stored token; False if it is no longer valid.
+
+        ``changes.list`` runs outside ``_lock``; each page is then written
+        in one transaction together with its token.
+        """
+        with self._lock:
+            token = self._meta("page_token")
+        while token:
+            try:
+                result = service.changes().list(
+                    pageToken=token,
+                    pageSize=drive_api.DRIVE_PAGE_SIZE,
+                    includeRemoved=True,
+                    spaces="drive",
+                    fields=_CHANGE_FIELDS,
+                ).execute()
+            except HttpError as e:
+                # Drive answers an expired or unknown token with 400/404.
+                if e.resp.status in (400, 404):
+                    return False
+                raise
+            if result.get("newStartPageToken"):
+                next_token, token = result["newStartPageToken"], None
+            else:
+                next_token = token = result.get("nextPageToken")
+            with self._lock:
+                for change in result.get("changes", []):
+                    if change.get("removed") or "file" not in change:
+                        self._delete([change["fileId"]])
+                    else:
+                        self._store([change["file"]])
+                self._set_meta("page_token", next_token)
+                self._db.commit()
+        return True
+
+    def refresh(self, service, force: bool = False) -> None:
+        """Bring a seeded mirror up to date (at most once per sync interval).
+
+        Readers never wait for a replay in progress; they are served what is
+        stored. An invalid change token drops the mirror back to "not
+        ready"; the background worker then reseeds it.
+        """
+        if not self.ready:
+            return
+        if not force and time.monotonic() - self._synced_at < self.interval:
+            return
+        if not self._sync_lock.acquire(blocking=False):
+            return
+        try:
+            if not self._apply_changes(service):
+                _logger.warning("Drive change token expired; reseeding the mirror")
+                with self._lock:
+                    self._db.execute("DELETE FROM meta WHERE key = 'page_token'")
+                    self._db.commit()
+                return
+            self._synced_at = time.monotonic()
+        finally:
+            self._sync_lock.release()
+
+    def expire(self) -> None:
+        """Make the next read replay changes (e.g. after a Drive write)."""
+        self._synced_at = 0.0
+
+    def _sync_loop(self, config: Config, stop: threading.Event) -> None:
+        delay = 0.0
+        while not stop.wait(delay):
+            delay = max(self.interval, 1.0)
+            # Never start an interactive OAuth flow from the background.
+            if get_credential_manager(config).peek() is None:
+                continue
+            try:
+                service = get_service(config, "drive", "v3")
+                if not self.ready:
+                    self._seed(service)
+                self.refresh(service)
+            except Exception as e:
+                _logger.warning("Drive sync failed: %s", e)
+
+    def start(self, config: Config) -> None:
+        if self._worker is not None:
+            return
+        stop = threading.Event()
+        self._worker = threading.Thread(
+            target=self._sync_loop, args=(config, stop), name="drive-sync", daemon=True
+        )
+        self._worker.start()
+
+    # -- reads ------------------------------------------------------------
+
+    def search(
+        self, service, q: Optional[str], limit: int, page_token: Optional[str] = None
+    ) -> Optional[Tuple[List[Dict[str, Any]], Optional[str]]]:
+        """Answer ``q`` locally: (files, next page token) or ``None``.
+
+        Files are shaped like ``files`` resources, newest first. Page tokens
+        issued here start with ``local:``; any other token means the caller
+        started paging upstream and must continue there.
+        """
+        if page_token and not page_token.startswith("local:"):
+            return None
+        if not self.ready:
+            return None
+        self.refresh(service)
+        with self._lock:
+            where = _parse_query(q, self._meta("root_id"))
+            if where is None or self._meta("page_token") is None:
+                return None
+            condition, params = where
+            offset = int(page_token.removeprefix("local:")) if page_token else 0
+            rows = self._db.execute(
+                f"{_SELECT} WHERE {condition} "
+                "ORDER BY modified_time DESC LIMIT ? OFFSET ?",
+                (*params, limit + 1, offset),
+            ).fetchall()
+        files = [_to_file(row) for row in rows]
+        next_token = f"local:{offset + limit}" if len(files) > limit else None
+        return files[:limit], next_token
+
+    def get(self, service, file_id: str) -> Optional[Dict[str, Any]]:
+        """The stored metadata of ``file_id``, or ``None`` if never seen."""
+        if not self.ready:
+            return None
+        self.refresh(service)
+        with self._lock:
+            if self._meta("page_token") is None:
+                return None
+            if file_id == "root":
+                file_id = self._meta("root_id") or file_id
+            row = self._db.execute(f"{_SELECT} WHERE id = ?", (file_id,)).fetchone()
+        return _to_file(row) if row else None
+
+
+_syncs: Dict[str, DriveSync] = {}
+_syncs_lock = threading.Lock()
+
+
+def get_drive_sync(config: Config) -> Optional[DriveSync]:
+    """Return the shared mirror for ``config``, or ``None`` if sync is off."""
+    if not config.drive_sync:
+        return None
+    with _syncs_lock:
+        sync = _syncs.get(config.drive_sync_db)
+        if sync is None:
+            sync = _syncs[config.drive_sync_db] = DriveSync(config)
+        return sync
+
+
+def local_search(
+    config: Config,
+    service,
+    q: Optional[str],
+    limit: int,
+    page_token: Optional[str] = None,
+) -> Optional[Tuple[List[Dict[str, Any]], Optional[str]]]:
+    """:meth:`DriveSync.search` if sync is enabled and healthy, else ``None``."""
+    sync = get_drive_sync(config)
+    if sync is None:
+        return None
+    try:
+        return sync.search(service, q, limit, page_token)
+    except Exception as e:
+        _logger.warning("Drive sync unavailable, querying Drive directly: %s", e)
+        return None
+
+
+def local_file(config: Config, service, file_id: str) -> Optional[Dict[str, Any]]:
+    """:meth:`DriveSync.get` if sync is enabled and healthy, else ``None``."""
+    sync = get_drive_sync(config)
+    if sync is None:
+        return None
+    try:
+        return sync.get(service, file_id)
+    except Exception as e:
+        _logger.warning("Drive sync unavailable, querying Drive directly: %s", e)
+        return None
+
+
+def start(config: Config) -> None:
+    """Start the background seed/refresh worker if ``drive_sync`` is enabled."""
+    sync = get_drive_sync(config)
+    if sync is not None:
+        sync.start(config)
+
+
+def expire(config: Config) -> None:
+    """Force a change replay before the next local read."""
+    sync = get_drive_sync(config)
+    if sync is not None:
+        sync.expire()
@@ -0,0 +1,120 @@
+"""Per-API worker pools with admission limits.
+
+Each Google API has its own quota bucket, so each gets its own bounded
+thread pool (for blocking googleapiclient calls) and concurrency semaphore
+(for calls awaited on the event loop). A burst of slow Drive exports can
+then only saturate the Drive pool, not starve Sheets or Gmail reads.
+"""
+
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from .config import Config
+
+SERVICES = ("drive", "gmail", "sheets", "docs", "calendar", "script")
+DEFAULT_WORKERS = 8
+
+# Lane serving the current async call, so blocking helpers it awaits (local
+# SQLite mirrors) run on that lane's pool and not the shared default one.
+_current_lane: "ContextVar[Optional[ServiceExecutor]]" = ContextVar(
+    "mcp_service_lane", default=None
+)
+
+
+class ServiceBusyError(RuntimeError):
+    """Raised when a service already has ``queue_depth`` calls waiting."""
+
+
+class ServiceExecutor:
+    """Bounded execution lane for one Google API."""
+
+    def __init__(self, name: str, workers: int, queue_depth: int) -> None:
+        self.name = name
+        self.workers = workers
+        self.queue_depth = queue_depth
+        self._pool = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix=f"mcp-{name}"
+        )
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        # Calls admitted and not yet finished (running + waiting). Only
+        # touched from the event loop, so no lock is needed.
+        self._in_flight = 0
+
+    @asynccontextmanager
+    async def _admit(self):
+        if self._in_flight >= self.workers + self.queue_depth:
+            raise ServiceBusyError(
+                f"Too many concurrent {self.name} requests "
+                f"({self._in_flight} in flight); try again shortly."
+            )
+        self._in_flight += 1
+        try:
+            yield
+        finally:
+            self._in_flight -= 1
+
+    async def run(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Run blocking ``fn(*args, **kwargs)`` on this service's thread pool."""
+        async with self._admit():
+            return await self._offload(fn, *args, **kwargs)
+
+    async def run_async(
+        self, fn: Callable[..., Awaitable[Any]], *args: Any, **kwargs: Any
+    ) -> Any:
+        """Await ``fn(*args, **kwargs)`` with at most ``workers`` running at once."""
+        async with self._admit():
+            if self._semaphore is None:
+                self._semaphore = asyncio.Semaphore(self.workers)
+            async with self._semaphore:
+                token = _current_lane.set(self)
+                try:
+                    return await fn(*args, **kwargs)
+                finally:
+                    _current_lane.reset(token)
+
+    async def _offload(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._pool, functools.partial(fn, *args, **kwargs)
+        )
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=False)
+
+
+async def run_blocking(fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """Run blocking ``fn`` on the pool of the lane serving the current call.
+
+    Inside :meth:`ServiceExecutor.run_async` the call has already been
+    admitted, so it is not counted again. Outside any lane it falls back to
+    ``asyncio.to_thread``.
+    """
+    lane = _current_lane.get()
+    if lane is None:
+        return await asyncio.to_thread(fn, *args, **kwargs)
+    return await lane._offload(fn, *args, **kwargs)
+
+
+class ServiceExecutors:
+    """One :class:`ServiceExecutor` per Google API, sized from ``Config``."""
+
+    def __init__(self, config: Config) -> None:
+        self._executors: Dict[str, ServiceExecutor] = {
+            name: ServiceExecutor(
+                name,
+                config.service_workers.get(name, DEFAULT_WORKERS),
+                config.service_queue_depth,
+            )
+            for name in SERVICES
+        }
+
+    def __getitem__(self, service: str) -> ServiceExecutor:
+        return self._executors[service]
+
+    def shutdown(self) -> None:
+        for executor in self._executors.values():
+            executor.shutdown()
@@ -0,0 +1,782 @@
+"""Local Gmail metadata store kept current with the history API.
+
+A background worker seeds the store with every inbox message plus
+everything received in the last ``gmail_sync_days`` days, then keeps it
+updated from ``users.history.list`` starting at the last seen
+``historyId``. Until the first seed completes, reads fall through to Gmail. Common
+read queries (label, sender, unread, date range) are answered from SQLite;
+upstream traffic is reduced to one history call per ``gmail_sync_interval``.
+
+Only queries the store is known to be complete for are answered locally:
+those restricted to the inbox, or to dates after the seed cutoff. Anything
+else returns ``None`` and the caller queries Gmail as before.
+
+With ``gmail_fts`` enabled, a background worker also downloads the bodies
+of stored messages (the same ``messages.get`` call ``read_email`` makes)
+into an FTS5 full-text index for ranked local search.
+"""
+
+import logging
+import os
+import re
+import shlex
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+from googleapiclient.errors import HttpError
+
+from .auth import get_credential_manager
+from .config import Config
+from .handlers import gmail as gmail_api
+from .services import get_service
+
+_logger = logging.getLogger("GoogleToolsMCP.gmail_sync")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS messages (
+    id TEXT PRIMARY KEY,
+    thread_id TEXT,
+    internal_date INTEGER,
+    sender TEXT,
+    subject TEXT,
+    date TEXT,
+    snippet TEXT
+);
+CREATE INDEX IF NOT EXISTS messages_by_date ON messages(internal_date DESC);
+CREATE TABLE IF NOT EXISTS message_labels (
+    message_id TEXT,
+    label_id TEXT,
+    PRIMARY KEY (message_id, label_id)
+);
+CREATE INDEX IF NOT EXISTS messages_by_label ON message_labels(label_id, message_id);
+CREATE TABLE IF NOT EXISTS labels (id TEXT PRIMARY KEY, name TEXT);
+"""
+
+_FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS message_text USING fts5(
+    message_id UNINDEXED, subject, sender, snippet, body,
+    tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3'
+);
+CREATE TABLE IF NOT EXISTS message_text_rows (
+    message_id TEXT PRIMARY KEY,
+    text_rowid INTEGER NOT NULL
+);
+"""
+# bm25 column weights: message_id, subject, sender, snippet, body.
+_FTS_WEIGHTS = "0, 10.0, 5.0, 2.0, 1.0"
+# Messages whose bodies are fetched per batch request.
+_INDEX_BATCH = 50
+# Body text kept per message in the index.
+_INDEX_BODY_CHARS = 64 * 1024
+
+# Gmail leaves spam and trash out of every search unless asked explicitly.
+_HIDDEN_LABELS = ("SPAM", "TRASH")
+_SYSTEM_LABELS = {
+    "is:unread": "UNREAD",
+    "is:starred": "STARRED",
+    "is:important": "IMPORTANT",
+    "in:inbox": "INBOX",
+    "in:sent": "SENT",
+    "in:starred": "STARRED",
+    "in:drafts": "DRAFT",
+}
+_RELATIVE_UNITS = {"d": 1, "m": 30, "y": 365}
+# Attempts per message fetch; transient batch failures (429/5xx) are common.
+_FETCH_ATTEMPTS = 3
+_FETCH_BACKOFF = 1.0
+_HISTORY_TYPES = ["messageAdded", "messageDeleted", "labelAdded", "labelRemoved"]
+
+
+def _label_key(name: str) -> str:
+    # Gmail's label: operator matches names case-insensitively, with spaces
+    # and slashes written as dashes.
+    return re.sub(r"[\s/]+", "-", name.strip().lower())
+
+
+def _parse_date(value: str) -> Optional[datetime]:
+    for fmt in ("%Y/%m/%d", "%Y-%m-%d"):
+        try:
+            return datetime.strptime(value, fmt).replace(tzinfo=timezone.utc)
+        except ValueError:
+            continue
+    return None
+
+
+class _Query:
+    """The subset of Gmail search syntax the local store can evaluate."""
+
+    def __init__(self) -> None:
+        self.with_labels: List[str] = []
+        self.without_labels: List[str] = list(_HIDDEN_LABELS)
+        self.label_names: List[str] = []
+        self.senders: List[str] = []
+        self.after: Optional[int] = None
+        self.before: Optional[int] = None
+
+    @classmethod
+    def parse(cls, query: Optional[str]) -> Optional["_Query"]:
+        """Parse ``query``; ``None`` if it uses anything unsupported."""
+        parsed = cls()
+        try:
+            tokens = shlex.split(query or "")
+        except ValueError:
+            return None
+        now = datetime.now(timezone.utc)
+        for token in tokens:
+            operator, _, value = token.partition(":")
+            operator = operator.lower()
+            if token.lower() in _SYSTEM_LABELS:
+                parsed.with_labels.append(_SYSTEM_LABELS[token.lower()])
+            elif token.lower() == "is:read":
+                parsed.without_labels.append("UNREAD")
+            elif operator == "label" and value:
+                parsed.label_names.append(_label_key(value))
+            elif operator == "from" and value:
+                parsed.senders.append(value.lower())
+            elif operator in ("after", "before") and _parse_date(value):
+                millis = int(_parse_date(value).timestamp() * 1000)
+                if operator == "after":
+                    parsed.after = max(parsed.after or 0, millis)
+                else:
+                    parsed.before = min(parsed.before or millis, millis)
+            elif operator in ("newer_than", "older_than") and re.fullmatch(
+                r"\d+[dmy]", value
+            ):
+                days = int(value[:-1]) * _RELATIVE_UNITS[value[-1]]
+                millis = int((now - timedelta(days=days)).timestamp() * 1000)
+                if operator == "newer_than":
+                    parsed.after = max(parsed.after or 0, millis)
+                else:
+                    parsed.before = min(parsed.before or millis, millis)
+            else:
+                return None
+        return parsed
+
+
+def _fts5_available() -> bool:
+    try:
+        sqlite3.connect(":memory:").execute("CREATE VIRTUAL TABLE t USING fts5(x)")
+        return True
+    except sqlite3.OperationalError:
+        return False
+
+
+def _fts_query(text: str) -> str:
+    """Turn free text into an FTS5 query matching all words (``word*`` = prefix)."""
+    terms = []
+    for word in text.split():
+        prefix = word.endswith("*")
+        word = word.rstrip("*").replace('"', '""')
+        if word:
+            terms.append(f'"{word}"' + ("*" if prefix else ""))
+    return " ".join(terms)
+
+
+def _to_message(row: sqlite3.Row, label_ids: List[str]) -> Dict[str, Any]:
+    """Shape a stored row like a ``format=metadata`` message resource."""
+    return {
+        "id": row["id"],
+        "threadId": row["thread_id"],
+        "internalDate": str(row["internal_date"]),
+        "snippet": row["snippet"],
+        "labelIds": label_ids,
+        "payload": {
+            "headers": [
+                {"name": "From", "value": row["sender"]},
+                {"name": "Subject", "value": row["subject"]},
+                {"name": "Date", "value": row["date"]},
+            ]
+        },
+    }
+
+
+class GmailSync:
+    """SQLite mirror of message metadata for one Gmail account."""
+
+    def __init__(self, config: Config) -> None:
+        self.path = config.gmail_sync_db
+        self.days = config.gmail_sync_days
+        self.interval = config.gmail_sync_interval
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.row_factory = sqlite3.Row
+        self._db.executescript(_SCHEMA)
+        self.fts = config.gmail_fts and _fts5_available()
+        if config.gmail_fts and not self.fts:
+            _logger.warning("SQLite FTS5 is not available; local text search is disabled")
+        if self.fts:
+            self._db.executescript(_FTS_SCHEMA)
+        self._lock = threading.RLock()
+        # Held by the one seed or history replay running at a time.
+        self._sync_lock = threading.Lock()
+        self._synced_at = 0.0
+        self._worker: Optional[threading.Thread] = None
+        self._indexer: Optional[threading.Thread] = None
+
+    # -- meta -------------------------------------------------------------
+
+    def _meta(self, key: str) -> Optional[str]:
+        row = self._db.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row["value"] if row else None
+
+    def _set_meta(self, key: str, value: Any) -> None:
+        self._db.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, str(value))
+        )
+
+    # -- writes -----------------------------------------------------------
+
+    def _store(self, messages: List[Dict[str, Any]]) -> None:
+        for message in messages:
+            headers = gmail_api.message_headers(message)
+            self._db.execute(
+                "INSERT OR REPLACE INTO messages VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    message["id"],
+                    message.get("threadId"),
+                    int(message.get("internalDate", 0)),
+                    headers.get("From", ""),
+                    headers.get("Subject", ""),
+                    headers.get("Date", ""),
+                    message.get("snippet", ""),
+                ),
+            )
+            self._set_labels(message["id"], message.get("labelIds", []))
+
+    def _set_labels(self, message_id: str, label_ids: List[str]) -> None:
+        self._db.execute("DELETE FROM message_labels WHERE message_id = ?", (message_id,))
+        self._db.executemany(
+            "INSERT OR IGNORE INTO message_labels VALUES (?, ?)",
+            [(message_id, label_id) for label_id in label_ids],
+        )
+
+    def _delete(self, message_ids: List[str]) -> None:
+        for message_id in message_ids:
+            self._db.execute("DELETE FROM messages WHERE id = ?", (message_id,))
+            self._db.execute(
+                "DELETE FROM message_labels WHERE message_id = ?", (message_id,)
+            )
+            if self.fts:
+                self._unindex(message_id)
+
+    def _unindex(self, message_id: str) -> None:
+        # message_text.message_id is UNINDEXED; deleting by rowid avoids a
+        # scan of the whole FTS table.
+        row = self._db.execute(
+            "SELECT text_rowid FROM message_text_rows WHERE message_id = ?",
+            (message_id,),
+        ).fetchone()
+        if row is not None:
+            self._db.execute(
+                "DELETE FROM message_text WHERE rowid = ?", (row["text_rowid"],)
+            )
+            self._db.execute(
+                "DELETE FROM message_text_rows WHERE message_id = ?", (message_id,)
+            )
+
+    def _fetch(
+        self, service, message_ids: List[str]
+    ) -> Tuple[List[Dict[str, Any]], List[str]]:
+        """Metadata of ``message_ids``: (messages, IDs gone upstream).
+
+        Only a 404 means a message is gone; other failures (429, 5xx) are
+        retried and, if they persist, raised so the caller does not record
+        a sync position past messages it could not store.
+        """
+        messages: List[Dict[str, Any]] = []
+        gone: List[str] = []
+        pending = list(message_ids)
+        for attempt in range(_FETCH_ATTEMPTS):
+            if attempt:
+                time.sleep(_FETCH_BACKOFF * 2 ** (attempt - 1))
+            failed = []
+            for message in gmail_api.fetch_messages(service, pending):
+                if "error" not in message:
+                    messages.append(message)
+                elif message.get("status") == 404:
+                    gone.append(message["id"])
+                else:
+                    failed.append(message)
+            if not failed:
+                return messages, gone
+            pending = [message["id"] for message in failed]
+        raise RuntimeError(
+            f"{len(failed)} message(s) could not be fetched: {failed[0]['error']}"
+        )
+
+    def _store_labels(self, labels: List[Dict[str, Any]]) -> None:
+        self._db.execute("DELETE FROM labels")
+        self._db.executemany(
+            "INSERT INTO labels VALUES (?, ?)",
+            [(lbl["id"], _label_key(lbl.get("name", lbl["id"]))) for lbl in labels],
+        )
+
+    @staticmethod
+    def _list_labels(service) -> List[Dict[str, Any]]:
+        return service.users().labels().list(userId="me").execute().get("labels", [])
+
+    # -- sync -------------------------------------------------------------
+
+    @property
+    def ready(self) -> bool:
+        """True once a seed has completed (a history ID is stored)."""
+        with self._lock:
+            return self._meta("history_id") is not None
+
+    def _seed(self, service) -> None:
+        """Rebuild the store from scratch (background worker only).
+
+        Network calls run outside ``_lock``, so readers are never blocked;
+        they see ``ready`` as False and query Gmail until the seed is done.
+        The meta rows are written last: a seed that fails partway leaves
+        the store not ready and the worker starts over.
+        """
+        with self._sync_lock:
+            # Read the history ID first so changes made while seeding are
+            # replayed afterwards.
+            profile = service.users().getProfile(userId="me").execute()
+            cutoff = datetime.now(timezone.utc) - timedelta(days=self.days)
+            with self._lock:
+                self._db.executescript(
+                    "DELETE FROM messages; DELETE FROM message_labels; DELETE FROM meta;"
+                )
+                if self.fts:
+                    self._db.executescript(
+                        "DELETE FROM message_text; DELETE FROM message_text_rows;"
+                    )
+                self._db.commit()
+
+            seed_query = f"{{in:inbox newer_than:{self.days}d}}"
+            for page in gmail_api.iter_message_id_pages(service, seed_query):
+                messages, _ = self._fetch(service, page)
+                with self._lock:
+                    self._store(messages)
+                    self._db.commit()
+            labels = self._list_labels(service)
+
+            with self._lock:
+                self._store_labels(labels)
+                self._set_meta("email", profile.get("emailAddress", ""))
+                self._set_meta("cutoff", int(cutoff.timestamp() * 1000))
+                self._set_meta("history_id", profile["historyId"])
+                self._db.commit()
+                self._synced_at = time.monotonic()
+                count = self._db.execute("SELECT COUNT(*) FROM messages").fetchone()[0]
+        _logger.info("Gmail sync seeded: %s message(s)", count)
+
+    def _history_since(
+        self, service, start: str
+    ) -> Optional[Tuple[List[Dict[str, Any]], str]]:
+        """History records after ``start`` and the latest ID; None if expired."""
+        history_api = service.users().history()
+        records: List[Dict[str, Any]] = []
+        page_token = None
+        latest = start
+        while True:
+            try:
+                result = history_api.list(
+                    userId="me",
+                    startHistoryId=start,
+                    historyTypes=_HISTORY_TYPES,
+                    maxResults=500,
+                    pageToken=page_token,
+                ).execute()
+            except HttpError as e:
+                if e.resp.status == 404:
+                    return None
+                raise
+            records.extend(result.get("history", []))
+            latest = result.get("historyId", latest)
+            page_token = result.get("nextPageToken")
+            if not page_token:
+                return records, latest
+
+    def _apply_history(self, service) -> bool:
+        """Replay history since the stored ID; False if it has expired.
+
+        History and message fetches run outside ``_lock``; the changes are
+        then written in one transaction together with the new history ID.
+        If a fetch fails, nothing is written and the next sync replays the
+        same range.
+        """
+        with self._lock:
+            start = self._meta("history_id")
+        history = self._history_since(service, start)
+        if history is None:
+            return False
+        records, latest = history
+
+        to_fetch: Dict[str, None] = {}
+        deleted: List[str] = []
+        label_sets: Dict[str, List[str]] = {}
+        with self._lock:
+            for record in records:
+                for item in record.get("messagesAdded", []):
+                    to_fetch[item["message"]["id"]] = None
+                for item in record.get("messagesDeleted", []):
+                    to_fetch.pop(item["message"]["id"], None)
+                    label_sets.pop(item["message"]["id"], None)
+                    deleted.append(item["message"]["id"])
+                for item in record.get("labelsAdded", []) + record.get("labelsRemoved", []):
+                    message = item["message"]
+                    known = self._db.execute(
+                        "SELECT 1 FROM messages WHERE id = ?", (message["id"],)
+                    ).fetchone()
+                    if known and "labelIds" in message and message["id"] not in to_fetch:
+                        label_sets[message["id"]] = message["labelIds"]
+                    else:
+                        label_sets.pop(message["id"], None)
+                        to_fetch[message["id"]] = None
+
+        messages, gone = self._fetch(service, list(to_fetch)) if to_fetch else ([], [])
+        with self._lock:
+            for message_id, label_ids in label_sets.items():
+                self._set_labels(message_id, label_ids)
+            self._delete(deleted + gone)
+            self._store(messages)
+            self._set_meta("history_id", latest)
+            self._db.commit()
+        return True
+
+    def refresh(self, service, force: bool = False) -> None:
+        """Bring a seeded store up to date (at most once per sync interval).
+
+        Readers never wait for a sync in progress; they are served what is
+        stored. An expired history ID drops the store back to "not ready"
+        and the background worker reseeds it.
+        """
+        if not self.ready:
+            return
+        if not force and time.monotonic() - self._synced_at < self.interval:
+            return
+        if not self._sync_lock.acquire(blocking=False):
+            return
+        try:
+            if not self._apply_history(service):
+                _logger.warning("Gmail history expired; reseeding the store")
+                with self._lock:
+                    self._db.execute("DELETE FROM meta WHERE key = 'history_id'")
+                    self._db.commit()
+                return
+            self._synced_at = time.monotonic()
+        finally:
+            self._sync_lock.release()
+
+    def expire(self) -> None:
+        """Make the next read replay history (e.g. after a Gmail write)."""
+        self._synced_at = 0.0
+
+    def _sync_loop(self, config: Config, stop: threading.Event) -> None:
+        delay = 0.0
+        while not stop.wait(delay):
+            delay = max(self.interval, 1.0)
+            # Never start an interactive OAuth flow from the background.
+            if get_credential_manager(config).peek() is None:
+                continue
+            try:
+                service = get_service(config, "gmail", "v1")
+                if not self.ready:
+                    self._seed(service)
+                self.refresh(service)
+            except Exception as e:
+                _logger.warning("Gmail sync failed: %s", e)
+
+    def start(self, config: Config) -> None:
+        if self._worker is not None:
+            return
+        stop = threading.Event()
+        self._worker = threading.Thread(
+            target=self._sync_loop, args=(config, stop), name="gmail-sync", daemon=True
+        )
+        self._worker.start()
+
+    # -- full-text index -------------------------------------------------
+
+    def index_pending(self, service, stop: Optional[threading.Event] = None) -> int:
+        """Index the bodies of stored messages not indexed yet, newest first.
+
+        Messages whose fetch fails stay unindexed and are retried on the
+        next pass; within one pass they are skipped.
+        """
+        indexed = 0
+        skipped: Set[str] = set()
+        while stop is None or not stop.is_set():
+            with self._lock:
+                message_ids = [
+                    row["id"]
+                    for row in self._db.execute(
+                        "SELECT id FROM messages WHERE id NOT IN "
+                        "(SELECT message_id FROM message_text_rows) "
+                        "ORDER BY internal_date DESC LIMIT ?",
+                        (_INDEX_BATCH + len(skipped),),
+                    )
+                    if row["id"] not in skipped
+                ][:_INDEX_BATCH]
+            if not message_ids:
+                break
+
+            messages = gmail_api.fetch_full_messages(service, message_ids)
+            with self._lock:
+                for message in messages:
+                    if "error" in message:
+                        skipped.add(message["id"])
+                        continue
+                    self._unindex(message["id"])
+                    headers = gmail_api.message_headers(message)
+                    cursor = self._db.execute(
+                        "INSERT INTO message_text VALUES (?, ?, ?, ?, ?)",
+                        (
+                            message["id"],
+                            headers.get("Subject", ""),
+                            headers.get("From", ""),
+                            message.get("snippet", ""),
+                            gmail_api.message_text(message)[:_INDEX_BODY_CHARS],
+                        ),
+                    )
+                    self._db.execute(
+                        "INSERT INTO message_text_rows VALUES (?, ?)",
+                        (message["id"], cursor.lastrowid),
+                    )
+                    indexed += 1
+                self._db.commit()
+        return indexed
+
+    def _index_loop(self, config: Config, stop: threading.Event) -> None:
+        while not stop.wait(config.gmail_fts_interval):
+            # Never start an interactive OAuth flow from the background.
+            if get_credential_manager(config).peek() is None:
+                continue
+            if not self.ready:
+                continue
+            try:
+                service = get_service(config, "gmail", "v1")
+                self.refresh(service)
+                count = self.index_pending(service, stop)
+                if count:
+                    _logger.info("Gmail text index: %s message(s) indexed", count)
+            except Exception as e:
+                _logger.warning("Gmail text indexing failed: %s", e)
+
+    def start_indexer(self, config: Config) -> None:
+        if not self.fts or self._indexer is not None:
+            return
+        stop = threading.Event()
+        self._indexer = threading.Thread(
+            target=self._index_loop, args=(config, stop), name="gmail-fts", daemon=True
+        )
+        self._indexer.start()
+
+    def text_search(
+        self, query: str, limit: int
+    ) -> Tuple[List[Dict[str, Any]], int, int]:
+        """Ranked full-text matches: (messages, indexed count, stored count)."""
+        match = _fts_query(query)
+        with self._lock:
+            rows = (
+                self._db.execute(
+                    "SELECT m.* FROM message_text "
+                    "JOIN message_text_rows r ON r.text_rowid = message_text.rowid "
+                    "JOIN messages m ON m.id = r.message_id "
+                    f"WHERE message_text MATCH ? ORDER BY bm25(message_text, {_FTS_WEIGHTS}) "
+                    "LIMIT ?",
+                    (match, limit),
+                ).fetchall()
+                if match
+                else []
+            )
+            messages = [_to_message(row, []) for row in rows]
+            indexed = self._db.execute("SELECT COUNT(*) FROM message_text_rows").fetchone()[0]
+            total = self._db.execute("SELECT COUNT(*) FROM messages").fetchone()[0]
+        return messages, indexed, total
+
+    # -- reads ------------------------------------------------------------
+
+    def _lookup_labels(self, names: List[str]) -> Optional[List[str]]:
+        with self._lock:
+            rows = [
+                self._db.execute("SELECT id FROM labels WHERE name = ?", (name,)).fetchone()
+                for name in names
+            ]
+        if any(row is None for row in rows):
+            return None
+        return [row["id"] for row in rows]
+
+    def _label_ids(self, service, names: List[str]) -> Optional[List[str]]:
+        """IDs of the user labels ``names``; ``None`` if one does not exist.
+
+        Labels created since the seed are picked up by refetching the label
+        list once (outside ``_lock``).
+        """
+        label_ids = self._lookup_labels(names)
+        if label_ids is None:
+            labels = self._list_labels(service)
+            with self._lock:
+                self._store_labels(labels)
+                self._db.commit()
+            label_ids = self._lookup_labels(names)
+        return label_ids
+
+    def _where(
+        self, parsed: _Query, user_label_ids: List[str]
+    ) -> Optional[Tuple[str, List[Any]]]:
+        label_ids = list(parsed.with_labels) + user_label_ids
+        cutoff = int(self._meta("cutoff") or 0)
+        if "INBOX" not in label_ids and (parsed.after or 0) < cutoff:
+            return None
+
+        clauses: List[str] = []
+        params: List[Any] = []
+        for label_id in label_ids:
+            clauses.append(
+                "id IN (SELECT message_id FROM message_labels WHERE label_id = ?)"
+            )
+            params.append(label_id)
+        for label_id in parsed.without_labels:
+            clauses.append(
+                "id NOT IN (SELECT message_id FROM message_labels WHERE label_id = ?)"
+            )
+            params.append(label_id)
+        for sender in parsed.senders:
+            clauses.append("LOWER(sender) LIKE ? ESCAPE '\\'")
+            params.append("%" + re.sub(r"([%_\\])", r"\\\1", sender) + "%")
+        if parsed.after is not None:
+            clauses.append("internal_date >= ?")
+            params.append(parsed.after)
+        if parsed.before is not None:
+            clauses.append("internal_date < ?")
+            params.append(parsed.before)
+        return " AND ".join(clauses) or "1", params
+
+    def _rows(self, where: str, params: List[Any], limit: int, offset: int) -> List[Dict[str, Any]]:
+        rows = self._db.execute(
+            f"SELECT * FROM messages WHERE {where} "
+            "ORDER BY internal_date DESC LIMIT ? OFFSET ?",
+            (*params, limit, offset),
+        ).fetchall()
+        messages = []
+        for row in rows:
+            labels = [
+                label["label_id"]
+                for label in self._db.execute(
+                    "SELECT label_id FROM message_labels WHERE message_id = ?",
+                    (row["id"],),
+                )
+            ]
+            messages.append(_to_message(row, labels))
+        return messages
+
+    def search(
+        self, service, query: Optional[str], limit: int, page_token: Optional[str] = None
+    ) -> Optional[Tuple[List[Dict[str, Any]], Optional[str]]]:
+        """Answer ``query`` locally: (messages, next page token) or ``None``.
+
+        Messages are shaped like ``format=metadata`` resources. Page tokens
+        issued here start with ``local:``; any other token means the caller
+        started paging upstream and must continue there.
+        """
+        if page_token and not page_token.startswith("local:"):
+            return None
+        parsed = _Query.parse(query)
+        if parsed is None or not self.ready:
+            return None
+        self.refresh(service)
+        user_label_ids = self._label_ids(service, parsed.label_names)
+        if user_label_ids is None:
+            return None
+        with self._lock:
+            # Reset by an expired history ID while refreshing.
+            if self._meta("history_id") is None:
+                return None
+            where = self._where(parsed, user_label_ids)
+            if where is None:
+                return None
+            offset = int(page_token.removeprefix("local:")) if page_token else 0
+            messages = self._rows(*where, limit + 1, offset)
+        next_token = f"local:{offset + limit}" if len(messages) > limit else None
+        return messages[:limit], next_token
+
+    def iter_search(
+        self, service, query: Optional[str], page_size: int = 500
+    ) -> Optional[Iterator[List[Dict[str, Any]]]]:
+        """Pages of every local match for ``query``, or ``None``."""
+        first = self.search(service, query, page_size)
+        if first is None:
+            return None
+
+        def _pages() -> Iterator[List[Dict[str, Any]]]:
+            messages, token = first
+            yield messages
+            while token:
+                page = self.search(service, query, page_size, token)
+                if page is None:
+                    raise RuntimeError("Gmail sync store was reset while paging")
+                messages, token = page
+                yield messages
+
+        return _pages()
+
+
+_syncs: Dict[str, GmailSync] = {}
+_syncs_lock = threading.Lock()
+
+
+def get_gmail_sync(config: Config) -> Optional[GmailSync]:
+    """Return the shared store for ``config``, or ``None`` if sync is off."""
+    if not config.gmail_sync:
+        return None
+    with _syncs_lock:
+        sync = _syncs.get(config.gmail_sync_db)
+        if sync is None:
+            sync = _syncs[config.gmail_sync_db] = GmailSync(config)
+        return sync
+
+
+def local_search(
+    config: Config,
+    service,
+    query: Optional[str],
+    limit: int,
+    page_token: Optional[str] = None,
+) -> Optional[Tuple[List[Dict[str, Any]], Optional[str]]]:
+    """:meth:`GmailSync.search` if sync is enabled and healthy, else ``None``."""
+    sync = get_gmail_sync(config)
+    if sync is None:
+        return None
+    try:
+        return sync.search(service, query, limit, page_token)
+    except Exception as e:
+        _logger.warning("Gmail sync unavailable, querying Gmail directly: %s", e)
+        return None
+
+
+def local_pages(
+    config: Config, service, query: Optional[str]
+) -> Optional[Iterator[List[Dict[str, Any]]]]:
+    """:meth:`GmailSync.iter_search` if sync is enabled and healthy, else ``None``."""
+    sync = get_gmail_sync(config)
+    if sync is None:
+        return None
+    try:
+        return sync.iter_search(service, query)
+    except Exception as e:
+        _logger.warning("Gmail sync unavailable, querying Gmail directly: %s", e)
+        return None
+
+
+def start(config: Config) -> None:
+    """Start the background sync worker (and indexer) if ``gmail_sync`` is on."""
+    sync = get_gmail_sync(config)
+    if sync is not None:
+        sync.start(config)
+        sync.start_indexer(config)
+
+
+def expire(config: Config) -> None:
+    """Force a history replay before the next local read."""
+    sync = get_gmail_sync(config)
+    if sync is not None:
+        sync.expire()
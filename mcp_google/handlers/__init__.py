@@ -12,6 +12,7 @@ from .calendar import (
     calendar_create_meeting_handler,
     calendar_find_free_slots_handler,
     create_event_handler,
+    list_events_async_handler,
     list_events_handler,
 )
 from .docs import (
@@ -19,14 +20,23 @@ from .docs import (
     create_doc_handler,
     doc_export_pdf_handler,
     doc_fill_template_handler,
+    read_doc_async_handler,
     read_doc_handler,
 )
 from .drive import (
     create_folder_handler,
+    drive_bulk_copy_handler,
+    drive_bulk_move_handler,
+    drive_bulk_revoke_handler,
+    drive_bulk_share_handler,
+    drive_bulk_trash_handler,
     drive_copy_file_handler,
+    drive_folder_tree_handler,
     drive_list_permissions_handler,
+    drive_permission_audit_handler,
     drive_revoke_public_handler,
     drive_search_advanced_handler,
+    find_files_async_handler,
     find_files_handler,
     move_file_handler,
     share_file_handler,
@@ -37,8 +47,13 @@ from .gmail import (
     delete_email_handler,
     get_gmail_profile_handler,
     gmail_archive_handler,
+    gmail_bulk_archive_handler,
+    gmail_download_attachment_handler,
     gmail_label_apply_handler,
+    gmail_local_search_handler,
+    gmail_read_thread_handler,
     gmail_search_and_summarize_handler,
+    list_emails_async_handler,
     list_emails_handler,
     read_email_handler,
     send_draft_handler,
@@ -50,6 +65,7 @@ from .sheets import (
     clear_range_handler,
     create_spreadsheet_handler,
     get_spreadsheet_meta_handler,
+    read_sheet_async_handler,
     read_sheet_handler,
     sheet_create_filter_view_handler,
     sheet_create_named_range_handler,
@@ -88,10 +104,14 @@ __all__ = [
     "create_draft_handler",
     "list_emails_handler",
     "read_email_handler",
+    "gmail_read_thread_handler",
+    "gmail_download_attachment_handler",
     "delete_email_handler",
     "batch_delete_emails_handler",
     "gmail_search_and_summarize_handler",
+    "gmail_local_search_handler",
     "gmail_archive_handler",
+    "gmail_bulk_archive_handler",
     "gmail_label_apply_handler",
     "list_events_handler",
     "create_event_handler",
@@ -101,7 +121,19 @@ __all__ = [
     "move_file_handler",
     "share_file_handler",
     "drive_search_advanced_handler",
+    "drive_folder_tree_handler",
     "drive_list_permissions_handler",
+    "drive_permission_audit_handler",
     "drive_revoke_public_handler",
+    "drive_bulk_revoke_handler",
     "drive_copy_file_handler",
+    "drive_bulk_move_handler",
+    "drive_bulk_copy_handler",
+    "drive_bulk_share_handler",
+    "drive_bulk_trash_handler",
+    "find_files_async_handler",
+    "read_sheet_async_handler",
+    "read_doc_async_handler",
+    "list_emails_async_handler",
+    "list_events_async_handler",
 ]
@@ -2,9 +2,6 @@ import logging
 from datetime import datetime
 from typing import Dict, List, Optional
 
-from googleapiclient.discovery import build
-
-from ..auth import get_creds
 from ..config import Config
 from ..operations import (
     cleanup_expired_operations,
@@ -12,14 +9,14 @@ from ..operations import (
     new_operation_id,
     pending_operations,
 )
+from ..services import get_service
 
 
 def create_script_project_handler(
     config: Config, logger: logging.Logger, title: str, parent_id: Optional[str] = None
 ) -> str:
     try:
-        creds = get_creds(config)
-        service = build("script", "v1", credentials=creds)
+        service = get_service(config, "script", "v1")
 
         request = {"title": title}
         if parent_id:
@@ -38,8 +35,7 @@ def create_script_project_handler(
 
 def get_script_content_handler(config: Config, logger: logging.Logger, script_id: str) -> str:
     try:
-        creds = get_creds(config)
-        service = build("script", "v1", credentials=creds)
+        service = get_service(config, "script", "v1")
 
         content = service.projects().getContent(scriptId=script_id).execute()
         files = content.get("files", [])
@@ -61,8 +57,7 @@ def prepare_script_update_handler(
     try:
         cleanup_expired_operations()
 
-        creds = get_creds(config)
-        service = build("script", "v1", credentials=creds)
+        service = get_service(config, "script", "v1")
 
         # Get current content for backup
         current_content = service.projects().getContent(scriptId=script_id).execute()
@@ -125,8 +120,7 @@ def execute_operation_handler(config: Config, logger: logging.Logger, operation_
         op = pending_operations[operation_id]
 
         if op["type"] == "script_update":
-            creds = get_creds(config)
-            service = build("script", "v1", credentials=creds)
+            service = get_service(config, "script", "v1")
 
             # Create backup file before applying changes
             backup_data = {
@@ -210,8 +204,7 @@ def restore_script_backup_handler(
         else:
             return "❌ Invalid backup format"
 
-        creds = get_creds(config)
-        service = build("script", "v1", credentials=creds)
+        service = get_service(config, "script", "v1")
 
         request = {"files": files}
         service.projects().updateContent(scriptId=script_id, body=request).execute()
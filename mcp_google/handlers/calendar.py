@@ -2,46 +2,62 @@ import logging
 from datetime import datetime, timedelta, timezone
 from typing import List, Optional
 
-from googleapiclient.discovery import build
-
-from ..auth import get_creds
+from .. import aio
 from ..config import Config
 from ..security import validate_email
+from ..services import get_service
+
+
+def _list_events_request(service, calendar_id: str, max_results: int):
+    return service.events().list(
+        calendarId=calendar_id,
+        timeMin=datetime.now(timezone.utc).isoformat(),
+        maxResults=max_results,
+        singleEvents=True,
+        orderBy="startTime",
+    )
+
+
+def _format_events(events: List[dict]) -> str:
+    if not events:
+        return "No upcoming events found."
+
+    output = "Upcoming events:\n"
+    for event in events:
+        start = event.get("start").get(
+            "dateTime", event.get("start").get("date")
+        )
+        output += (
+            f"- {start} : {event.get('summary')} (ID: {event.get('id')})\n"
+        )
+
+    return output
 
 
 def list_events_handler(
     config: Config, logger: logging.Logger, calendar_id: str = "primary", max_results: int = 10
 ) -> str:
     try:
-        creds = get_creds(config)
-        service = build("calendar", "v3", credentials=creds)
-
-        events_result = (
-            service.events()
-            .list(
-                calendarId=calendar_id,
-                timeMin=datetime.now(timezone.utc).isoformat(),
-                maxResults=max_results,
-                singleEvents=True,
-                orderBy="startTime",
-            )
-            .execute()
-        )
-        events = events_result.get("items", [])
+        service = get_service(config, "calendar", "v3")
 
-        if not events:
-            return "No upcoming events found."
+        events_result = _list_events_request(
+            service, calendar_id, max_results
+        ).execute()
+        return _format_events(events_result.get("items", []))
+    except Exception as e:
+        return f"Error listing events: {str(e)}"
 
-        output = "Upcoming events:\n"
-        for event in events:
-            start = event.get("start").get(
-                "dateTime", event.get("start").get("date")
-            )
-            output += (
-                f"- {start} : {event.get('summary')} (ID: {event.get('id')})\n"
-            )
 
-        return output
+async def list_events_async_handler(
+    config: Config, logger: logging.Logger, calendar_id: str = "primary", max_results: int = 10
+) -> str:
+    """Async variant of :func:`list_events_handler` for the event-loop path."""
+    try:
+        service = await aio.get_service(config, "calendar", "v3")
+        events_result = await aio.execute(
+            config, _list_events_request(service, calendar_id, max_results)
+        )
+        return _format_events(events_result.get("items", []))
     except Exception as e:
         return f"Error listing events: {str(e)}"
 
@@ -56,8 +72,7 @@ def create_event_handler(
     calendar_id: str = "primary",
 ) -> str:
     try:
-        creds = get_creds(config)
-        service = build("calendar", "v3", credentials=creds)
+        service = get_service(config, "calendar", "v3")
 
         event = {
             "summary": summary,
@@ -83,8 +98,7 @@ def calendar_find_free_slots_handler(
 ) -> str:
     """Find free time slots in a calendar between start and end."""
     try:
-        creds = get_creds(config)
-        service = build("calendar", "v3", credentials=creds)
+        service = get_service(config, "calendar", "v3")
 
         time_min = start_time
         time_max = end_time
@@ -176,8 +190,7 @@ def calendar_create_meeting_handler(
                 "To proceed, call again with confirm=True."
             )
 
-        creds = get_creds(config)
-        service = build("calendar", "v3", credentials=creds)
+        service = get_service(config, "calendar", "v3")
 
         event = {
             "summary": summary,
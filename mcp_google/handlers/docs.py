@@ -1,37 +1,52 @@
 import logging
 from typing import Dict, Union
 
-from googleapiclient.discovery import build
-
-from ..auth import get_creds
+from .. import aio
 from ..config import Config
 from ..operations import BinaryResult
+from ..services import get_service
+
+
+def _format_document(document: dict) -> str:
+    content = document.get("body").get("content")
+
+    text_content = ""
+    for value in content:
+        if "paragraph" in value:
+            elements = value.get("paragraph").get("elements")
+            for elem in elements:
+                text_content += elem.get("textRun", {}).get("content", "")
+
+    return f"Document Content ({document.get('title')}):\n{text_content}"
 
 
 def read_doc_handler(config: Config, logger: logging.Logger, document_id: str) -> str:
     try:
-        creds = get_creds(config)
-        service = build("docs", "v1", credentials=creds)
+        service = get_service(config, "docs", "v1")
 
         document = service.documents().get(documentId=document_id).execute()
-        content = document.get("body").get("content")
+        return _format_document(document)
+    except Exception as e:
+        return f"Error reading document: {str(e)}"
 
-        text_content = ""
-        for value in content:
-            if "paragraph" in value:
-                elements = value.get("paragraph").get("elements")
-                for elem in elements:
-                    text_content += elem.get("textRun", {}).get("content", "")
 
-        return f"Document Content ({document.get('title')}):\n{text_content}"
+async def read_doc_async_handler(
+    config: Config, logger: logging.Logger, document_id: str
+) -> str:
+    """Async variant of :func:`read_doc_handler` for the event-loop path."""
+    try:
+        service = await aio.get_service(config, "docs", "v1")
+        document = await aio.execute(
+            config, service.documents().get(documentId=document_id)
+        )
+        return _format_document(document)
     except Exception as e:
         return f"Error reading document: {str(e)}"
 
 
 def create_doc_handler(config: Config, logger: logging.Logger, title: str) -> str:
     try:
-        creds = get_creds(config)
-        service = build("docs", "v1", credentials=creds)
+        service = get_service(config, "docs", "v1")
 
         body = {"title": title}
         doc = service.documents().create(body=body).execute()
@@ -43,8 +58,7 @@ def create_doc_handler(config: Config, logger: logging.Logger, title: str) -> st
 
 def append_to_doc_handler(config: Config, logger: logging.Logger, document_id: str, text: str) -> str:
     try:
-        creds = get_creds(config)
-        service = build("docs", "v1", credentials=creds)
+        service = get_service(config, "docs", "v1")
 
         requests = [
             {
@@ -86,8 +100,7 @@ def doc_fill_template_handler(
                 "To proceed, call again with confirm=True."
             )
 
-        creds = get_creds(config)
-        service = build("docs", "v1", credentials=creds)
+        service = get_service(config, "docs", "v1")
 
         requests = []
         for key, value in replacements.items():
@@ -116,8 +129,7 @@ def doc_export_pdf_handler(
 ) -> Union[BinaryResult, str]:
     """Export a Google Doc to PDF and return it as binary content."""
     try:
-        creds = get_creds(config)
-        drive = build("drive", "v3", credentials=creds)
+        drive = get_service(config, "drive", "v3")
 
         data: bytes = drive.files().export(
             fileId=document_id, mimeType="application/pdf"
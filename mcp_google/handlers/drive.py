@@ -1,39 +1,236 @@
+import base64
+import json
 import logging
-from typing import Optional
+import sys
+import threading
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
-from googleapiclient.discovery import build
-
-from ..auth import get_creds
+from .. import aio, drive_sync
+from ..batching import BATCH_SIZE, chunked, execute_batch, run_chunks
 from ..config import Config
+from ..executors import run_blocking
 from ..security import validate_email
+from ..services import get_service
+
+# files.list returns at most 1,000 files per page.
+DRIVE_PAGE_SIZE = 1000
+# Upper bound for one streamed listing.
+_STREAM_MAX_FILES = 100_000
+FIND_FILES_FIELDS = "nextPageToken, files(id, name, mimeType)"
+
+Cursor = Tuple[Optional[str], int, int]
+
+
+def encode_cursor(page_token: Optional[str], offset: int, page_size: int) -> str:
+    """Opaque continuation token: Drive page token + position inside the page.
 
+    A listing that stops part-way through a page (because the caller's limit
+    was reached) resumes at the same file instead of skipping the rest of
+    that page.
+    """
+    raw = json.dumps([page_token, offset, page_size], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
 
-def find_files_handler(config: Config, logger: logging.Logger, query: str) -> str:
+
+def decode_cursor(cursor: Optional[str], page_size: int) -> Cursor:
+    # "local:" tokens come from the Drive mirror (see drive_sync). If the
+    # mirror is no longer ready, the listing restarts upstream.
+    if not cursor or cursor.startswith("local:"):
+        return None, 0, page_size
     try:
-        creds = get_creds(config)
-        service = build("drive", "v3", credentials=creds)
+        padded = cursor + "=" * (-len(cursor) % 4)
+        page_token, offset, size = json.loads(base64.urlsafe_b64decode(padded))
+        return page_token, int(offset), int(size)
+    except Exception:
+        raise ValueError("Invalid page_token") from None
+
+
+def _list_files_request(
+    service,
+    q: Optional[str],
+    fields: str,
+    page_size: int,
+    page_token: Optional[str],
+    order_by: Optional[str] = None,
+):
+    return service.files().list(
+        q=q,
+        pageSize=page_size,
+        pageToken=page_token,
+        orderBy=order_by,
+        fields=fields,
+    )
 
-        if "contains" not in query and "=" not in query:
-            q = f"name contains '{query}' and trashed = false"
-        else:
-            q = query
 
-        results = service.files().list(
-            q=q, pageSize=10, fields="nextPageToken, files(id, name, mimeType)"
+def _take_page(
+    items: List[Dict[str, Any]],
+    results: Dict[str, Any],
+    limit: int,
+    cursor: Cursor,
+) -> Tuple[Optional[Cursor], Optional[str]]:
+    """Move files of one page into ``items``.
+
+    Returns the cursor for the next request (``None`` when done) and the
+    continuation token to hand back to the client.
+    """
+    page_token, offset, page_size = cursor
+    files = results.get("files", [])[offset:]
+    wanted = limit - len(items)
+    items.extend(files[:wanted])
+    if len(files) > wanted:
+        return None, encode_cursor(page_token, offset + wanted, page_size)
+    next_token = results.get("nextPageToken")
+    if not next_token:
+        return None, None
+    if len(items) >= limit:
+        return None, encode_cursor(next_token, 0, page_size)
+    return (next_token, 0, page_size), None
+
+
+def list_files(
+    service,
+    q: str,
+    fields: str,
+    limit: int,
+    page_size: int,
+    page_token: Optional[str] = None,
+    order_by: Optional[str] = None,
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """Collect up to ``limit`` files matching ``q`` across result pages.
+
+    Returns the files and an opaque continuation token (``None`` when the
+    listing is exhausted).
+    """
+    items: List[Dict[str, Any]] = []
+    cursor: Optional[Cursor] = decode_cursor(page_token, page_size)
+    token = None
+    while cursor is not None:
+        results = _list_files_request(
+            service, q, fields, cursor[2], cursor[0], order_by
         ).execute()
+        cursor, token = _take_page(items, results, limit, cursor)
+    return items, token
 
-        items = results.get("files", [])
 
-        if not items:
-            return "No files found."
+async def list_files_async(
+    config: Config,
+    service,
+    q: str,
+    fields: str,
+    limit: int,
+    page_size: int,
+    page_token: Optional[str] = None,
+    order_by: Optional[str] = None,
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """Async variant of :func:`list_files`."""
+    items: List[Dict[str, Any]] = []
+    cursor: Optional[Cursor] = decode_cursor(page_token, page_size)
+    token = None
+    while cursor is not None:
+        results = await aio.execute(
+            config,
+            _list_files_request(service, q, fields, cursor[2], cursor[0], order_by),
+        )
+        cursor, token = _take_page(items, results, limit, cursor)
+    return items, token
 
-        output = "Found files:\n"
-        for item in items:
-            output += (
-                f"- {item['name']} (ID: {item['id']}) [{item['mimeType']}]\n"
+
+def iter_file_pages(
+    service, q: Optional[str], fields: str
+) -> Iterator[List[Dict[str, Any]]]:
+    """Yield every file matching ``q`` (all files if ``None``), page by page."""
+    page_token = None
+    while True:
+        results = _list_files_request(
+            service, q, fields, DRIVE_PAGE_SIZE, page_token
+        ).execute()
+        yield results.get("files", [])
+        page_token = results.get("nextPageToken")
+        if not page_token:
+            return
+
+
+def _page_plan(limit: int, stream: bool) -> Tuple[int, int]:
+    """(limit, pageSize) for a listing: one small page, or 1,000-file pages."""
+    if stream:
+        limit = min(max(limit, 1), _STREAM_MAX_FILES)
+        return limit, DRIVE_PAGE_SIZE
+    limit = min(max(limit, 1), DRIVE_PAGE_SIZE)
+    return limit, limit
+
+
+def _find_files_query(query: str) -> str:
+    if "contains" not in query and "=" not in query:
+        return f"name contains '{query}' and trashed = false"
+    return query
+
+
+def _format_found_files(
+    items: List[dict], next_page_token: Optional[str] = None
+) -> str:
+    if not items:
+        return "No files found."
+
+    lines = ["Found files:"]
+    lines.extend(
+        f"- {item['name']} (ID: {item['id']}) [{item['mimeType']}]" for item in items
+    )
+    if next_page_token:
+        lines.append(f"\nNext page token: {next_page_token}")
+
+    return "\n".join(lines) + "\n"
+
+
+def find_files_handler(
+    config: Config,
+    logger: logging.Logger,
+    query: str,
+    limit: int = 10,
+    page_token: Optional[str] = None,
+    stream: bool = False,
+) -> str:
+    try:
+        service = get_service(config, "drive", "v3")
+        limit, page_size = _page_plan(limit, stream)
+        q = _find_files_query(query)
+        local = drive_sync.local_search(config, service, q, limit, page_token)
+        if local is not None:
+            items, next_token = local
+        else:
+            items, next_token = list_files(
+                service, q, FIND_FILES_FIELDS, limit, page_size, page_token
             )
+        return _format_found_files(items, next_token)
+    except Exception as e:
+        return f"Error searching files: {str(e)}"
 
-        return output
+
+async def find_files_async_handler(
+    config: Config,
+    logger: logging.Logger,
+    query: str,
+    limit: int = 10,
+    page_token: Optional[str] = None,
+    stream: bool = False,
+) -> str:
+    """Async variant of :func:`find_files_handler` for the event-loop path."""
+    try:
+        service = await aio.get_service(config, "drive", "v3")
+        limit, page_size = _page_plan(limit, stream)
+        q = _find_files_query(query)
+        local = None
+        if config.drive_sync:
+            # The mirror is SQLite; serve it from the Drive lane's pool.
+            local = await run_blocking(
+                drive_sync.local_search, config, service, q, limit, page_token
+            )
+        if local is not None:
+            items, next_token = local
+        else:
+            items, next_token = await list_files_async(
+                config, service, q, FIND_FILES_FIELDS, limit, page_size, page_token
+            )
+        return _format_found_files(items, next_token)
     except Exception as e:
         return f"Error searching files: {str(e)}"
 
@@ -42,8 +239,7 @@ def create_folder_handler(
     config: Config, logger: logging.Logger, name: str, parent_id: Optional[str] = None
 ) -> str:
     try:
-        creds = get_creds(config)
-        service = build("drive", "v3", credentials=creds)
+        service = get_service(config, "drive", "v3")
 
         file_metadata = {
             "name": name,
@@ -60,8 +256,7 @@ def create_folder_handler(
 
 def move_file_handler(config: Config, logger: logging.Logger, file_id: str, folder_id: str) -> str:
     try:
-        creds = get_creds(config)
-        service = build("drive", "v3", credentials=creds)
+        service = get_service(config, "drive", "v3")
 
         # Retrieve the existing parents to remove
         file = service.files().get(fileId=file_id, fields="parents").execute()
@@ -90,8 +285,7 @@ def share_file_handler(
 ) -> str:
     """Share file with public access protection."""
     try:
-        creds = get_creds(config)
-        service = build("drive", "v3", credentials=creds)
+        service = get_service(config, "drive", "v3")
 
         # Block public sharing without explicit confirmation
         if type == "anyone" and not allow_public:
@@ -154,38 +348,57 @@ def share_file_handler(
 
 
 def drive_search_advanced_handler(
-    config: Config, logger: logging.Logger, query: str, limit: int = 50
+    config: Config,
+    logger: logging.Logger,
+    query: str,
+    limit: int = 50,
+    page_token: Optional[str] = None,
+    stream: bool = False,
 ) -> str:
-    """Advanced Drive search with query and limit."""
+    """Advanced Drive search with query and limit.
+
+    ``stream=True`` walks 1,000-file pages with a smaller field mask (no
+    owners) until ``limit`` files are collected.
+    """
     try:
-        creds = get_creds(config)
-        service = build("drive", "v3", credentials=creds)
+        service = get_service(config, "drive", "v3")
 
         if not query:
             return "❌ Query is required."
 
-        results = service.files().list(
-            q=query,
-            pageSize=min(max(limit, 1), 100),
-            fields="files(id, name, mimeType, owners, modifiedTime)",
-        ).execute()
-
-        items = results.get("files", [])
+        limit, page_size = _page_plan(limit, stream)
+        fields = (
+            "nextPageToken, files(id, name, mimeType, modifiedTime)"
+            if stream
+            else "nextPageToken, files(id, name, mimeType, owners, modifiedTime)"
+        )
+        local = drive_sync.local_search(config, service, query, limit, page_token)
+        if local is not None:
+            items, next_token = local
+        else:
+            items, next_token = list_files(
+                service, query, fields, limit, page_size, page_token
+            )
         if not items:
             return "No files found."
 
-        output = "Found files:\n"
+        lines = ["Found files:"]
         for item in items:
-            owners = item.get("owners", [])
-            owner = owners[0].get("emailAddress") if owners else "Unknown"
-            output += (
+            owner = ""
+            if not stream:
+                owners = item.get("owners", [])
+                email = owners[0].get("emailAddress") if owners else "Unknown"
+                owner = f" owner={email}"
+            lines.append(
                 f"- {item.get('name')} (ID: {item.get('id')}) "
-                f"[{item.get('mimeType')}] owner={owner} "
-                f"modified={item.get('modifiedTime')}\n"
+                f"[{item.get('mimeType')}]{owner} "
+                f"modified={item.get('modifiedTime')}"
             )
+        if next_token:
+            lines.append(f"\nNext page token: {next_token}")
 
         logger.info("Drive search: query='%s' results=%s", query, len(items))
-        return output
+        return "\n".join(lines) + "\n"
     except Exception as e:
         logger.error("Error searching files (advanced): %s", str(e))
         return f"Error searching files: {str(e)}"
@@ -194,8 +407,7 @@ def drive_search_advanced_handler(
 def drive_list_permissions_handler(config: Config, logger: logging.Logger, file_id: str) -> str:
     """List permissions for a Drive file."""
     try:
-        creds = get_creds(config)
-        service = build("drive", "v3", credentials=creds)
+        service = get_service(config, "drive", "v3")
 
         perms = service.permissions().list(
             fileId=file_id,
@@ -226,8 +438,7 @@ def drive_revoke_public_handler(
 ) -> str:
     """Revoke public access (type=anyone) for a Drive file."""
     try:
-        creds = get_creds(config)
-        service = build("drive", "v3", credentials=creds)
+        service = get_service(config, "drive", "v3")
 
         perms = service.permissions().list(
             fileId=file_id, fields="permissions(id,type,role,allowFileDiscovery)"
@@ -268,8 +479,7 @@ def drive_copy_file_handler(
 ) -> str:
     """Copy a Drive file to a new file."""
     try:
-        creds = get_creds(config)
-        service = build("drive", "v3", credentials=creds)
+        service = get_service(config, "drive", "v3")
 
         body = {}
         if name:
@@ -285,3 +495,871 @@ def drive_copy_file_handler(
     except Exception as e:
         logger.error("Error copying file %s: %s", file_id, str(e))
         return f"Error copying file: {str(e)}"
+
+
+FOLDER_MIME_TYPE = "application/vnd.google-apps.folder"
+# Parents OR-combined into one files.list query; keeps q well under the
+# Drive query length limit.
+_PARENTS_PER_QUERY = 40
+# Level queries in flight at once.
+_TREE_WORKERS = 4
+_TREE_FIELDS = "nextPageToken, files(id, name, mimeType, parents)"
+
+
+def _list_children(
+    service, parent_ids: List[str], limit: int, folders_only: bool
+) -> List[Dict[str, Any]]:
+    clauses = " or ".join(f"'{pid}' in parents" for pid in parent_ids)
+    q = f"({clauses}) and trashed = false"
+    if folders_only:
+        q += f" and mimeType = '{FOLDER_MIME_TYPE}'"
+    items, _ = list_files(service, q, _TREE_FIELDS, limit, DRIVE_PAGE_SIZE)
+    return items
+
+
+def walk_folder_tree(
+    service,
+    folder_id: str,
+    max_depth: int,
+    max_nodes: int,
+    folders_only: bool = False,
+) -> Tuple[Dict[str, List[Dict[str, Any]]], bool]:
+    """Breadth-first listing of everything below ``folder_id``.
+
+    Each level costs one ``files.list`` query per group of
+    ``_PARENTS_PER_QUERY`` folders (``'a' in parents or 'b' in parents ...``),
+    and the groups of a level run concurrently. Returns the children of
+    every visited folder and whether ``max_nodes`` cut the walk short.
+    """
+    children: Dict[str, List[Dict[str, Any]]] = {}
+    visited = {folder_id}
+    frontier = [folder_id]
+    count = 0
+    truncated = False
+    lock = threading.Lock()
+
+    for _ in range(max_depth):
+        if not frontier or truncated:
+            break
+        level: List[Dict[str, Any]] = []
+        # One extra item tells a full level apart from a truncated one.
+        budget = max_nodes - count + 1
+
+        def _fetch(group: List[str]) -> None:
+            items = _list_children(service, group, budget, folders_only)
+            with lock:
+                level.extend(items)
+
+        groups = chunked([frontier], _PARENTS_PER_QUERY)
+        outcomes = run_chunks(_fetch, groups, _TREE_WORKERS)
+        for outcome in outcomes:
+            if outcome.error is not None:
+                raise outcome.error
+
+        in_frontier = set(frontier)
+        next_frontier: List[str] = []
+        for item in sorted(level, key=lambda i: i.get("name", "").lower()):
+            if count >= max_nodes:
+                truncated = True
+                break
+            count += 1
+            for parent in item.get("parents", []):
+                if parent in in_frontier:
+                    children.setdefault(parent, []).append(item)
+            if item["mimeType"] == FOLDER_MIME_TYPE and item["id"] not in visited:
+                visited.add(item["id"])
+                next_frontier.append(item["id"])
+        frontier = next_frontier
+
+    return children, truncated
+
+
+def _tree_lines(
+    children: Dict[str, List[Dict[str, Any]]], folder_id: str, paths: bool
+) -> List[str]:
+    lines: List[str] = []
+    # Depth-first rendering; folders before files at each level.
+    stack: List[Tuple[Dict[str, Any], int, str]] = []
+
+    def _push(parent_id: str, depth: int, prefix: str) -> None:
+        entries = sorted(
+            children.get(parent_id, []),
+            key=lambda i: (
+                i["mimeType"] != FOLDER_MIME_TYPE,
+                i.get("name", "").lower(),
+            ),
+        )
+        stack.extend((item, depth, prefix) for item in reversed(entries))
+
+    _push(folder_id, 1, "")
+    seen = set()
+    while stack:
+        item, depth, prefix = stack.pop()
+        is_folder = item["mimeType"] == FOLDER_MIME_TYPE
+        name = item.get("name", "") + ("/" if is_folder else "")
+        if paths:
+            lines.append(f"{prefix}{name} (ID: {item['id']})")
+        else:
+            lines.append(f"{'  ' * depth}{name} (ID: {item['id']})")
+        if is_folder and item["id"] not in seen:
+            seen.add(item["id"])
+            _push(item["id"], depth + 1, prefix + name)
+    return lines
+
+
+def drive_folder_tree_handler(
+    config: Config,
+    logger: logging.Logger,
+    folder_id: str = "root",
+    max_depth: int = 5,
+    max_nodes: int = 2000,
+    format: str = "tree",
+    folders_only: bool = False,
+) -> str:
+    """List a folder hierarchy as an indented tree or as flat paths."""
+    try:
+        service = get_service(config, "drive", "v3")
+
+        max_depth = max(1, max_depth)
+        max_nodes = max(1, max_nodes)
+        root = service.files().get(fileId=folder_id, fields="id, name").execute()
+        children, truncated = walk_folder_tree(
+            service, root["id"], max_depth, max_nodes, folders_only
+        )
+        lines = _tree_lines(children, root["id"], paths=format == "paths")
+        if not lines:
+            return f"Folder {root.get('name')} (ID: {root['id']}) is empty."
+
+        folders = sum(
+            1
+            for items in children.values()
+            for item in items
+            if item["mimeType"] == FOLDER_MIME_TYPE
+        )
+        output = [f"{root.get('name')}/ (ID: {root['id']})"]
+        output.extend(lines)
+        output.append("")
+        output.append(f"{len(lines)} items ({folders} folders), depth <= {max_depth}")
+        if truncated:
+            output.append(
+                f"⚠️ Stopped at max_nodes={max_nodes}; "
+                "narrow folder_id or raise the limit."
+            )
+
+        logger.info(
+            "Drive folder tree: %s nodes=%s truncated=%s",
+            root["id"],
+            len(lines),
+            truncated,
+        )
+        return "\n".join(output) + "\n"
+    except Exception as e:
+        logger.error("Error listing folder tree %s: %s", folder_id, str(e))
+        return f"Error listing folder tree: {str(e)}"
+
+
+_BULK_FIELDS = "id, name, mimeType, parents"
+# Batch requests in flight at once; every sub-request still counts against
+# the per-user Drive quota.
+_BULK_WORKERS = 2
+_PREVIEW_SIZE = 10
+# Per-item result lines shown before the report is shortened.
+_MAX_RESULT_LINES = 50
+
+BulkResult = Tuple[Dict[str, Any], Any, Optional[str]]
+
+
+def _error_text(error: Exception) -> str:
+    return getattr(error, "reason", None) or str(error)
+
+
+def select_files(
+    service, file_ids: Optional[List[str]], query: Optional[str]
+) -> List[Dict[str, Any]]:
+    """Metadata (id, name, mimeType, parents) of the selected files.
+
+    A query is listed completely before anything is changed, so moving files
+    out of the query's scope cannot shift later result pages. IDs are looked
+    up through batch requests; unknown IDs come back with an ``error`` key.
+    """
+    if query:
+        fields = f"nextPageToken, files({_BULK_FIELDS})"
+        pages = iter_file_pages(service, query, fields)
+        return [file for page in pages for file in page]
+
+    files: List[Dict[str, Any]] = []
+    for group in chunked([list(dict.fromkeys(file_ids or []))], BATCH_SIZE):
+        requests = [
+            service.files().get(fileId=file_id, fields=_BULK_FIELDS)
+            for file_id in group
+        ]
+        for file_id, (response, error) in zip(group, execute_batch(service, requests)):
+            if error is not None:
+                response = {"id": file_id, "error": _error_text(error)}
+            files.append(response)
+    return files
+
+
+def bulk_apply(
+    service, files: List[Dict[str, Any]], build: Any
+) -> List[BulkResult]:
+    """Send ``build(file)`` for every file through the batch endpoint.
+
+    Files are grouped by 100 per batch request with at most
+    ``_BULK_WORKERS`` batches in flight. Returns ``(file, response, error)``
+    per file, in input order; a failed sub-request only fails its own item.
+    """
+    results: List[BulkResult] = [(file, None, file.get("error")) for file in files]
+    pending = [index for index, file in enumerate(files) if "error" not in file]
+    groups = list(chunked([pending], BATCH_SIZE))
+
+    def _run(group: List[int]) -> None:
+        responses = execute_batch(service, [build(files[index]) for index in group])
+        for index, (response, error) in zip(group, responses):
+            results[index] = (
+                files[index],
+                response,
+                _error_text(error) if error is not None else None,
+            )
+
+    for outcome in run_chunks(_run, groups, _BULK_WORKERS):
+        if outcome.error is not None:
+            for index in groups[outcome.index]:
+                results[index] = (files[index], None, _error_text(outcome.error))
+    return results
+
+
+def _file_label(file: Dict[str, Any]) -> str:
+    return f"{file.get('name', '?')} (ID: {file['id']})"
+
+
+def _bulk_preview(
+    action: str, done: str, target: str, files: List[Dict[str, Any]]
+) -> str:
+    """Dry-run report: selected count, IDs that failed lookup and a sample."""
+    found = [file for file in files if "error" not in file]
+    missing = [file for file in files if "error" in file]
+    output = f"🔍 DRY RUN MODE - No files will be {done}\n\n"
+    output += f"Would {action} {len(found)} file(s){target}.\n"
+    if missing:
+        output += f"\nNot accessible ({len(missing)}):\n"
+        output += "".join(
+            f"- {file['id']}: {file['error']}\n" for file in missing[:_PREVIEW_SIZE]
+        )
+    if found:
+        output += "\nSample:\n"
+        output += "".join(
+            f"- {_file_label(file)} [{file.get('mimeType')}]\n"
+            for file in found[:_PREVIEW_SIZE]
+        )
+    output += f"\nTo {action}, call again with dry_run=False."
+    return output
+
+
+def _bulk_report(
+    verb: str,
+    results: List[BulkResult],
+    describe: Optional[Any] = None,
+    noun: str = "file(s)",
+) -> str:
+    """Summary line plus per-item results (failures first)."""
+    failed = [result for result in results if result[2] is not None]
+    succeeded = [result for result in results if result[2] is None]
+    sent = sum(1 for file, _, _ in results if "error" not in file)
+    batches = -(-sent // BATCH_SIZE)
+
+    if failed:
+        lines = [
+            f"⚠️ {verb} {len(succeeded)} of {len(results)} {noun} "
+            f"in {batches} batch request(s)."
+        ]
+    else:
+        lines = [f"✅ {verb} {len(results)} {noun} in {batches} batch request(s)."]
+
+    shown = 0
+    for file, response, error in failed + succeeded:
+        if shown == _MAX_RESULT_LINES:
+            lines.append(f"  … and {len(results) - shown} more")
+            break
+        if error is not None:
+            lines.append(f"  ❌ {_file_label(file)}: {error}")
+        else:
+            detail = f" {describe(response)}" if describe else ""
+            lines.append(f"  ✅ {_file_label(file)}{detail}")
+        shown += 1
+    return "\n".join(lines)
+
+
+def drive_bulk_move_handler(
+    config: Config,
+    logger: logging.Logger,
+    folder_id: str,
+    file_ids: Optional[List[str]] = None,
+    query: Optional[str] = None,
+    dry_run: bool = True,
+) -> str:
+    """Move many files into ``folder_id`` with one batched update per file."""
+    try:
+        if not file_ids and not query:
+            return "❌ file_ids or query is required."
+
+        service = get_service(config, "drive", "v3")
+        files = select_files(service, file_ids, query)
+        if dry_run:
+            logger.info("Drive bulk move dry-run: count=%s", len(files))
+            return _bulk_preview("move", "moved", f" to folder {folder_id}", files)
+
+        def _move(file: Dict[str, Any]):
+            old_parents = [p for p in file.get("parents", []) if p != folder_id]
+            return service.files().update(
+                fileId=file["id"],
+                addParents=folder_id,
+                removeParents=",".join(old_parents) or None,
+                fields="id, parents",
+            )
+
+        results = bulk_apply(service, files, _move)
+        logger.info("Drive bulk move: %s file(s) -> %s", len(results), folder_id)
+        return _bulk_report(f"Moved to folder {folder_id}:", results)
+    except Exception as e:
+        logger.error("Error moving files: %s", str(e))
+        return f"❌ Error moving files: {str(e)}"
+
+
+def drive_bulk_copy_handler(
+    config: Config,
+    logger: logging.Logger,
+    file_ids: Optional[List[str]] = None,
+    query: Optional[str] = None,
+    parent_id: Optional[str] = None,
+    dry_run: bool = True,
+) -> str:
+    """Copy many files (into ``parent_id`` if given) through batch requests."""
+    try:
+        if not file_ids and not query:
+            return "❌ file_ids or query is required."
+
+        service = get_service(config, "drive", "v3")
+        files = select_files(service, file_ids, query)
+        target = f" into folder {parent_id}" if parent_id else ""
+        if dry_run:
+            logger.info("Drive bulk copy dry-run: count=%s", len(files))
+            return _bulk_preview("copy", "copied", target, files)
+
+        body = {"parents": [parent_id]} if parent_id else {}
+
+        def _copy(file: Dict[str, Any]):
+            return service.files().copy(fileId=file["id"], body=body, fields="id, name")
+
+        results = bulk_apply(service, files, _copy)
+        logger.info("Drive bulk copy: %s file(s)%s", len(results), target)
+        return _bulk_report(
+            f"Copied{target}:", results, lambda copy: f"-> {copy.get('id')}"
+        )
+    except Exception as e:
+        logger.error("Error copying files: %s", str(e))
+        return f"❌ Error copying files: {str(e)}"
+
+
+def drive_bulk_share_handler(
+    config: Config,
+    logger: logging.Logger,
+    role: str,
+    type: str = "user",
+    email_address: Optional[str] = None,
+    domain: Optional[str] = None,
+    file_ids: Optional[List[str]] = None,
+    query: Optional[str] = None,
+    allow_public: bool = False,
+    send_notification: bool = False,
+    dry_run: bool = True,
+) -> str:
+    """Grant the same permission on many files with public access protection."""
+    try:
+        if not file_ids and not query:
+            return "❌ file_ids or query is required."
+        if type == "anyone" and not allow_public:
+            logger.warning("Public bulk sharing blocked")
+            return (
+                "⚠️ PUBLIC ACCESS BLOCKED\n\n"
+                "You are trying to make every selected file PUBLIC "
+                "(accessible to ANYONE with the link).\n\n"
+                "To proceed, you must explicitly set allow_public=True\n\n"
+                "✅ Safer alternative: Share with specific users using type='user'"
+            )
+        if type in ["user", "group"]:
+            if not email_address or not validate_email(email_address):
+                return f"❌ Invalid email format: {email_address}"
+        if type == "domain" and not domain:
+            return "❌ domain is required for type='domain'."
+
+        permission = {"type": type, "role": role}
+        if email_address:
+            permission["emailAddress"] = email_address
+        if domain:
+            permission["domain"] = domain
+        grantee = email_address or domain or "anyone"
+
+        service = get_service(config, "drive", "v3")
+        files = select_files(service, file_ids, query)
+        target = f" with {grantee} as {role}"
+        if dry_run:
+            logger.info("Drive bulk share dry-run: count=%s", len(files))
+            return _bulk_preview("share", "shared", target, files)
+
+        notify = send_notification if type in ["user", "group"] else None
+
+        def _share(file: Dict[str, Any]):
+            return service.permissions().create(
+                fileId=file["id"],
+                body=permission,
+                sendNotificationEmail=notify,
+                fields="id",
+            )
+
+        results = bulk_apply(service, files, _share)
+        logger.info(
+            "Drive bulk share: %s file(s) (%s=%s, role=%s)",
+            len(results),
+            type,
+            grantee,
+            role,
+        )
+        report = _bulk_report(f"Shared{target}:", results)
+        if type == "anyone":
+            report += "\n\n⚠️ These files are now PUBLIC"
+        return report
+    except Exception as e:
+        logger.error("Error sharing files: %s", str(e))
+        return f"❌ Error sharing files: {str(e)}"
+
+
+def drive_bulk_trash_handler(
+    config: Config,
+    logger: logging.Logger,
+    file_ids: Optional[List[str]] = None,
+    query: Optional[str] = None,
+    dry_run: bool = True,
+) -> str:
+    """Move many files to the trash through batch requests."""
+    try:
+        if not file_ids and not query:
+            return "❌ file_ids or query is required."
+
+        service = get_service(config, "drive", "v3")
+        files = select_files(service, file_ids, query)
+        if dry_run:
+            logger.info("Drive bulk trash dry-run: count=%s", len(files))
+            return _bulk_preview("trash", "trashed", "", files)
+
+        def _trash(file: Dict[str, Any]):
+            return service.files().update(
+                fileId=file["id"], body={"trashed": True}, fields="id"
+            )
+
+        results = bulk_apply(service, files, _trash)
+        logger.info("Drive bulk trash: %s file(s)", len(results))
+        return _bulk_report("Moved to trash:", results)
+    except Exception as e:
+        logger.error("Error trashing files: %s", str(e))
+        return f"❌ Error trashing files: {str(e)}"
+
+
+_PERMISSION_FIELDS = (
+    "nextPageToken, "
+    "permissions(id, type, role, emailAddress, domain, allowFileDiscovery)"
+)
+# Flagged files and grantees listed in an audit report.
+_AUDIT_TOP = 20
+
+
+def _permission_target(permission: Dict[str, Any]) -> str:
+    return permission.get("emailAddress") or permission.get("domain") or "anyone"
+
+
+def _permission_flag(
+    permission: Dict[str, Any], internal_domains: List[str]
+) -> Optional[str]:
+    """``"public"``, ``"external"`` or ``None`` for an internal grant.
+
+    ``internal_domains`` may also hold single addresses (see
+    :func:`_internal_domains`).
+    """
+    kind = permission.get("type")
+    if kind == "anyone":
+        return "public"
+    if kind == "domain":
+        domain = permission.get("domain", "")
+    else:
+        address = (permission.get("emailAddress") or "").lower()
+        if address in internal_domains:
+            return None
+        domain = address.rpartition("@")[2]
+    if domain and domain.lower() not in internal_domains:
+        return "external"
+    return None
+
+
+# Consumer accounts: sharing with another address on these domains is
+# still sharing outside the organisation.
+_WEBMAIL_DOMAINS = {"gmail.com", "googlemail.com"}
+
+
+def _internal_domains(service, extra: Optional[List[str]]) -> List[str]:
+    """The signed-in Workspace account's domain plus any ``extra`` domains.
+
+    A consumer account contributes only its own address.
+    """
+    about = service.about().get(fields="user(emailAddress)").execute()
+    address = about.get("user", {}).get("emailAddress", "").lower()
+    own = address.rpartition("@")[2]
+    domains = list(extra or [])
+    domains.append(address if own in _WEBMAIL_DOMAINS else own)
+    return sorted({domain.strip().lower().lstrip("@") for domain in domains if domain})
+
+
+def _folder_levels(service, root_id: str, max_depth: int) -> Iterator[List[str]]:
+    """Folder IDs of each level below ``root_id``, starting with ``[root_id]``.
+
+    Levels are sorted by ID so a later call rebuilds them identically.
+    """
+    visited = {root_id}
+    level = [root_id]
+    for depth in range(max_depth):
+        if not level:
+            return
+        yield level
+        if depth == max_depth - 1:
+            return
+        found = set()
+        for group in chunked([level], _PARENTS_PER_QUERY):
+            for item in _list_children(service, group, sys.maxsize, True):
+                if item["id"] not in visited:
+                    found.add(item["id"])
+        visited |= found
+        level = sorted(found)
+
+
+def _encode_audit_cursor(
+    folder_id: str, depth: int, group: int, cursor: Optional[str]
+) -> str:
+    raw = json.dumps([folder_id, depth, group, cursor], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def _decode_audit_cursor(token: str) -> Tuple[str, int, int, Optional[str]]:
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        folder_id, depth, group, cursor = json.loads(base64.urlsafe_b64decode(padded))
+        return folder_id, int(depth), int(group), cursor
+    except Exception:
+        raise ValueError("Invalid page_token") from None
+
+
+def audit_files(
+    service,
+    folder_id: Optional[str],
+    query: Optional[str],
+    max_depth: int,
+    max_files: int,
+    page_token: Optional[str] = None,
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """Up to ``max_files`` files in scope of an audit and a continuation token.
+
+    A query is listed with :func:`list_files`. A folder (itself included)
+    is listed level by level, ``_PARENTS_PER_QUERY`` parents per query; its
+    token records the level, the parent group and the Drive page token
+    inside that group, so every call resumes exactly where the last stopped.
+    """
+    fields = f"nextPageToken, files({_BULK_FIELDS})"
+    if not folder_id:
+        return list_files(
+            service, query, fields, max_files, DRIVE_PAGE_SIZE, page_token
+        )
+
+    root = service.files().get(fileId=folder_id, fields=_BULK_FIELDS).execute()
+    files: List[Dict[str, Any]] = []
+    depth, group, cursor = 0, 0, None
+    if page_token:
+        token_folder, depth, group, cursor = _decode_audit_cursor(page_token)
+        if token_folder != root["id"]:
+            raise ValueError("page_token belongs to a different folder")
+    else:
+        files.append(root)
+
+    for level_index, level in enumerate(_folder_levels(service, root["id"], max_depth)):
+        if level_index < depth:
+            continue
+        groups = list(chunked([level], _PARENTS_PER_QUERY))
+        first = group if level_index == depth else 0
+        for group_index in range(first, len(groups)):
+            if len(files) >= max_files:
+                next_token = _encode_audit_cursor(
+                    root["id"], level_index, group_index, None
+                )
+                return files, next_token
+            clauses = " or ".join(f"'{pid}' in parents" for pid in groups[group_index])
+            items, cursor = list_files(
+                service,
+                f"({clauses}) and trashed = false",
+                fields,
+                max_files - len(files),
+                DRIVE_PAGE_SIZE,
+                cursor if level_index == depth and group_index == group else None,
+            )
+            files.extend(items)
+            if cursor:
+                next_token = _encode_audit_cursor(
+                    root["id"], level_index, group_index, cursor
+                )
+                return files, next_token
+    return files, None
+
+
+def audit_permissions(
+    service, files: List[Dict[str, Any]], internal_domains: List[str]
+) -> List[Tuple[Dict[str, Any], List[Tuple[str, Dict[str, Any]]], Optional[str]]]:
+    """``(file, [(flag, permission), ...], error)`` for every file.
+
+    ``permissions.list`` goes through :func:`bulk_apply`, 100 files per
+    batch request. The rare file with more than 100 permissions has its
+    remaining pages fetched one call at a time.
+    """
+
+    def _list(file: Dict[str, Any]):
+        return service.permissions().list(
+            fileId=file["id"], pageSize=100, fields=_PERMISSION_FIELDS
+        )
+
+    audited = []
+    for file, response, error in bulk_apply(service, files, _list):
+        if error is not None:
+            audited.append((file, [], error))
+            continue
+        permissions = list(response.get("permissions", []))
+        page_token = response.get("nextPageToken")
+        while page_token:
+            page = service.permissions().list(
+                fileId=file["id"],
+                pageSize=100,
+                pageToken=page_token,
+                fields=_PERMISSION_FIELDS,
+            ).execute()
+            permissions.extend(page.get("permissions", []))
+            page_token = page.get("nextPageToken")
+        flagged = []
+        for permission in permissions:
+            flag = _permission_flag(permission, internal_domains)
+            if flag:
+                flagged.append((flag, permission))
+        audited.append((file, flagged, None))
+    return audited
+
+
+def _audit_scope(
+    service,
+    logger: logging.Logger,
+    folder_id: Optional[str],
+    query: Optional[str],
+    internal_domains: Optional[List[str]],
+    max_depth: int,
+    max_files: int,
+    page_token: Optional[str],
+):
+    domains = _internal_domains(service, internal_domains)
+    files, next_token = audit_files(
+        service, folder_id, query, max(1, max_depth), max(1, max_files), page_token
+    )
+    logger.info("Drive permission audit: scanning %s file(s)", len(files))
+    return domains, next_token, audit_permissions(service, files, domains)
+
+
+def _continuation(next_token: Optional[str], max_files: int) -> str:
+    return (
+        f"⚠️ Stopped at max_files={max_files}. Next page token: {next_token}\n"
+        "Call again with page_token to continue with the next files."
+    )
+
+
+def drive_permission_audit_handler(
+    config: Config,
+    logger: logging.Logger,
+    folder_id: Optional[str] = None,
+    query: Optional[str] = None,
+    internal_domains: Optional[List[str]] = None,
+    max_depth: int = 20,
+    max_files: int = 50000,
+    page_token: Optional[str] = None,
+) -> str:
+    """Flag public and external-domain grants across a folder or query."""
+    try:
+        if not folder_id and not query:
+            return "❌ folder_id or query is required."
+
+        service = get_service(config, "drive", "v3")
+        domains, next_token, audited = _audit_scope(
+            service,
+            logger,
+            folder_id,
+            query,
+            internal_domains,
+            max_depth,
+            max_files,
+            page_token,
+        )
+
+        failed = [entry for entry in audited if entry[2] is not None]
+        flagged = [(file, grants) for file, grants, _ in audited if grants]
+        public_files = discoverable = external_files = external_grants = 0
+        grantees: Dict[Tuple[str, str, str], int] = {}
+        for _, grants in flagged:
+            flags = {flag for flag, _ in grants}
+            public_files += "public" in flags
+            external_files += "external" in flags
+            for flag, permission in grants:
+                if flag == "public":
+                    discoverable += bool(permission.get("allowFileDiscovery"))
+                    continue
+                external_grants += 1
+                key = (
+                    _permission_target(permission),
+                    permission.get("type", ""),
+                    permission.get("role", ""),
+                )
+                grantees[key] = grantees.get(key, 0) + 1
+
+        batches = -(-len(audited) // BATCH_SIZE)
+        output = [
+            f"Permission audit: {len(audited)} file(s) in {batches} batch request(s)",
+            f"Internal domains: {', '.join(domains) or '(none)'}",
+            "",
+            f"Public (anyone): {public_files} file(s), {discoverable} discoverable",
+            f"External grants: {external_grants} on {external_files} file(s)",
+        ]
+        if grantees:
+            output.append("")
+            output.append("Top external grantees:")
+            ranked = sorted(grantees.items(), key=lambda item: (-item[1], item[0]))
+            for (target, kind, role), count in ranked[:_AUDIT_TOP]:
+                output.append(f"- {target} ({kind}, {role}): {count} file(s)")
+            if len(ranked) > _AUDIT_TOP:
+                output.append(f"  … and {len(ranked) - _AUDIT_TOP} more")
+        if flagged:
+            output.append("")
+            output.append("Flagged files:")
+            for file, grants in flagged[:_MAX_RESULT_LINES]:
+                summary = ", ".join(
+                    f"{_permission_target(p)}/{p.get('role')}" for _, p in grants
+                )
+                output.append(f"- {_file_label(file)}: {summary}")
+            if len(flagged) > _MAX_RESULT_LINES:
+                output.append(f"  … and {len(flagged) - _MAX_RESULT_LINES} more")
+        if failed:
+            output.append("")
+            output.append(f"⚠️ Permissions not readable for {len(failed)} file(s):")
+            for file, _, error in failed[:_PREVIEW_SIZE]:
+                output.append(f"- {_file_label(file)}: {error}")
+        if next_token:
+            output.append("")
+            output.append(_continuation(next_token, max_files))
+
+        logger.info(
+            "Drive permission audit: files=%s public=%s external=%s",
+            len(audited),
+            public_files,
+            external_files,
+        )
+        return "\n".join(output) + "\n"
+    except Exception as e:
+        logger.error("Error auditing permissions: %s", str(e))
+        return f"❌ Error auditing permissions: {str(e)}"
+
+
+def drive_bulk_revoke_handler(
+    config: Config,
+    logger: logging.Logger,
+    folder_id: Optional[str] = None,
+    query: Optional[str] = None,
+    internal_domains: Optional[List[str]] = None,
+    include_external: bool = True,
+    max_depth: int = 20,
+    max_files: int = 50000,
+    page_token: Optional[str] = None,
+    confirm: bool = False,
+) -> str:
+    """Delete the grants ``drive_permission_audit`` flags, in batches."""
+    try:
+        if not folder_id and not query:
+            return "❌ folder_id or query is required."
+
+        service = get_service(config, "drive", "v3")
+        _, next_token, audited = _audit_scope(
+            service,
+            logger,
+            folder_id,
+            query,
+            internal_domains,
+            max_depth,
+            max_files,
+            page_token,
+        )
+
+        targets: List[Dict[str, Any]] = []
+        owners = 0
+        for file, grants, _ in audited:
+            for flag, permission in grants:
+                if flag == "external" and not include_external:
+                    continue
+                # Ownership cannot be removed through permissions.delete.
+                if permission.get("role") == "owner":
+                    owners += 1
+                    continue
+                targets.append(
+                    {
+                        "id": file["id"],
+                        "name": f"{file.get('name', '?')} [{_permission_target(permission)}]",
+                        "permissionId": permission["id"],
+                    }
+                )
+
+        scope = "public and external" if include_external else "public"
+        if not targets:
+            output = f"No {scope} permissions found in {len(audited)} file(s)."
+            if next_token:
+                output += "\n\n" + _continuation(next_token, max_files)
+            return output
+
+        if not confirm:
+            output = (
+                "⚠️ CONFIRMATION REQUIRED\n\n"
+                f"Files scanned: {len(audited)}\n"
+                f"{scope.capitalize()} permissions found: {len(targets)} "
+                f"on {len({target['id'] for target in targets})} file(s)\n"
+            )
+            if owners:
+                output += f"External owners (not revocable): {owners}\n"
+            if next_token:
+                output += (
+                    f"⚠️ Only the first {len(audited)} file(s) were scanned; "
+                    "the report after revoking gives the page token for the rest.\n"
+                )
+            return output + "To revoke, call again with confirm=True."
+
+        def _delete(target: Dict[str, Any]):
+            return service.permissions().delete(
+                fileId=target["id"], permissionId=target["permissionId"]
+            )
+
+        results = bulk_apply(service, targets, _delete)
+        logger.info("Drive bulk revoke: %s %s permission(s)", len(results), scope)
+        report = _bulk_report(
+            f"Revoked {scope} access:", results, noun="permission(s)"
+        )
+        if owners:
+            report += f"\n\nSkipped {owners} external owner grant(s)."
+        if next_token:
+            report += "\n\n" + _continuation(next_token, max_files)
+        return report
+    except Exception as e:
+        logger.error("Error revoking permissions: %s", str(e))
+        return f"❌ Error revoking permissions: {str(e)}"
@@ -1,13 +1,344 @@
 import base64
+import hashlib
 import logging
+import os
+import re
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
 from email.mime.text import MIMEText
-from typing import List, Optional
-
-from googleapiclient.discovery import build
-
-from ..auth import get_creds
+from email.utils import parseaddr
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+)
+
+from googleapiclient.errors import HttpError
+
+from .. import aio, gmail_sync, mime
+from ..batching import ChunkOutcome, chunked, execute_batch, run_chunks
 from ..config import Config
+from ..executors import run_blocking
 from ..security import validate_email
+from ..services import get_service
+from ..transport import REQUEST_TIMEOUT, get_http
+
+
+# messages.list returns at most 500 IDs per page.
+GMAIL_PAGE_SIZE = 500
+# Gmail throttles large batches; Google recommends at most 50 calls each.
+GMAIL_BATCH_SIZE = 50
+METADATA_HEADERS = ["From", "Subject", "Date"]
+# batchModify / batchDelete accept at most 1,000 IDs per call.
+GMAIL_CHUNK_SIZE = 1000
+# Each batchModify/batchDelete costs 50 quota units of the 250/s per-user
+# budget, so only a few chunks run at once.
+GMAIL_CHUNK_WORKERS = 4
+
+
+def _list_request(service, query: Optional[str], limit: int, page_token: Optional[str]):
+    return service.users().messages().list(
+        userId="me",
+        q=query or "",
+        maxResults=min(limit, GMAIL_PAGE_SIZE),
+        pageToken=page_token,
+    )
+
+
+def list_message_ids(
+    service, query: Optional[str], max_results: int, page_token: Optional[str] = None
+) -> Tuple[List[str], Optional[str]]:
+    """Collect up to ``max_results`` message IDs across result pages.
+
+    Returns the IDs and the ``nextPageToken`` to continue from (``None`` when
+    the listing is exhausted).
+    """
+    ids: List[str] = []
+    while len(ids) < max_results:
+        results = _list_request(
+            service, query, max_results - len(ids), page_token
+        ).execute()
+        ids.extend(msg["id"] for msg in results.get("messages", []))
+        page_token = results.get("nextPageToken")
+        if not page_token:
+            break
+    return ids, page_token
+
+
+async def list_message_ids_async(
+    config: Config,
+    service,
+    query: Optional[str],
+    max_results: int,
+    page_token: Optional[str] = None,
+) -> Tuple[List[str], Optional[str]]:
+    """Async variant of :func:`list_message_ids`."""
+    ids: List[str] = []
+    while len(ids) < max_results:
+        results = await aio.execute(
+            config, _list_request(service, query, max_results - len(ids), page_token)
+        )
+        ids.extend(msg["id"] for msg in results.get("messages", []))
+        page_token = results.get("nextPageToken")
+        if not page_token:
+            break
+    return ids, page_token
+
+
+def iter_message_id_pages(service, query: str) -> Iterator[List[str]]:
+    """Yield the IDs matching ``query`` one ``messages.list`` page at a time."""
+    page_token = None
+    while True:
+        results = _list_request(service, query, GMAIL_PAGE_SIZE, page_token).execute()
+        yield [msg["id"] for msg in results.get("messages", [])]
+        page_token = results.get("nextPageToken")
+        if not page_token:
+            return
+
+
+def _select_pages(
+    service, message_ids: Optional[List[str]], query: Optional[str]
+) -> Iterable[List[str]]:
+    """Pages of target IDs: streamed from ``query`` or the explicit list."""
+    if query:
+        return iter_message_id_pages(service, query)
+    return [list(dict.fromkeys(message_ids or []))]
+
+
+def _count_selection(pages: Iterable[List[str]], sample: int = 10) -> Tuple[int, List[str]]:
+    count = 0
+    sample_ids: List[str] = []
+    for page in pages:
+        count += len(page)
+        sample_ids.extend(page[: sample - len(sample_ids)])
+    return count, sample_ids
+
+
+def _digest_selection(
+    pages: Iterable[List[str]], sample: int = 10
+) -> Tuple[int, str, List[str]]:
+    """Count, order-independent digest and a sample of the streamed IDs.
+
+    The digest is a sum of per-ID hashes, so it is computed page by page in
+    constant memory and does not depend on listing order.
+    """
+    count = 0
+    total = 0
+    sample_ids: List[str] = []
+    for page in pages:
+        for message_id in page:
+            digest = hashlib.sha256(message_id.encode("utf-8")).digest()
+            total = (total + int.from_bytes(digest[:8], "big")) % (1 << 64)
+        count += len(page)
+        sample_ids.extend(page[: sample - len(sample_ids)])
+    return count, f"{total:016x}", sample_ids
+
+
+def _cap_pages(pages: Iterable[List[str]], budget: List[int]) -> Iterator[List[str]]:
+    """Pass pages through until ``budget[0]`` IDs have been yielded.
+
+    The budget is a one-item list so that several sweeps share it.
+    """
+    for page in pages:
+        page = page[: budget[0]]
+        if not page:
+            return
+        budget[0] -= len(page)
+        yield page
+
+
+def _run_message_chunks(
+    logger: logging.Logger,
+    action: str,
+    fn: Callable[[List[str]], Any],
+    pages: Iterable[List[str]],
+) -> List[ChunkOutcome]:
+    """Run ``fn`` over streamed IDs in 1,000-ID chunks, logging progress."""
+
+    def _progress(outcome: ChunkOutcome) -> None:
+        logger.info(
+            "Gmail %s chunk %s: %s message(s)%s",
+            action,
+            outcome.index + 1,
+            outcome.size,
+            f" failed: {outcome.error}" if outcome.error else "",
+        )
+
+    return run_chunks(
+        fn, chunked(pages, GMAIL_CHUNK_SIZE), GMAIL_CHUNK_WORKERS, _progress
+    )
+
+
+def _batch_modify(
+    service,
+    logger: logging.Logger,
+    pages: Iterable[List[str]],
+    add_label_ids: Optional[List[str]] = None,
+    remove_label_ids: Optional[List[str]] = None,
+) -> List[ChunkOutcome]:
+    """Apply a label change to streamed IDs, 1,000 per ``batchModify`` call."""
+    body: Dict[str, Any] = {}
+    if add_label_ids:
+        body["addLabelIds"] = add_label_ids
+    if remove_label_ids:
+        body["removeLabelIds"] = remove_label_ids
+
+    def _modify(ids: List[str]) -> None:
+        service.users().messages().batchModify(
+            userId="me", body={"ids": ids, **body}
+        ).execute()
+
+    return _run_message_chunks(logger, "batchModify", _modify, pages)
+
+
+def _batch_delete(
+    service, logger: logging.Logger, pages: Iterable[List[str]]
+) -> List[ChunkOutcome]:
+    """Permanently delete streamed IDs, 1,000 per ``batchDelete`` call."""
+
+    def _delete(ids: List[str]) -> None:
+        service.users().messages().batchDelete(
+            userId="me", body={"ids": ids}
+        ).execute()
+
+    return _run_message_chunks(logger, "batchDelete", _delete, pages)
+
+
+# Archiving or deleting takes messages out of their own query, which shifts
+# the messages.list pages being walked; the query is re-run until it comes
+# back empty (or this many passes were made).
+_MAX_SWEEPS = 5
+
+
+def _unseen_pages(pages: Iterable[List[str]], seen: Set[str]) -> Iterator[List[str]]:
+    """Drop IDs already in ``seen`` from each page and record the rest."""
+    for page in pages:
+        page = [message_id for message_id in page if message_id not in seen]
+        seen.update(page)
+        if page:
+            yield page
+
+
+def _sweep_query(
+    service,
+    query: str,
+    run_pass: Callable[[Iterable[List[str]]], List[ChunkOutcome]],
+) -> Tuple[List[ChunkOutcome], Set[str]]:
+    """Run ``run_pass`` over the query's IDs until it finds no new message.
+
+    Gmail's search index lags behind changes, so a repeat sweep can list
+    messages that were just processed; each ID is passed on only once.
+    Returns the outcomes and every ID passed on.
+    """
+    outcomes: List[ChunkOutcome] = []
+    seen: Set[str] = set()
+    for _ in range(_MAX_SWEEPS):
+        pages = _unseen_pages(iter_message_id_pages(service, query), seen)
+        pass_outcomes = run_pass(pages)
+        for outcome in pass_outcomes:
+            outcome.index += len(outcomes)
+        outcomes.extend(pass_outcomes)
+        if not pass_outcomes or any(outcome.error for outcome in pass_outcomes):
+            break
+    return outcomes, seen
+
+
+def _format_preview(service, message_ids: List[str]) -> str:
+    """One line per message (sender and subject), fetched in one batch."""
+    lines = ""
+    for msg in fetch_messages(service, message_ids):
+        if "error" in msg:
+            lines += f"  • {msg['id']}: (unable to load preview)\n"
+            continue
+        headers = message_headers(msg)
+        lines += (
+            f"  • {msg['id']}: {headers.get('From', '')} | "
+            f"{headers.get('Subject', '(no subject)')}\n"
+        )
+    return lines
+
+
+def _chunk_report(outcomes: List[ChunkOutcome]) -> Tuple[int, int, str]:
+    """Return (succeeded, total, failure lines) for chunk outcomes."""
+    total = sum(outcome.size for outcome in outcomes)
+    failed = [outcome for outcome in outcomes if outcome.error]
+    succeeded = total - sum(outcome.size for outcome in failed)
+    lines = "".join(
+        f"  • chunk {outcome.index + 1} ({outcome.size} message(s)): {outcome.error}\n"
+        for outcome in failed
+    )
+    return succeeded, total, lines
+
+
+def _get_requests(service, message_ids: List[str], fmt: str) -> list:
+    messages_api = service.users().messages()
+    return [
+        messages_api.get(
+            userId="me",
+            id=mid,
+            format=fmt,
+            metadataHeaders=METADATA_HEADERS if fmt == "metadata" else None,
+        )
+        for mid in message_ids
+    ]
+
+
+def _merge_results(message_ids: List[str], results) -> List[Dict[str, Any]]:
+    messages = []
+    for mid, (message, error) in zip(message_ids, results):
+        if error is None:
+            messages.append(message)
+        else:
+            status = getattr(getattr(error, "resp", None), "status", None)
+            messages.append({"id": mid, "error": str(error), "status": status})
+    return messages
+
+
+def fetch_messages(
+    service, message_ids: List[str], fmt: str = "metadata"
+) -> List[Dict[str, Any]]:
+    """Fetch many messages through the Gmail batch endpoint.
+
+    Returns one message resource per ID, in order. A message that could not
+    be fetched is returned as ``{"id": ..., "error": ..., "status": ...}``
+    (``status`` is the HTTP status, if any).
+    """
+    results = execute_batch(
+        service, _get_requests(service, message_ids, fmt), GMAIL_BATCH_SIZE
+    )
+    return _merge_results(message_ids, results)
+
+
+async def fetch_messages_async(
+    config: Config, service, message_ids: List[str], fmt: str = "metadata"
+) -> List[Dict[str, Any]]:
+    """Async variant of :func:`fetch_messages` (bounded concurrent fan-out)."""
+    results = await aio.execute_all(config, _get_requests(service, message_ids, fmt))
+    return _merge_results(message_ids, results)
+
+
+def message_headers(message: Dict[str, Any]) -> Dict[str, str]:
+    return {
+        h["name"]: h["value"] for h in message.get("payload", {}).get("headers", [])
+    }
+
+
+def _format_message_list(messages: List[Dict[str, Any]], next_page_token: Optional[str]) -> str:
+    output = "Messages:\n"
+    for msg in messages:
+        snippet = msg.get("snippet", "") if "error" not in msg else "(unable to load)"
+        output += f"- ID: {msg['id']} | Snippet: {snippet}\n"
+    if next_page_token:
+        output += f"\nNext page token: {next_page_token}\n"
+    return output
 
 
 def _create_message(to: str, subject: str, message_text: str) -> dict:
@@ -32,8 +363,7 @@ def send_email_handler(
         if not validate_email(to):
             return f"❌ Invalid email format: {to}"
 
-        creds = get_creds(config)
-        service = build("gmail", "v1", credentials=creds)
+        service = get_service(config, "gmail", "v1")
         message = _create_message(to, subject, body_text)
 
         # Safe by default: create draft unless explicitly disabled
@@ -69,8 +399,7 @@ def send_email_handler(
 def send_draft_handler(config: Config, logger: logging.Logger, draft_id: str) -> str:
     """Send an existing draft."""
     try:
-        creds = get_creds(config)
-        service = build("gmail", "v1", credentials=creds)
+        service = get_service(config, "gmail", "v1")
 
         sent_message = (
             service.users()
@@ -90,8 +419,7 @@ def send_draft_handler(config: Config, logger: logging.Logger, draft_id: str) ->
 def get_gmail_profile_handler(config: Config, logger: logging.Logger) -> str:
     """Get the authenticated Gmail address (profile)."""
     try:
-        creds = get_creds(config)
-        service = build("gmail", "v1", credentials=creds)
+        service = get_service(config, "gmail", "v1")
         profile = service.users().getProfile(userId="me").execute()
         email_address = profile.get("emailAddress", "Unknown")
         logger.info("Gmail profile accessed: %s", email_address)
@@ -105,8 +433,7 @@ def create_draft_handler(
     config: Config, logger: logging.Logger, to: str, subject: str, body_text: str
 ) -> str:
     try:
-        creds = get_creds(config)
-        service = build("gmail", "v1", credentials=creds)
+        service = get_service(config, "gmail", "v1")
 
         message = _create_message(to, subject, body_text)
         draft = {"message": message}
@@ -120,65 +447,381 @@ def create_draft_handler(
 
 
 def list_emails_handler(
-    config: Config, logger: logging.Logger, max_results: int = 10, query: Optional[str] = None
+    config: Config,
+    logger: logging.Logger,
+    max_results: int = 10,
+    query: Optional[str] = None,
+    page_token: Optional[str] = None,
 ) -> str:
     try:
-        creds = get_creds(config)
-        service = build("gmail", "v1", credentials=creds)
+        service = get_service(config, "gmail", "v1")
+
+        local = gmail_sync.local_search(config, service, query, max_results, page_token)
+        if local is not None:
+            messages, next_page_token = local
+            if not messages:
+                return "No messages found."
+            return _format_message_list(messages, next_page_token)
+        if page_token and page_token.startswith("local:"):
+            # Issued by the local store, which is not ready any more (e.g.
+            # reseeding): start over from Gmail's first page.
+            page_token = None
+
+        message_ids, next_page_token = list_message_ids(
+            service, query, max_results, page_token
+        )
+        if not message_ids:
+            return "No messages found."
 
-        q = query if query else ""
-        results = (
-            service.users()
-            .messages()
-            .list(userId="me", maxResults=max_results, q=q)
-            .execute()
+        messages = fetch_messages(service, message_ids, fmt="minimal")
+        return _format_message_list(messages, next_page_token)
+    except Exception as e:
+        return f"Error listing emails: {str(e)}"
+
+
+async def list_emails_async_handler(
+    config: Config,
+    logger: logging.Logger,
+    max_results: int = 10,
+    query: Optional[str] = None,
+    page_token: Optional[str] = None,
+) -> str:
+    """Async variant of :func:`list_emails_handler` for the event-loop path."""
+    if config.gmail_sync:
+        # The local store is SQLite; serve it from the Gmail lane's pool.
+        return await run_blocking(
+            list_emails_handler, config, logger, max_results, query, page_token
         )
-        messages = results.get("messages", [])
+    try:
+        service = await aio.get_service(config, "gmail", "v1")
 
-        if not messages:
+        message_ids, next_page_token = await list_message_ids_async(
+            config, service, query, max_results, page_token
+        )
+        if not message_ids:
             return "No messages found."
 
-        output = "Messages:\n"
-        for msg in messages:
-            txt = (
-                service.users()
-                .messages()
-                .get(userId="me", id=msg["id"], format="minimal")
-                .execute()
-            )
-            snippet = txt.get("snippet", "")
-            output += f"- ID: {msg['id']} | Snippet: {snippet}\n"
-
-        return output
+        messages = await fetch_messages_async(
+            config, service, message_ids, fmt="minimal"
+        )
+        return _format_message_list(messages, next_page_token)
     except Exception as e:
         return f"Error listing emails: {str(e)}"
 
 
-def read_email_handler(config: Config, logger: logging.Logger, message_id: str) -> str:
+def _full_message_request(service, message_id: str):
+    return service.users().messages().get(userId="me", id=message_id)
+
+
+def fetch_full_messages(service, message_ids: List[str]) -> List[Dict[str, Any]]:
+    """Batch counterpart of the :func:`read_email_handler` fetch."""
+    requests = [_full_message_request(service, mid) for mid in message_ids]
+    return _merge_results(
+        message_ids, execute_batch(service, requests, GMAIL_BATCH_SIZE)
+    )
+
+
+def message_text(message: Dict[str, Any]) -> str:
+    """Readable body of a ``format=full`` message (see :func:`mime.body_text`)."""
+    return mime.body_text(message.get("payload", {}))
+
+
+def read_email_handler(
+    config: Config,
+    logger: logging.Logger,
+    message_id: str,
+    max_bytes: int = 20000,
+    include_quoted: bool = False,
+) -> str:
     try:
-        creds = get_creds(config)
-        service = build("gmail", "v1", credentials=creds)
+        service = get_service(config, "gmail", "v1")
 
-        message = (
-            service.users().messages().get(userId="me", id=message_id).execute()
-        )
+        message = _full_message_request(service, message_id).execute()
 
         payload = message.get("payload", {})
-        headers = payload.get("headers", [])
+        headers = {h["name"]: h["value"] for h in payload.get("headers", [])}
+
+        lines = [
+            f"{name}: {headers[name]}"
+            for name in ("From", "To", "Cc", "Date")
+            if name in headers
+        ]
+        lines.append(f"Subject: {headers.get('Subject', '')}")
+        if message.get("threadId"):
+            lines.append(f"Thread ID: {message['threadId']}")
+
+        body = mime.body_text(payload, strip_quotes=not include_quoted)
+        lines.append("")
+        if body:
+            lines.append(mime.cap_bytes(body, max_bytes))
+        else:
+            lines.append(f"Snippet: {message.get('snippet', '')}")
+
+        found = mime.attachments(payload)
+        if found:
+            lines.append("")
+            lines.append("Attachments:")
+            for item in found:
+                lines.append(
+                    f"- {item['filename'] or '(unnamed)'} "
+                    f"({item['mimeType']}, {item['size']} bytes) "
+                    f"| Attachment ID: {item['attachmentId']}"
+                )
 
-        subject = ""
-        sender = ""
-        for header in headers:
-            if header["name"] == "Subject":
-                subject = header["value"]
-            if header["name"] == "From":
-                sender = header["value"]
+        return "\n".join(lines) + "\n"
+    except Exception as e:
+        return f"Error reading email: {str(e)}"
 
-        snippet = message.get("snippet", "")
 
-        return f"From: {sender}\nSubject: {subject}\nSnippet: {snippet}\n"
+THREAD_HEADERS = ["From", "To", "Cc", "Date", "Subject"]
+
+
+def gmail_read_thread_handler(
+    config: Config,
+    logger: logging.Logger,
+    thread_id: str,
+    format: str = "full",
+    max_bytes: int = 50000,
+    include_quoted: bool = False,
+) -> str:
+    """Read a whole conversation with one ``threads.get`` call.
+
+    ``format="metadata"`` returns headers and snippets only. With
+    ``format="full"`` each body has quoted replies stripped and paragraphs
+    already shown in an earlier message removed. ``max_bytes`` is spent on
+    the newest messages first; older bodies past the budget are reduced to
+    their snippet.
+    """
+    try:
+        service = get_service(config, "gmail", "v1")
+
+        thread = service.users().threads().get(
+            userId="me",
+            id=thread_id,
+            format=format,
+            metadataHeaders=THREAD_HEADERS if format == "metadata" else None,
+        ).execute()
+        messages = thread.get("messages", [])
+        if not messages:
+            return "No messages found."
+
+        bodies: List[Optional[str]] = [None] * len(messages)
+        if format == "full":
+            seen: Set[str] = set()
+            for index, message in enumerate(messages):
+                text = mime.body_text(
+                    message.get("payload", {}), strip_quotes=not include_quoted
+                )
+                if not include_quoted:
+                    text = mime.dedupe_paragraphs(text, seen)
+                bodies[index] = text
+
+            budget = max_bytes if max_bytes > 0 else None
+            for index in reversed(range(len(messages))):
+                size = len(bodies[index].encode("utf-8"))
+                if budget is None or size <= budget:
+                    budget = None if budget is None else budget - size
+                elif budget > 0:
+                    bodies[index] = mime.cap_bytes(bodies[index], budget)
+                    budget = 0
+                else:
+                    bodies[index] = None
+
+        lines = [
+            f"Thread: {thread_id} ({len(messages)} messages)",
+            f"Subject: {message_headers(messages[0]).get('Subject', '')}",
+        ]
+        for index, message in enumerate(messages, start=1):
+            headers = message_headers(message)
+            lines.append("")
+            lines.append(
+                f"--- [{index}/{len(messages)}] ID: {message['id']} | "
+                f"From: {headers.get('From', '')} | Date: {headers.get('Date', '')}"
+            )
+            for name in ("To", "Cc"):
+                if name in headers:
+                    lines.append(f"{name}: {headers[name]}")
+            body = bodies[index - 1]
+            if body:
+                lines.append(body)
+            elif body is None:
+                lines.append(f"Snippet: {message.get('snippet', '')}")
+            attached = mime.attachments(message.get("payload", {}))
+            if attached:
+                names = (item["filename"] or "(unnamed)" for item in attached)
+                lines.append(f"Attachments: {', '.join(names)}")
+
+        return "\n".join(lines) + "\n"
     except Exception as e:
-        return f"Error reading email: {str(e)}"
+        return f"Error reading thread: {str(e)}"
+
+
+# Streamed attachment bodies are read and decoded in 64 KiB pieces.
+_ATTACHMENT_CHUNK = 64 * 1024
+_DATA_FIELD_RE = re.compile(rb'"data"\s*:\s*"')
+# Fields preceding "data" in an attachments.get response are tiny; anything
+# beyond this without the field means an unexpected response shape.
+_MAX_PREAMBLE = 1024 * 1024
+
+
+def _json_string_chunks(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    """Yield the raw value of the ``data`` string from a streamed JSON body.
+
+    base64url never contains quotes or escapes, so the value ends at the
+    next ``"``; the rest of the body is never buffered.
+    """
+    buffer = b""
+    chunks = iter(chunks)
+    for chunk in chunks:
+        buffer += chunk
+        match = _DATA_FIELD_RE.search(buffer)
+        if match:
+            buffer = buffer[match.end():]
+            break
+        if len(buffer) > _MAX_PREAMBLE:
+            raise ValueError("Attachment response has no data field")
+    else:
+        raise ValueError("Attachment response has no data field")
+
+    while True:
+        end = buffer.find(b'"')
+        if end >= 0:
+            if end:
+                yield buffer[:end]
+            return
+        if buffer:
+            yield buffer
+        buffer = next(chunks, None)
+        if buffer is None:
+            raise ValueError("Attachment response ended inside the data field")
+
+
+def _safe_filename(name: str, fallback: str) -> str:
+    name = os.path.basename(name.replace("\\", "/")).strip()
+    name = re.sub(r"[^\w.\- ()\[\]]", "_", name).lstrip(".")
+    return name[:200] or fallback
+
+
+def _select_attachment(
+    payload: Dict[str, Any], attachment_id: Optional[str], filename: Optional[str]
+) -> Dict[str, Any]:
+    found = mime.attachments(payload)
+    for item in found:
+        if attachment_id and item["attachmentId"] == attachment_id:
+            return item
+    # Attachment IDs are not stable across messages.get calls, so fall back
+    # to the file name (or the only attachment).
+    if filename:
+        for item in found:
+            if item["filename"] == filename:
+                return item
+    if attachment_id:
+        return {"filename": filename or "", "attachmentId": attachment_id}
+    if len(found) == 1:
+        return found[0]
+    if not found:
+        raise ValueError("Message has no attachments")
+    names = ", ".join(item["filename"] or "(unnamed)" for item in found)
+    raise ValueError(f"Message has several attachments, pass filename: {names}")
+
+
+def _claim_path(tmp_path: str, path: str) -> str:
+    """Move ``tmp_path`` to ``path``, or ``name (1).ext``... if it is taken.
+
+    ``os.link`` fails instead of replacing an existing file, so two
+    downloads of the same name never overwrite each other.
+    """
+    stem, ext = os.path.splitext(path)
+    candidate = path
+    number = 0
+    while True:
+        try:
+            os.link(tmp_path, candidate)
+        except FileExistsError:
+            number += 1
+            candidate = f"{stem} ({number}){ext}"
+            continue
+        except OSError:
+            # No hard links on this file system.
+            if os.path.exists(candidate):
+                number += 1
+                candidate = f"{stem} ({number}){ext}"
+                continue
+            os.replace(tmp_path, candidate)
+            return candidate
+        os.unlink(tmp_path)
+        return candidate
+
+
+def _stream_attachment(
+    config: Config, service, message_id: str, attachment_id: str, path: str
+) -> Tuple[str, int]:
+    """Download one attachment next to ``path``; returns (saved path, size).
+
+    The ``attachments.get`` response is read from the pooled session in
+    chunks and base64url-decoded straight into a temp file next to ``path``,
+    so the attachment is never held in memory as a whole. An existing file
+    is never overwritten (see :func:`_claim_path`).
+    """
+    request = service.users().messages().attachments().get(
+        userId="me", messageId=message_id, id=attachment_id
+    )
+    http = get_http(config)
+    directory = os.path.dirname(path)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".download-", suffix=".tmp")
+    size = 0
+    try:
+        with os.fdopen(fd, "wb") as out, http.session.get(
+            request.uri, stream=True, timeout=REQUEST_TIMEOUT
+        ) as response:
+            response.raise_for_status()
+            decoder = mime.Base64Decoder()
+            for piece in _json_string_chunks(response.iter_content(_ATTACHMENT_CHUNK)):
+                data = decoder.feed(piece)
+                out.write(data)
+                size += len(data)
+            data = decoder.close()
+            out.write(data)
+            size += len(data)
+        path = _claim_path(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+    return path, size
+
+
+def gmail_download_attachment_handler(
+    config: Config,
+    logger: logging.Logger,
+    message_id: str,
+    attachment_id: Optional[str] = None,
+    filename: Optional[str] = None,
+) -> str:
+    """Save an attachment under ``config.attachment_dir`` and return its path."""
+    try:
+        service = get_service(config, "gmail", "v1")
+
+        message = _full_message_request(service, message_id).execute()
+        item = _select_attachment(message.get("payload", {}), attachment_id, filename)
+
+        directory = os.path.join(
+            config.attachment_dir, _safe_filename(message_id, "message")
+        )
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(
+            directory, _safe_filename(item["filename"] or filename or "", "attachment.bin")
+        )
+
+        path, size = _stream_attachment(
+            config, service, message_id, item["attachmentId"], path
+        )
+        logger.info("Attachment saved: %s (%d bytes)", path, size)
+        return f"✅ Attachment saved\nPath: {path}\nSize: {size} bytes"
+    except Exception as e:
+        return f"❌ Error downloading attachment: {str(e)}"
 
 
 def delete_email_handler(
@@ -186,8 +829,7 @@ def delete_email_handler(
 ) -> str:
     """Delete email with confirmation requirement."""
     try:
-        creds = get_creds(config)
-        service = build("gmail", "v1", credentials=creds)
+        service = get_service(config, "gmail", "v1")
 
         # Provide a preview before destructive action
         try:
@@ -220,94 +862,303 @@ def delete_email_handler(
 
 
 def batch_delete_emails_handler(
-    config: Config, logger: logging.Logger, message_ids: List[str], dry_run: bool = True
+    config: Config,
+    logger: logging.Logger,
+    message_ids: Optional[List[str]],
+    dry_run: bool = True,
+    query: Optional[str] = None,
+    expected_count: Optional[int] = None,
+    selection_token: Optional[str] = None,
 ) -> str:
-    """Batch delete emails with dry-run mode."""
+    """Batch delete emails (by ID or Gmail query) with dry-run mode.
+
+    Deleting by query requires ``expected_count`` and ``selection_token``
+    from the dry run. The token pins the query to messages received before
+    the dry run and carries a digest of their IDs; nothing is deleted if
+    the query now selects a different set.
+    """
     try:
-        creds = get_creds(config)
-        service = build("gmail", "v1", credentials=creds)
+        if not message_ids and not query:
+            return "❌ message_ids or query is required."
+
+        service = get_service(config, "gmail", "v1")
 
         if dry_run:
+            token = ""
+            if query:
+                before = int(time.time())
+                count, digest, preview_ids = _digest_selection(
+                    iter_message_id_pages(service, f"({query}) before:{before}")
+                )
+                token = f"{before}-{digest}"
+            else:
+                count, preview_ids = _count_selection(
+                    _select_pages(service, message_ids, None)
+                )
             preview = "🔍 DRY RUN MODE - No emails will be deleted\n\n"
-            preview += f"Would delete {len(message_ids)} email(s):\n\n"
-
-            previews_to_show = min(10, len(message_ids))
-            for msg_id in message_ids[:previews_to_show]:
-                try:
-                    msg = (
-                        service.users()
-                        .messages()
-                        .get(userId="me", id=msg_id, format="minimal")
-                        .execute()
-                    )
+            preview += f"Would delete {count} email(s):\n\n"
+
+            for msg in fetch_messages(service, preview_ids, fmt="minimal"):
+                if "error" in msg:
+                    preview += f"  • {msg['id']}: (unable to load preview)\n"
+                else:
                     snippet = msg.get("snippet", "No preview")[:80]
-                    preview += f"  • {msg_id}: {snippet}...\n"
-                except Exception:
-                    preview += f"  • {msg_id}: (unable to load preview)\n"
+                    preview += f"  • {msg['id']}: {snippet}...\n"
 
-            if len(message_ids) > previews_to_show:
-                preview += f"\n... and {len(message_ids) - previews_to_show} more\n"
+            if count > len(preview_ids):
+                preview += f"\n... and {count - len(preview_ids)} more\n"
 
             preview += "\n⚠️ To actually delete these emails, call with dry_run=False"
-            logger.info("Batch delete dry-run: %s emails", len(message_ids))
+            if query:
+                preview += f", expected_count={count} and selection_token={token}"
+            logger.info("Batch delete dry-run: %s emails", count)
             return preview
 
-        body = {"ids": message_ids}
-        service.users().messages().batchDelete(userId="me", body=body).execute()
-        logger.info("Batch deleted %s emails", len(message_ids))
-        return f"✅ Successfully deleted {len(message_ids)} email(s)."
+        def _delete(pages: Iterable[List[str]]) -> List[ChunkOutcome]:
+            return _batch_delete(service, logger, pages)
+
+        if query:
+            before, _, digest = (selection_token or "").partition("-")
+            if expected_count is None or not before.isdigit() or not digest:
+                return (
+                    "❌ expected_count and selection_token are required when "
+                    "deleting by query. Run with dry_run=True and pass the "
+                    "values it reports."
+                )
+            # batchDelete cannot be undone. Both passes run the query as of
+            # the dry run, and the first checks that it still selects the
+            # previewed messages before the second deletes anything.
+            pinned = f"({query}) before:{before}"
+            count, current, _ = _digest_selection(
+                iter_message_id_pages(service, pinned), sample=0
+            )
+            if (count, current) != (expected_count, digest):
+                logger.warning(
+                    "Batch delete refused: expected %s (%s), query matches %s (%s)",
+                    expected_count,
+                    digest,
+                    count,
+                    current,
+                )
+                changed = (
+                    f"the query now matches {count}"
+                    if count != expected_count
+                    else "the query matches as many, but not the same ones"
+                )
+                return (
+                    "⚠️ QUERY RESULTS CHANGED\n\n"
+                    f"The dry run selected {expected_count} email(s); {changed}.\n"
+                    "Nothing was deleted. Run with dry_run=True again to review."
+                )
+            budget = [expected_count]
+            outcomes, _ = _sweep_query(
+                service, pinned, lambda pages: _delete(_cap_pages(pages, budget))
+            )
+        else:
+            outcomes = _delete(_select_pages(service, message_ids, None))
+        succeeded, total, failures = _chunk_report(outcomes)
+
+        logger.info("Batch deleted %s of %s emails", succeeded, total)
+        if failures:
+            return (
+                f"⚠️ Deleted {succeeded} of {total} email(s).\n"
+                f"Failed chunks:\n{failures}"
+            )
+        return f"✅ Successfully deleted {total} email(s)."
 
     except Exception as e:
         logger.error("Error batch deleting emails: %s", str(e))
         return f"❌ Error batch deleting emails: {str(e)}"
 
 
+# Upper bound for a streaming summary (about 2,000 batch requests).
+_STREAM_MAX_MESSAGES = 100_000
+# Distinct keys tracked per dimension; keeps memory flat on huge mailboxes.
+_SUMMARY_CAPACITY = 500
+
+
+class _TopCounter:
+    """Approximate top-N counter in bounded memory (Space-Saving).
+
+    Once ``capacity`` keys are tracked, a new key replaces the least frequent
+    one and inherits its count, so heavy hitters are never lost but rare
+    keys may be over-counted.
+    """
+
+    def __init__(self, capacity: int = _SUMMARY_CAPACITY) -> None:
+        self.capacity = capacity
+        self.counts: Dict[str, int] = {}
+        self.info: Dict[str, str] = {}
+
+    def add(self, key: str, info: str = "") -> None:
+        if key in self.counts:
+            self.counts[key] += 1
+            return
+        count = 0
+        if len(self.counts) >= self.capacity:
+            evicted = min(self.counts, key=self.counts.__getitem__)
+            count = self.counts.pop(evicted)
+            self.info.pop(evicted, None)
+        self.counts[key] = count + 1
+        if info:
+            self.info[key] = info
+
+    def top(self, n: int) -> List[Tuple[str, int]]:
+        return sorted(self.counts.items(), key=lambda item: -item[1])[:n]
+
+
+class _MailboxSummary:
+    """Streaming aggregation of message metadata for search summaries."""
+
+    def __init__(self) -> None:
+        self.total = 0
+        self.failed = 0
+        self.first: Optional[datetime] = None
+        self.last: Optional[datetime] = None
+        self.senders = _TopCounter()
+        self.domains = _TopCounter()
+        self.days = _TopCounter()
+        self.labels = _TopCounter()
+        self.threads = _TopCounter()
+
+    def add(self, message: Dict[str, Any]) -> None:
+        self.total += 1
+        if "error" in message:
+            self.failed += 1
+            return
+        headers = message_headers(message)
+
+        sender = parseaddr(headers.get("From", ""))[1].lower() or "(unknown)"
+        self.senders.add(sender)
+        self.domains.add(sender.rpartition("@")[2] or "(unknown)")
+
+        if message.get("internalDate"):
+            sent = datetime.fromtimestamp(
+                int(message["internalDate"]) / 1000, tz=timezone.utc
+            )
+            self.days.add(sent.strftime("%Y-%m-%d"))
+            self.first = min(self.first or sent, sent)
+            self.last = max(self.last or sent, sent)
+
+        for label_id in message.get("labelIds", []):
+            self.labels.add(label_id)
+        if message.get("threadId"):
+            self.threads.add(
+                message["threadId"], headers.get("Subject", "(no subject)")
+            )
+
+    def render(self, query: str, top_n: int, label_names: Dict[str, str]) -> str:
+        def section(title: str, rows: List[Tuple[str, int]], name=lambda k: k) -> str:
+            lines = "".join(f"  {count:>6}  {name(key)}\n" for key, count in rows)
+            return f"\n{title}:\n{lines}" if rows else ""
+
+        output = f"Found {self.total} message(s) for query: {query}\n"
+        if self.first and self.last:
+            output += (
+                f"Date range: {self.first:%Y-%m-%d} .. {self.last:%Y-%m-%d}\n"
+            )
+        if self.failed:
+            output += f"Unable to load {self.failed} message(s).\n"
+        output += section("Top senders", self.senders.top(top_n))
+        output += section("Top sender domains", self.domains.top(top_n))
+        output += section("Busiest days", self.days.top(top_n))
+        output += section(
+            "Labels",
+            self.labels.top(top_n),
+            lambda key: label_names.get(key, key),
+        )
+        output += section(
+            "Top threads",
+            self.threads.top(top_n),
+            lambda key: f"{key} | {self.threads.info.get(key, '')}",
+        )
+        return output
+
+
+def _iter_message_pages(service, query: str) -> Iterator[List[Dict[str, Any]]]:
+    for page in iter_message_id_pages(service, query):
+        yield fetch_messages(service, page)
+
+
+def _summarize_all_pages(
+    config: Config,
+    service,
+    logger: logging.Logger,
+    query: str,
+    top_n: int,
+    pages: Optional[Iterable[List[Dict[str, Any]]]] = None,
+) -> str:
+    summary = _MailboxSummary()
+    truncated = False
+    if pages is None:
+        pages = _iter_message_pages(service, query)
+    for page in pages:
+        for message in page[: _STREAM_MAX_MESSAGES - summary.total]:
+            summary.add(message)
+        logger.info("Gmail summary progress: query='%s' messages=%s", query, summary.total)
+        if summary.total >= _STREAM_MAX_MESSAGES:
+            truncated = True
+            break
+
+    if not summary.total:
+        return "No messages found."
+
+    output = summary.render(query, top_n, label_names_by_id(config, service))
+    if truncated:
+        output += f"\n⚠️ Stopped after {_STREAM_MAX_MESSAGES} messages; narrow the query.\n"
+    return output
+
+
 def gmail_search_and_summarize_handler(
-    config: Config, logger: logging.Logger, query: str, max_results: int = 50
+    config: Config,
+    logger: logging.Logger,
+    query: str,
+    max_results: int = 50,
+    stream: bool = False,
+    top_n: int = 10,
 ) -> str:
-    """Search Gmail and return a brief summary."""
+    """Search Gmail and return a brief summary.
+
+    With ``stream=True`` every result page is walked and the matches are
+    aggregated (senders, domains, days, labels, threads) instead of listing
+    the first ``max_results``.
+    """
     try:
-        creds = get_creds(config)
-        service = build("gmail", "v1", credentials=creds)
+        service = get_service(config, "gmail", "v1")
 
         if not query:
             return "❌ Query is required."
 
-        results = (
-            service.users()
-            .messages()
-            .list(userId="me", maxResults=min(max_results, 100), q=query)
-            .execute()
-        )
-        messages = results.get("messages", [])
+        if stream:
+            pages = gmail_sync.local_pages(config, service, query)
+            output = _summarize_all_pages(config, service, logger, query, top_n, pages)
+            logger.info("Gmail streaming summary: query='%s'", query)
+            return output
 
-        if not messages:
+        local = gmail_sync.local_search(config, service, query, max_results)
+        if local is not None:
+            messages = local[0]
+            message_ids = [msg["id"] for msg in messages]
+        else:
+            message_ids, _ = list_message_ids(service, query, max_results)
+            messages = None
+
+        if not message_ids:
             return "No messages found."
 
+        if messages is None:
+            messages = fetch_messages(service, message_ids[:20])
+
         summary_lines = []
-        for msg in messages[: min(len(messages), 20)]:
-            full = (
-                service.users()
-                .messages()
-                .get(
-                    userId="me",
-                    id=msg["id"],
-                    format="metadata",
-                    metadataHeaders=["From", "Subject", "Date"],
-                )
-                .execute()
-            )
-            headers = {
-                h["name"]: h["value"]
-                for h in full.get("payload", {}).get("headers", [])
-            }
+        for full in messages[:20]:
+            headers = message_headers(full)
             summary_lines.append(
                 f"- {headers.get('Date','')} | {headers.get('From','')} | "
                 f"{headers.get('Subject','')}"
             )
 
-        logger.info("Gmail search: query='%s' results=%s", query, len(messages))
-        output = f"Found {len(messages)} message(s) for query: {query}\n"
+        logger.info("Gmail search: query='%s' results=%s", query, len(message_ids))
+        output = f"Found {len(message_ids)} message(s) for query: {query}\n"
         output += "Top results:\n" + "\n".join(summary_lines)
         return output
     except Exception as e:
@@ -315,6 +1166,40 @@ def gmail_search_and_summarize_handler(
         return f"❌ Error searching Gmail: {str(e)}"
 
 
+def gmail_local_search_handler(
+    config: Config, logger: logging.Logger, query: str, max_results: int = 20
+) -> str:
+    """Ranked full-text search over the local Gmail index (no API calls)."""
+    try:
+        if not query:
+            return "❌ Query is required."
+
+        sync = gmail_sync.get_gmail_sync(config)
+        if sync is None or not sync.fts:
+            return (
+                "❌ Local search is disabled. Set gmail_sync: true and "
+                "gmail_fts: true in config (requires SQLite FTS5)."
+            )
+
+        messages, indexed, total = sync.text_search(query, max_results)
+        logger.info("Gmail local search: query='%s' results=%s", query, len(messages))
+
+        output = (
+            f"Found {len(messages)} local match(es) for: {query} "
+            f"(indexed {indexed} of {total} message(s))\n"
+        )
+        for msg in messages:
+            headers = message_headers(msg)
+            output += (
+                f"- ID: {msg['id']} | {headers.get('Date', '')} | "
+                f"{headers.get('From', '')} | {headers.get('Subject', '(no subject)')}\n"
+            )
+        return output
+    except Exception as e:
+        logger.error("Error searching local Gmail index: %s", str(e))
+        return f"❌ Error searching local Gmail index: {str(e)}"
+
+
 def gmail_archive_handler(
     config: Config, logger: logging.Logger, message_id: str, confirm: bool = False
 ) -> str:
@@ -327,8 +1212,7 @@ def gmail_archive_handler(
                 "To proceed, call again with confirm=True."
             )
 
-        creds = get_creds(config)
-        service = build("gmail", "v1", credentials=creds)
+        service = get_service(config, "gmail", "v1")
 
         service.users().messages().modify(
             userId="me", id=message_id, body={"removeLabelIds": ["INBOX"]}
@@ -341,69 +1225,222 @@ def gmail_archive_handler(
         return f"❌ Error archiving message: {str(e)}"
 
 
-def _get_or_create_label_id(service, label_name: str, create_if_missing: bool = True):
-    labels = service.users().labels().list(userId="me").execute().get("labels", [])
-    for lbl in labels:
-        if lbl.get("name") == label_name:
-            return lbl.get("id")
-    if not create_if_missing:
-        return None
-    created = (
-        service.users()
-        .labels()
-        .create(
-            userId="me",
-            body={
-                "name": label_name,
-                "labelListVisibility": "labelShow",
-                "messageListVisibility": "show",
-            },
+def gmail_bulk_archive_handler(
+    config: Config,
+    logger: logging.Logger,
+    query: Optional[str] = None,
+    message_ids: Optional[List[str]] = None,
+    dry_run: bool = True,
+) -> str:
+    """Archive every message matching a query (or a list of IDs) in bulk."""
+    try:
+        if not message_ids and not query:
+            return "❌ message_ids or query is required."
+
+        service = get_service(config, "gmail", "v1")
+        # Only inbox messages need archiving; this also lets the sweep stop
+        # once the query no longer matches anything.
+        inbox_query = f"({query}) in:inbox" if query else None
+
+        if dry_run:
+            count, sample_ids = _count_selection(
+                _select_pages(service, message_ids, inbox_query)
+            )
+            logger.info("Gmail bulk archive dry-run: count=%s", count)
+            output = "🔍 DRY RUN MODE - No messages will be archived\n\n"
+            output += f"Would archive {count} message(s).\n"
+            if sample_ids:
+                output += "\nSample:\n" + _format_preview(service, sample_ids)
+            output += "\nTo archive, call again with dry_run=False."
+            return output
+
+        def _archive(pages: Iterable[List[str]]) -> List[ChunkOutcome]:
+            return _batch_modify(service, logger, pages, remove_label_ids=["INBOX"])
+
+        if inbox_query:
+            outcomes, seen = _sweep_query(service, inbox_query, _archive)
+            succeeded, _, failures = _chunk_report(outcomes)
+            # Each message is counted once, however many sweeps listed it.
+            total = len(seen)
+        else:
+            outcomes = _archive(_select_pages(service, message_ids, None))
+            succeeded, total, failures = _chunk_report(outcomes)
+
+        logger.info(
+            "Gmail bulk archive: %s of %s message(s) in %s chunk(s)",
+            succeeded,
+            total,
+            len(outcomes),
         )
-        .execute()
+        if failures:
+            return (
+                f"⚠️ Archived {succeeded} of {total} message(s) "
+                f"in {len(outcomes)} request(s).\nFailed chunks:\n{failures}"
+            )
+        return f"✅ Archived {total} message(s) in {len(outcomes)} request(s)."
+    except Exception as e:
+        logger.error("Error archiving messages: %s", str(e))
+        return f"❌ Error archiving messages: {str(e)}"
+
+
+# Label name -> ID maps are refreshed after this many seconds.
+_LABEL_CACHE_TTL = 300
+
+
+class _LabelCache:
+    """Per-account label name -> ID map with TTL refresh.
+
+    Labels change rarely, so one ``labels.list`` serves every labelling call
+    until the TTL expires. Created labels are added in place; callers drop
+    the map when Gmail reports an unknown label.
+    """
+
+    def __init__(self, ttl: float) -> None:
+        self.ttl = ttl
+        self._maps: Dict[str, Tuple[float, Dict[str, str]]] = {}
+        self._lock = threading.Lock()
+
+    def _load(self, account: str, service, refresh: bool = False) -> Dict[str, str]:
+        with self._lock:
+            cached = self._maps.get(account)
+            if cached and not refresh and time.monotonic() - cached[0] < self.ttl:
+                return cached[1]
+        labels = service.users().labels().list(userId="me").execute().get("labels", [])
+        names = {lbl.get("name"): lbl.get("id") for lbl in labels}
+        with self._lock:
+            self._maps[account] = (time.monotonic(), names)
+        return names
+
+    def names_by_id(self, account: str, service) -> Dict[str, str]:
+        return {label_id: name for name, label_id in self._load(account, service).items()}
+
+    def resolve(
+        self,
+        account: str,
+        service,
+        label_names: List[str],
+        create_if_missing: bool = True,
+    ) -> Dict[str, Optional[str]]:
+        """Map each name to its label ID (``None`` if missing and not created)."""
+        names = self._load(account, service)
+        if any(name not in names for name in label_names):
+            # Possibly created elsewhere since the last refresh.
+            names = self._load(account, service, refresh=True)
+
+        resolved: Dict[str, Optional[str]] = {}
+        for name in label_names:
+            label_id = names.get(name)
+            if label_id is None and create_if_missing:
+                label_id = self._create(service, name)
+                self.add(account, name, label_id)
+            resolved[name] = label_id
+        return resolved
+
+    def _create(self, service, label_name: str) -> str:
+        created = (
+            service.users()
+            .labels()
+            .create(
+                userId="me",
+                body={
+                    "name": label_name,
+                    "labelListVisibility": "labelShow",
+                    "messageListVisibility": "show",
+                },
+            )
+            .execute()
+        )
+        return created.get("id")
+
+    def add(self, account: str, label_name: str, label_id: str) -> None:
+        with self._lock:
+            cached = self._maps.get(account)
+            if cached:
+                cached[1][label_name] = label_id
+
+    def invalidate(self, account: str) -> None:
+        with self._lock:
+            self._maps.pop(account, None)
+
+
+_label_cache = _LabelCache(_LABEL_CACHE_TTL)
+
+
+def _is_label_error(error: Optional[Exception]) -> bool:
+    return (
+        isinstance(error, HttpError)
+        and error.resp.status in (400, 404)
+        and "label" in str(error).lower()
     )
-    return created.get("id")
+
+
+def resolve_label_ids(
+    config: Config, service, label_names: List[str], create_if_missing: bool = True
+) -> Dict[str, Optional[str]]:
+    """Resolve many label names to IDs with one (cached) ``labels.list``."""
+    return _label_cache.resolve(
+        config.token_file, service, label_names, create_if_missing
+    )
+
+
+def label_names_by_id(config: Config, service) -> Dict[str, str]:
+    return _label_cache.names_by_id(config.token_file, service)
 
 
 def gmail_label_apply_handler(
     config: Config,
     logger: logging.Logger,
-    message_ids: List[str],
+    message_ids: Optional[List[str]],
     label_name: str,
     dry_run: bool = True,
     create_if_missing: bool = True,
+    query: Optional[str] = None,
+    label_names: Optional[List[str]] = None,
 ) -> str:
-    """Apply a label to messages with dry-run preview."""
+    """Apply labels to messages (by ID or Gmail query) with dry-run preview."""
     try:
-        if not message_ids:
-            return "❌ message_ids is required."
-        if not label_name:
+        if not message_ids and not query:
+            return "❌ message_ids or query is required."
+        names = list(dict.fromkeys(([label_name] if label_name else []) + (label_names or [])))
+        if not names:
             return "❌ label_name is required."
+        label_desc = "', '".join(names)
+
+        service = get_service(config, "gmail", "v1")
+        label_ids = resolve_label_ids(config, service, names, create_if_missing)
+        missing = [name for name, label_id in label_ids.items() if not label_id]
+        if missing:
+            return f"❌ Label not found: {', '.join(missing)}"
 
-        creds = get_creds(config)
-        service = build("gmail", "v1", credentials=creds)
-        label_id = _get_or_create_label_id(service, label_name, create_if_missing)
-        if not label_id:
-            return f"❌ Label not found: {label_name}"
+        pages = _select_pages(service, message_ids, query)
 
         if dry_run:
-            preview_ids = message_ids[:10]
-            logger.info(
-                "Gmail label dry-run: %s count=%s", label_name, len(message_ids)
-            )
+            count, preview_ids = _count_selection(pages)
+            logger.info("Gmail label dry-run: %s count=%s", label_desc, count)
             return (
-                f"🔍 DRY RUN: Would apply label '{label_name}' to "
-                f"{len(message_ids)} message(s).\n"
+                f"🔍 DRY RUN: Would apply label '{label_desc}' to "
+                f"{count} message(s).\n"
                 f"Sample IDs: {', '.join(preview_ids)}\n"
                 "To apply, call again with dry_run=False."
             )
 
-        for mid in message_ids:
-            service.users().messages().modify(
-                userId="me", id=mid, body={"addLabelIds": [label_id]}
-            ).execute()
+        outcomes = _batch_modify(
+            service, logger, pages, add_label_ids=list(label_ids.values())
+        )
+        if any(_is_label_error(outcome.error) for outcome in outcomes):
+            # A label was deleted behind our back; re-resolve next time.
+            _label_cache.invalidate(config.token_file)
+        succeeded, total, failures = _chunk_report(outcomes)
 
-        logger.info("Gmail label applied: %s count=%s", label_name, len(message_ids))
-        return f"✅ Label '{label_name}' applied to {len(message_ids)} message(s)."
+        logger.info("Gmail label applied: %s count=%s", label_desc, succeeded)
+        if failures:
+            return (
+                f"⚠️ Label '{label_desc}' applied to {succeeded} of {total} "
+                f"message(s).\nFailed chunks:\n{failures}"
+            )
+        return f"✅ Label '{label_desc}' applied to {total} message(s)."
     except Exception as e:
+        if _is_label_error(e):
+            _label_cache.invalidate(config.token_file)
         logger.error("Error applying label: %s", str(e))
         return f"❌ Error applying label: {str(e)}"
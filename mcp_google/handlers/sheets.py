@@ -2,31 +2,48 @@ import logging
 import re
 from typing import List, Optional
 
-from googleapiclient.discovery import build
-
-from ..auth import get_creds
+from .. import aio
 from ..config import Config
+from ..services import get_service
+
+
+def _format_sheet_values(range_name: str, values: List[List[str]]) -> str:
+    if not values:
+        return "No data found."
+
+    output = f"Data from sheet (range {range_name}):\n"
+    for row in values:
+        output += f"| {' | '.join(row)} |\n"
+
+    return output
 
 
 def read_sheet_handler(config: Config, logger: logging.Logger, spreadsheet_id: str, range_name: str) -> str:
     try:
-        creds = get_creds(config)
-        service = build("sheets", "v4", credentials=creds)
+        service = get_service(config, "sheets", "v4")
 
         sheet = service.spreadsheets()
         result = sheet.values().get(
             spreadsheetId=spreadsheet_id, range=range_name
         ).execute()
-        values = result.get("values", [])
-
-        if not values:
-            return "No data found."
+        return _format_sheet_values(range_name, result.get("values", []))
+    except Exception as e:
+        return f"Error reading sheet: {str(e)}"
 
-        output = f"Data from sheet (range {range_name}):\n"
-        for row in values:
-            output += f"| {' | '.join(row)} |\n"
 
-        return output
+async def read_sheet_async_handler(
+    config: Config, logger: logging.Logger, spreadsheet_id: str, range_name: str
+) -> str:
+    """Async variant of :func:`read_sheet_handler` for the event-loop path."""
+    try:
+        service = await aio.get_service(config, "sheets", "v4")
+        result = await aio.execute(
+            config,
+            service.spreadsheets().values().get(
+                spreadsheetId=spreadsheet_id, range=range_name
+            ),
+        )
+        return _format_sheet_values(range_name, result.get("values", []))
     except Exception as e:
         return f"Error reading sheet: {str(e)}"
 
@@ -35,8 +52,7 @@ def append_row_handler(
     config: Config, logger: logging.Logger, spreadsheet_id: str, range_name: str, values: List[str]
 ) -> str:
     try:
-        creds = get_creds(config)
-        service = build("sheets", "v4", credentials=creds)
+        service = get_service(config, "sheets", "v4")
 
         body = {"values": [values]}
 
@@ -67,8 +83,7 @@ def update_sheet_handler(
     values: List[List[str]],
 ) -> str:
     try:
-        creds = get_creds(config)
-        service = build("sheets", "v4", credentials=creds)
+        service = get_service(config, "sheets", "v4")
 
         body = {"values": values}
 
@@ -91,8 +106,7 @@ def update_sheet_handler(
 
 def create_spreadsheet_handler(config: Config, logger: logging.Logger, title: str) -> str:
     try:
-        creds = get_creds(config)
-        service = build("sheets", "v4", credentials=creds)
+        service = get_service(config, "sheets", "v4")
 
         spreadsheet = {"properties": {"title": title}}
         spreadsheet = (
@@ -109,8 +123,7 @@ def add_sheet_handler(
     config: Config, logger: logging.Logger, spreadsheet_id: str, title: str
 ) -> str:
     try:
-        creds = get_creds(config)
-        service = build("sheets", "v4", credentials=creds)
+        service = get_service(config, "sheets", "v4")
 
         requests = [
             {
@@ -141,8 +154,7 @@ def clear_range_handler(
 ) -> str:
     """Clear range with auto dry-run for large ranges."""
     try:
-        creds = get_creds(config)
-        service = build("sheets", "v4", credentials=creds)
+        service = get_service(config, "sheets", "v4")
 
         # Analyze the range to decide whether confirmation is needed
         try:
@@ -209,8 +221,7 @@ def sheet_create_filter_view_handler(
 ) -> str:
     """Create a filter view for a sheet with a specified grid range."""
     try:
-        creds = get_creds(config)
-        service = build("sheets", "v4", credentials=creds)
+        service = get_service(config, "sheets", "v4")
 
         # If end_row/end_col not provided, use sheet properties
         if end_row is None or end_col is None:
@@ -264,8 +275,7 @@ def sheet_export_csv_handler(
 ) -> str:
     """Export range to CSV (values only)."""
     try:
-        creds = get_creds(config)
-        service = build("sheets", "v4", credentials=creds)
+        service = get_service(config, "sheets", "v4")
 
         result = service.spreadsheets().values().get(
             spreadsheetId=spreadsheet_id, range=range_name
@@ -310,8 +320,7 @@ def sheet_find_replace_handler(
         if not find_text:
             return "❌ find_text is required."
 
-        creds = get_creds(config)
-        service = build("sheets", "v4", credentials=creds)
+        service = get_service(config, "sheets", "v4")
 
         result = service.spreadsheets().values().get(
             spreadsheetId=spreadsheet_id, range=range_name
@@ -389,8 +398,7 @@ def sheet_create_named_range_handler(
 ) -> str:
     """Create a named range in a spreadsheet using grid indexes."""
     try:
-        creds = get_creds(config)
-        service = build("sheets", "v4", credentials=creds)
+        service = get_service(config, "sheets", "v4")
 
         requests = [
             {
@@ -424,8 +432,7 @@ def get_spreadsheet_meta_handler(
     config: Config, logger: logging.Logger, spreadsheet_id: str
 ) -> str:
     try:
-        creds = get_creds(config)
-        service = build("sheets", "v4", credentials=creds)
+        service = get_service(config, "sheets", "v4")
 
         sheet_metadata = service.spreadsheets().get(
             spreadsheetId=spreadsheet_id
@@ -0,0 +1,210 @@
+"""Text extraction from Gmail ``format=full`` MIME trees.
+
+Gmail returns every leaf part base64url-encoded in ``body.data`` (or, for
+attachments, only an ``attachmentId``). The readable body is the first
+``text/plain`` leaf, falling back to the first ``text/html`` leaf run
+through a small :mod:`html.parser` converter; no third-party HTML library
+is needed. Attachment bytes are decoded incrementally with
+:class:`Base64Decoder` so they can be written to disk as they arrive.
+"""
+
+import base64
+import codecs
+import re
+from html.parser import HTMLParser
+from typing import Any, Dict, List, Optional, Set
+
+_CHARSET_RE = re.compile(r"""charset\s*=\s*["']?([\w.:-]+)""", re.IGNORECASE)
+
+# Attribution line Gmail/Apple Mail/Thunderbird put above a quoted reply. Long
+# addresses make Gmail wrap it over two lines.
+_REPLY_HEADER_RE = re.compile(r"^On\b[^\n]*(?:\n[^\n]*)?\bwrote:\s*$", re.MULTILINE)
+# Outlook-style separator.
+_ORIGINAL_RE = re.compile(
+    r"^-{2,}\s*Original Message\s*-{2,}\s*$", re.MULTILINE | re.IGNORECASE
+)
+
+
+def _header(part: Dict[str, Any], name: str) -> str:
+    for header in part.get("headers", []):
+        if header["name"].lower() == name:
+            return header["value"]
+    return ""
+
+
+def _charset(part: Dict[str, Any]) -> str:
+    match = _CHARSET_RE.search(_header(part, "content-type"))
+    if match:
+        try:
+            return codecs.lookup(match.group(1)).name
+        except LookupError:
+            pass
+    return "utf-8"
+
+
+def decode_part(part: Dict[str, Any]) -> str:
+    """Decoded text of one leaf part, honouring its declared charset."""
+    data = part.get("body", {}).get("data", "")
+    raw = base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+    return raw.decode(_charset(part), errors="replace")
+
+
+def _is_attachment(part: Dict[str, Any]) -> bool:
+    disposition = _header(part, "content-disposition").lower()
+    return bool(part.get("filename")) or disposition.startswith("attachment")
+
+
+def _walk(payload: Dict[str, Any]):
+    stack = [payload]
+    while stack:
+        part = stack.pop()
+        yield part
+        stack.extend(reversed(part.get("parts", [])))
+
+
+class _HTMLText(HTMLParser):
+    _SKIP = {"script", "style", "head", "title"}
+    _BLOCK = {
+        "address", "article", "blockquote", "br", "div", "footer", "h1", "h2",
+        "h3", "h4", "h5", "h6", "header", "hr", "li", "ol", "p", "pre",
+        "section", "table", "tr", "ul",
+    }
+
+    def __init__(self, skip_quotes: bool) -> None:
+        super().__init__(convert_charrefs=True)
+        self.parts: List[str] = []
+        self._skipping = 0
+        self._skip = self._SKIP | {"blockquote"} if skip_quotes else self._SKIP
+
+    def handle_starttag(self, tag: str, attrs) -> None:
+        if tag in self._skip:
+            self._skipping += 1
+        elif tag == "li":
+            self.parts.append("\n- ")
+        elif tag in self._BLOCK:
+            self.parts.append("\n")
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag in self._skip:
+            self._skipping = max(0, self._skipping - 1)
+        elif tag in self._BLOCK and tag != "li":
+            self.parts.append("\n")
+
+    def handle_data(self, data: str) -> None:
+        if not self._skipping:
+            self.parts.append(data)
+
+
+def html_to_text(html: str, skip_quotes: bool = False) -> str:
+    """Render HTML as plain text (block tags become line breaks)."""
+    parser = _HTMLText(skip_quotes)
+    parser.feed(html)
+    parser.close()
+    text = re.sub(r"[ \t\r\f\v\xa0]+", " ", "".join(parser.parts))
+    text = re.sub(r" *\n *", "\n", text)
+    return re.sub(r"\n{3,}", "\n\n", text).strip()
+
+
+def strip_quoted(text: str) -> str:
+    """Drop ``>``-quoted lines and everything below a reply attribution."""
+    text = "\n".join(
+        line for line in text.splitlines() if not line.lstrip().startswith(">")
+    )
+    cut = len(text)
+    for pattern in (_REPLY_HEADER_RE, _ORIGINAL_RE):
+        match = pattern.search(text)
+        if match and match.start() > 0:
+            cut = min(cut, match.start())
+    return text[:cut].rstrip()
+
+
+def cap_bytes(text: str, max_bytes: int) -> str:
+    """Truncate ``text`` to at most ``max_bytes`` UTF-8 bytes."""
+    encoded = text.encode("utf-8")
+    if max_bytes <= 0 or len(encoded) <= max_bytes:
+        return text
+    head = encoded[:max_bytes].decode("utf-8", errors="ignore")
+    return f"{head}\n… [truncated, {len(encoded)} bytes total]"
+
+
+# Paragraphs shorter than this ("Thanks,", "Best regards") are never treated
+# as duplicates.
+_MIN_DEDUPE_CHARS = 40
+
+
+def dedupe_paragraphs(text: str, seen: Set[str]) -> str:
+    """Drop paragraphs of ``text`` already in ``seen``; record the rest.
+
+    Used across the messages of a thread, where replies repeat earlier
+    messages (quoted without ``>`` markers, forwarded blocks, signatures).
+    """
+    kept = []
+    for paragraph in re.split(r"\n\s*\n", text):
+        key = " ".join(paragraph.split()).lower()
+        if len(key) >= _MIN_DEDUPE_CHARS:
+            if key in seen:
+                continue
+            seen.add(key)
+        kept.append(paragraph)
+    return "\n\n".join(kept).strip()
+
+
+def body_text(payload: Dict[str, Any], strip_quotes: bool = False) -> str:
+    """Readable body of a message payload: text/plain, else HTML as text."""
+    plain: Optional[Dict[str, Any]] = None
+    html: Optional[Dict[str, Any]] = None
+    for part in _walk(payload):
+        if _is_attachment(part) or not part.get("body", {}).get("data"):
+            continue
+        mime_type = part.get("mimeType", "")
+        if mime_type == "text/plain" and plain is None:
+            plain = part
+        elif mime_type == "text/html" and html is None:
+            html = part
+    if plain is not None:
+        text = decode_part(plain).replace("\r\n", "\n").strip()
+    elif html is not None:
+        text = html_to_text(decode_part(html), skip_quotes=strip_quotes)
+    else:
+        return ""
+    return strip_quoted(text) if strip_quotes else text
+
+
+def attachments(payload: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """``filename``/``mimeType``/``size``/``attachmentId`` of each attachment."""
+    found = []
+    for part in _walk(payload):
+        body = part.get("body", {})
+        if body.get("attachmentId") and _is_attachment(part):
+            found.append(
+                {
+                    "filename": part.get("filename") or "",
+                    "mimeType": part.get("mimeType", ""),
+                    "size": body.get("size", 0),
+                    "attachmentId": body["attachmentId"],
+                }
+            )
+    return found
+
+
+class Base64Decoder:
+    """Incremental base64url decoder.
+
+    Input may be split anywhere; complete 4-character groups are decoded as
+    they arrive and the remainder is carried over to the next chunk.
+    """
+
+    def __init__(self) -> None:
+        self._pending = b""
+
+    def feed(self, chunk: bytes) -> bytes:
+        data = self._pending + chunk
+        usable = len(data) - len(data) % 4
+        self._pending = data[usable:]
+        return base64.urlsafe_b64decode(data[:usable]) if usable else b""
+
+    def close(self) -> bytes:
+        data, self._pending = self._pending, b""
+        if not data:
+            return b""
+        return base64.urlsafe_b64decode(data + b"=" * (-len(data) % 4))
@@ -2,9 +2,12 @@
 
 import asyncio
 import base64
+import hashlib
+import json
 from collections.abc import Iterable
+from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
-from typing import List
+from typing import Any, List, Optional
 
 from pydantic import AnyUrl
 
@@ -13,7 +16,11 @@ from mcp.server.stdio import stdio_server
 from mcp.server.lowlevel.helper_types import ReadResourceContents
 import mcp.types as types
 
+from . import aio, drive_sync, gmail_sync, transport
+from .cache import ResultCache, expand_tags
 from .config import load_config
+from .dispatch import InflightCoalescer, build_registry, cached_call, call_key
+from .executors import ServiceExecutors, run_blocking
 from .logging import setup_logging
 from .security import require_token_configured
 from .operations import BinaryResult
@@ -35,24 +42,40 @@ from .handlers import (
     delete_email_handler,
     doc_export_pdf_handler,
     doc_fill_template_handler,
+    drive_bulk_copy_handler,
+    drive_bulk_move_handler,
+    drive_bulk_revoke_handler,
+    drive_bulk_share_handler,
+    drive_bulk_trash_handler,
     drive_copy_file_handler,
+    drive_folder_tree_handler,
     drive_list_permissions_handler,
+    drive_permission_audit_handler,
     drive_revoke_public_handler,
     drive_search_advanced_handler,
     execute_operation_handler,
+    find_files_async_handler,
     find_files_handler,
     get_gmail_profile_handler,
     get_script_content_handler,
     get_spreadsheet_meta_handler,
     gmail_archive_handler,
+    gmail_bulk_archive_handler,
+    gmail_download_attachment_handler,
     gmail_label_apply_handler,
+    gmail_local_search_handler,
+    gmail_read_thread_handler,
     gmail_search_and_summarize_handler,
+    list_emails_async_handler,
     list_emails_handler,
+    list_events_async_handler,
     list_events_handler,
     move_file_handler,
     prepare_script_update_handler,
+    read_doc_async_handler,
     read_doc_handler,
     read_email_handler,
+    read_sheet_async_handler,
     read_sheet_handler,
     restore_script_backup_handler,
     send_draft_handler,
@@ -64,6 +87,13 @@ from .handlers import (
     sheet_find_replace_handler,
     update_sheet_handler,
 )
+from .handlers.gmail import (
+    fetch_messages,
+    fetch_messages_async,
+    list_message_ids,
+    list_message_ids_async,
+    message_headers,
+)
 
 # ---------------------------------------------------------------------------
 # Annotation presets (reused across tool definitions)
@@ -72,6 +102,211 @@ _READ_ONLY = types.ToolAnnotations(readOnlyHint=True, destructiveHint=False)
 _WRITE = types.ToolAnnotations(readOnlyHint=False, destructiveHint=False)
 _DESTRUCTIVE = types.ToolAnnotations(readOnlyHint=False, destructiveHint=True)
 
+# ---------------------------------------------------------------------------
+# Google API (quota bucket / executor lane) used by each tool
+# ---------------------------------------------------------------------------
+_TOOL_SERVICES = {
+    "find_files": "drive",
+    "drive_search_advanced": "drive",
+    "drive_folder_tree": "drive",
+    "drive_list_permissions": "drive",
+    "drive_permission_audit": "drive",
+    "create_folder": "drive",
+    "move_file": "drive",
+    "drive_copy_file": "drive",
+    "drive_bulk_move": "drive",
+    "drive_bulk_copy": "drive",
+    "drive_bulk_share": "drive",
+    "drive_bulk_trash": "drive",
+    "share_file": "drive",
+    "drive_revoke_public": "drive",
+    "drive_bulk_revoke": "drive",
+    "read_sheet": "sheets",
+    "get_spreadsheet_meta": "sheets",
+    "sheet_export_csv": "sheets",
+    "create_spreadsheet": "sheets",
+    "add_sheet": "sheets",
+    "append_row": "sheets",
+    "update_sheet": "sheets",
+    "clear_range": "sheets",
+    "sheet_find_replace": "sheets",
+    "sheet_create_filter_view": "sheets",
+    "sheet_create_named_range": "sheets",
+    "read_doc": "docs",
+    "create_doc": "docs",
+    "append_to_doc": "docs",
+    "doc_fill_template": "docs",
+    "doc_export_pdf": "drive",
+    "create_script_project": "script",
+    "get_script_content": "script",
+    "prepare_script_update": "script",
+    "execute_operation": "script",
+    "cancel_operation": "script",
+    "restore_script_backup": "script",
+    "get_gmail_profile": "gmail",
+    "list_emails": "gmail",
+    "read_email": "gmail",
+    "gmail_read_thread": "gmail",
+    "gmail_download_attachment": "gmail",
+    "gmail_search_and_summarize": "gmail",
+    "gmail_local_search": "gmail",
+    "create_draft": "gmail",
+    "send_email": "gmail",
+    "send_draft": "gmail",
+    "delete_email": "gmail",
+    "batch_delete_emails": "gmail",
+    "gmail_archive": "gmail",
+    "gmail_bulk_archive": "gmail",
+    "gmail_label_apply": "gmail",
+    "list_events": "calendar",
+    "calendar_find_free_slots": "calendar",
+    "create_event": "calendar",
+    "calendar_create_meeting": "calendar",
+}
+
+_RESOURCE_SERVICES = {
+    "gdrive": "drive",
+    "gmail": "gmail",
+    "gcalendar": "calendar",
+    "gsheets": "sheets",
+    "gdocs": "docs",
+}
+
+# ---------------------------------------------------------------------------
+# Result cache: TTL (seconds) and resource tags for read-only tools, and the
+# tags each write tool invalidates. "{arg}" expands to the argument value.
+# ---------------------------------------------------------------------------
+_CACHE_POLICIES = {
+    "find_files": (60, ("drive",)),
+    "drive_search_advanced": (60, ("drive",)),
+    "drive_folder_tree": (60, ("drive",)),
+    # Query-driven bulk sharing only knows the "perm" tag, not file IDs.
+    "drive_list_permissions": (120, ("perm", "perm:{file_id}")),
+    "drive_permission_audit": (300, ("drive", "perm")),
+    "read_sheet": (60, ("sheet:{spreadsheet_id}",)),
+    "get_spreadsheet_meta": (300, ("sheet:{spreadsheet_id}",)),
+    "sheet_export_csv": (60, ("sheet:{spreadsheet_id}",)),
+    "read_doc": (120, ("doc:{document_id}",)),
+    "doc_export_pdf": (120, ("doc:{document_id}",)),
+    "get_script_content": (120, ("script", "script:{script_id}")),
+    "get_gmail_profile": (3600, ()),
+    "list_emails": (30, ("gmail",)),
+    # Query-driven bulk tools only know the "gmail" tag, not message IDs.
+    "read_email": (300, ("gmail", "gmail:{message_id}")),
+    "gmail_read_thread": (300, ("gmail",)),
+    "gmail_search_and_summarize": (30, ("gmail",)),
+    "list_events": (60, ("calendar:{calendar_id}",)),
+    "calendar_find_free_slots": (60, ("calendar:{calendar_id}",)),
+}
+
+_INVALIDATIONS = {
+    "create_folder": ("drive",),
+    "move_file": ("drive",),
+    "drive_copy_file": ("drive",),
+    "drive_bulk_move": ("drive",),
+    "drive_bulk_copy": ("drive",),
+    "drive_bulk_share": ("drive", "perm"),
+    "drive_bulk_trash": ("drive",),
+    "share_file": ("drive", "perm:{file_id}"),
+    "drive_revoke_public": ("drive", "perm:{file_id}"),
+    "drive_bulk_revoke": ("drive", "perm"),
+    "create_spreadsheet": ("drive",),
+    "add_sheet": ("sheet:{spreadsheet_id}",),
+    "append_row": ("sheet:{spreadsheet_id}",),
+    "update_sheet": ("sheet:{spreadsheet_id}",),
+    "clear_range": ("sheet:{spreadsheet_id}",),
+    "sheet_find_replace": ("sheet:{spreadsheet_id}",),
+    "sheet_create_filter_view": ("sheet:{spreadsheet_id}",),
+    "sheet_create_named_range": ("sheet:{spreadsheet_id}",),
+    "create_doc": ("drive",),
+    "append_to_doc": ("doc:{document_id}",),
+    "doc_fill_template": ("doc:{document_id}",),
+    "create_script_project": ("drive", "script"),
+    "execute_operation": ("script",),
+    "restore_script_backup": ("script",),
+    "create_draft": ("gmail",),
+    "send_email": ("gmail",),
+    "send_draft": ("gmail",),
+    "delete_email": ("gmail", "gmail:{message_id}"),
+    "batch_delete_emails": ("gmail", "gmail:{message_ids}"),
+    "gmail_archive": ("gmail", "gmail:{message_id}"),
+    "gmail_label_apply": ("gmail", "gmail:{message_ids}"),
+    "gmail_bulk_archive": ("gmail", "gmail:{message_ids}"),
+    "create_event": ("calendar:{calendar_id}",),
+    "calendar_create_meeting": ("calendar:primary",),
+}
+
+# ---------------------------------------------------------------------------
+# Handlers behind each tool
+# ---------------------------------------------------------------------------
+_TOOL_HANDLERS = {
+    "find_files": find_files_handler,
+    "read_sheet": read_sheet_handler,
+    "append_row": append_row_handler,
+    "update_sheet": update_sheet_handler,
+    "create_script_project": create_script_project_handler,
+    "get_script_content": get_script_content_handler,
+    "prepare_script_update": prepare_script_update_handler,
+    "execute_operation": execute_operation_handler,
+    "cancel_operation": cancel_operation_handler,
+    "restore_script_backup": restore_script_backup_handler,
+    "read_doc": read_doc_handler,
+    "create_doc": create_doc_handler,
+    "append_to_doc": append_to_doc_handler,
+    "doc_fill_template": doc_fill_template_handler,
+    "doc_export_pdf": doc_export_pdf_handler,
+    "create_spreadsheet": create_spreadsheet_handler,
+    "add_sheet": add_sheet_handler,
+    "clear_range": clear_range_handler,
+    "sheet_create_filter_view": sheet_create_filter_view_handler,
+    "sheet_export_csv": sheet_export_csv_handler,
+    "sheet_find_replace": sheet_find_replace_handler,
+    "sheet_create_named_range": sheet_create_named_range_handler,
+    "get_spreadsheet_meta": get_spreadsheet_meta_handler,
+    "send_email": send_email_handler,
+    "send_draft": send_draft_handler,
+    "get_gmail_profile": get_gmail_profile_handler,
+    "create_draft": create_draft_handler,
+    "list_emails": list_emails_handler,
+    "read_email": read_email_handler,
+    "gmail_read_thread": gmail_read_thread_handler,
+    "gmail_download_attachment": gmail_download_attachment_handler,
+    "delete_email": delete_email_handler,
+    "batch_delete_emails": batch_delete_emails_handler,
+    "gmail_search_and_summarize": gmail_search_and_summarize_handler,
+    "gmail_local_search": gmail_local_search_handler,
+    "gmail_archive": gmail_archive_handler,
+    "gmail_bulk_archive": gmail_bulk_archive_handler,
+    "gmail_label_apply": gmail_label_apply_handler,
+    "list_events": list_events_handler,
+    "create_event": create_event_handler,
+    "calendar_find_free_slots": calendar_find_free_slots_handler,
+    "calendar_create_meeting": calendar_create_meeting_handler,
+    "create_folder": create_folder_handler,
+    "move_file": move_file_handler,
+    "share_file": share_file_handler,
+    "drive_search_advanced": drive_search_advanced_handler,
+    "drive_folder_tree": drive_folder_tree_handler,
+    "drive_list_permissions": drive_list_permissions_handler,
+    "drive_permission_audit": drive_permission_audit_handler,
+    "drive_revoke_public": drive_revoke_public_handler,
+    "drive_bulk_revoke": drive_bulk_revoke_handler,
+    "drive_copy_file": drive_copy_file_handler,
+    "drive_bulk_move": drive_bulk_move_handler,
+    "drive_bulk_copy": drive_bulk_copy_handler,
+    "drive_bulk_share": drive_bulk_share_handler,
+    "drive_bulk_trash": drive_bulk_trash_handler,
+}
+
+# Hot read paths awaited on the event loop instead of a worker thread
+_ASYNC_TOOL_HANDLERS = {
+    "find_files": find_files_async_handler,
+    "read_sheet": read_sheet_async_handler,
+    "read_doc": read_doc_async_handler,
+    "list_emails": list_emails_async_handler,
+    "list_events": list_events_async_handler,
+}
+
 
 def _tools() -> List[types.Tool]:
     """Return the full list of tool definitions with annotations."""
@@ -82,7 +317,23 @@ def _tools() -> List[types.Tool]:
             description="Search for files on Google Drive. Query example: 'name contains \"System\"'",
             inputSchema={
                 "type": "object",
-                "properties": {"query": {"type": "string"}},
+                "properties": {
+                    "query": {"type": "string"},
+                    "limit": {
+                        "type": "integer",
+                        "description": "Maximum files to return",
+                        "default": 10,
+                    },
+                    "page_token": {
+                        "type": "string",
+                        "description": "Next page token returned by a previous call",
+                    },
+                    "stream": {
+                        "type": "boolean",
+                        "description": "Walk 1,000-file pages server-side until limit is reached",
+                        "default": False,
+                    },
+                },
                 "required": ["query"],
             },
             annotations=_READ_ONLY,
@@ -95,11 +346,47 @@ def _tools() -> List[types.Tool]:
                 "properties": {
                     "query": {"type": "string"},
                     "limit": {"type": "integer", "default": 50},
+                    "page_token": {
+                        "type": "string",
+                        "description": "Next page token returned by a previous call",
+                    },
+                    "stream": {
+                        "type": "boolean",
+                        "description": "Walk 1,000-file pages server-side until limit is reached",
+                        "default": False,
+                    },
                 },
                 "required": ["query"],
             },
             annotations=_READ_ONLY,
         ),
+        types.Tool(
+            name="drive_folder_tree",
+            description=(
+                "List a Drive folder hierarchy in one call (breadth-first, one query "
+                "per level) as an indented tree or flat paths"
+            ),
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "folder_id": {
+                        "type": "string",
+                        "description": "Folder to start from ('root' = My Drive)",
+                        "default": "root",
+                    },
+                    "max_depth": {"type": "integer", "default": 5},
+                    "max_nodes": {"type": "integer", "default": 2000},
+                    "format": {
+                        "type": "string",
+                        "enum": ["tree", "paths"],
+                        "default": "tree",
+                    },
+                    "folders_only": {"type": "boolean", "default": False},
+                },
+                "required": [],
+            },
+            annotations=_READ_ONLY,
+        ),
         types.Tool(
             name="drive_list_permissions",
             description="List permissions for a Drive file",
@@ -110,6 +397,39 @@ def _tools() -> List[types.Tool]:
             },
             annotations=_READ_ONLY,
         ),
+        types.Tool(
+            name="drive_permission_audit",
+            description=(
+                "Audit sharing across a folder tree or Drive query: lists permissions "
+                "in batch requests and reports public (anyone) and external-domain grants"
+            ),
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "folder_id": {
+                        "type": "string",
+                        "description": "Folder to audit, including everything below it (or use query)",
+                    },
+                    "query": {
+                        "type": "string",
+                        "description": "Drive query selecting the files (e.g. \"'FOLDER_ID' in parents\")",
+                    },
+                    "internal_domains": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "Domains treated as internal in addition to the account's own Workspace domain",
+                    },
+                    "max_depth": {"type": "integer", "default": 20},
+                    "max_files": {"type": "integer", "default": 50000},
+                    "page_token": {
+                        "type": "string",
+                        "description": "Next page token returned by a previous call",
+                    },
+                },
+                "required": [],
+            },
+            annotations=_READ_ONLY,
+        ),
         types.Tool(
             name="create_folder",
             description="Create a folder in Google Drive",
@@ -183,6 +503,136 @@ def _tools() -> List[types.Tool]:
             },
             annotations=_WRITE,
         ),
+        types.Tool(
+            name="drive_bulk_move",
+            description=(
+                "Move many files (IDs or a Drive query) into a folder using batch "
+                "requests. Defaults to dry_run=True (preview only)."
+            ),
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "folder_id": {"type": "string"},
+                    "file_ids": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "Files to process (or use query)",
+                    },
+                    "query": {
+                        "type": "string",
+                        "description": "Drive query selecting the files (e.g. \"'FOLDER_ID' in parents\")",
+                    },
+                    "dry_run": {"type": "boolean", "default": True},
+                },
+                "required": ["folder_id"],
+            },
+            annotations=_WRITE,
+        ),
+        types.Tool(
+            name="drive_bulk_copy",
+            description=(
+                "Copy many files (IDs or a Drive query) using batch requests. "
+                "Defaults to dry_run=True (preview only)."
+            ),
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "parent_id": {
+                        "type": "string",
+                        "description": "Folder for the copies (default: next to each original)",
+                    },
+                    "file_ids": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "Files to process (or use query)",
+                    },
+                    "query": {
+                        "type": "string",
+                        "description": "Drive query selecting the files (e.g. \"'FOLDER_ID' in parents\")",
+                    },
+                    "dry_run": {"type": "boolean", "default": True},
+                },
+                "required": [],
+            },
+            annotations=_WRITE,
+        ),
+        types.Tool(
+            name="drive_bulk_share",
+            description=(
+                "Grant one permission on many files (IDs or a Drive query) using "
+                "batch requests. Defaults to dry_run=True. "
+                "REQUIRES allow_public=True to share publicly!"
+            ),
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "role": {
+                        "type": "string",
+                        "enum": ["reader", "commenter", "writer"],
+                    },
+                    "type": {
+                        "type": "string",
+                        "enum": ["user", "group", "domain", "anyone"],
+                        "description": "Access type. 'anyone' requires allow_public=True",
+                        "default": "user",
+                    },
+                    "email_address": {
+                        "type": "string",
+                        "description": "Required for type 'user' or 'group'",
+                    },
+                    "domain": {
+                        "type": "string",
+                        "description": "Required for type 'domain'",
+                    },
+                    "allow_public": {
+                        "type": "boolean",
+                        "description": "MUST be true to share with type='anyone'. Security check.",
+                        "default": False,
+                    },
+                    "send_notification": {
+                        "type": "boolean",
+                        "description": "Email users/groups about each shared file",
+                        "default": False,
+                    },
+                    "file_ids": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "Files to process (or use query)",
+                    },
+                    "query": {
+                        "type": "string",
+                        "description": "Drive query selecting the files (e.g. \"'FOLDER_ID' in parents\")",
+                    },
+                    "dry_run": {"type": "boolean", "default": True},
+                },
+                "required": ["role"],
+            },
+            annotations=_WRITE,
+        ),
+        types.Tool(
+            name="drive_bulk_trash",
+            description=(
+                "Move many files (IDs or a Drive query) to the trash using batch "
+                "requests. Defaults to dry_run=True (preview only)."
+            ),
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "file_ids": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "Files to process (or use query)",
+                    },
+                    "query": {
+                        "type": "string",
+                        "description": "Drive query selecting the files (e.g. \"'FOLDER_ID' in parents\")",
+                    },
+                    "dry_run": {"type": "boolean", "default": True},
+                },
+                "required": [],
+            },
+            annotations=_DESTRUCTIVE,
+        ),
         types.Tool(
             name="drive_revoke_public",
             description="Revoke public access (type=anyone) for a Drive file. Requires confirm=True.",
@@ -196,6 +646,46 @@ def _tools() -> List[types.Tool]:
             },
             annotations=_DESTRUCTIVE,
         ),
+        types.Tool(
+            name="drive_bulk_revoke",
+            description=(
+                "Revoke the grants drive_permission_audit flags (public and, by default, "
+                "external) across a folder tree or Drive query in batch requests. "
+                "Requires confirm=True."
+            ),
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "folder_id": {
+                        "type": "string",
+                        "description": "Folder to audit, including everything below it (or use query)",
+                    },
+                    "query": {
+                        "type": "string",
+                        "description": "Drive query selecting the files (e.g. \"'FOLDER_ID' in parents\")",
+                    },
+                    "internal_domains": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "Domains treated as internal in addition to the account's own Workspace domain",
+                    },
+                    "max_depth": {"type": "integer", "default": 20},
+                    "max_files": {"type": "integer", "default": 50000},
+                    "page_token": {
+                        "type": "string",
+                        "description": "Next page token returned by a previous call",
+                    },
+                    "include_external": {
+                        "type": "boolean",
+                        "description": "Also revoke external user, group and domain grants",
+                        "default": True,
+                    },
+                    "confirm": {"type": "boolean", "default": False},
+                },
+                "required": [],
+            },
+            annotations=_DESTRUCTIVE,
+        ),
         # ── Google Sheets ─────────────────────────────────────────────────
         types.Tool(
             name="read_sheet",
@@ -543,6 +1033,10 @@ def _tools() -> List[types.Tool]:
                         "type": "string",
                         "description": "Gmail search query (e.g. 'is:unread')",
                     },
+                    "page_token": {
+                        "type": "string",
+                        "description": "Next page token returned by a previous call",
+                    },
                 },
                 "required": [],
             },
@@ -550,22 +1044,127 @@ def _tools() -> List[types.Tool]:
         ),
         types.Tool(
             name="read_email",
-            description="Read a specific email by ID",
+            description=(
+                "Read a specific email by ID: headers, decoded body "
+                "(text/plain, or HTML converted to text) and attachment list"
+            ),
             inputSchema={
                 "type": "object",
-                "properties": {"message_id": {"type": "string"}},
+                "properties": {
+                    "message_id": {"type": "string"},
+                    "max_bytes": {
+                        "type": "integer",
+                        "description": "Cap on the body size in UTF-8 bytes (0 = no cap)",
+                        "default": 20000,
+                    },
+                    "include_quoted": {
+                        "type": "boolean",
+                        "description": "Keep quoted replies (> lines, 'On ... wrote:' blocks)",
+                        "default": False,
+                    },
+                },
                 "required": ["message_id"],
             },
             annotations=_READ_ONLY,
         ),
+        types.Tool(
+            name="gmail_read_thread",
+            description=(
+                "Read every message of a Gmail thread in one request. Quoted text "
+                "repeated across messages is removed; the byte budget favours the "
+                "newest messages."
+            ),
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "thread_id": {"type": "string"},
+                    "format": {
+                        "type": "string",
+                        "enum": ["full", "metadata"],
+                        "description": "'metadata' returns headers and snippets only",
+                        "default": "full",
+                    },
+                    "max_bytes": {
+                        "type": "integer",
+                        "description": "Budget for all bodies in UTF-8 bytes (0 = no cap)",
+                        "default": 50000,
+                    },
+                    "include_quoted": {
+                        "type": "boolean",
+                        "description": "Keep quoted replies and repeated paragraphs",
+                        "default": False,
+                    },
+                },
+                "required": ["thread_id"],
+            },
+            annotations=_READ_ONLY,
+        ),
+        types.Tool(
+            name="gmail_download_attachment",
+            description=(
+                "Save an email attachment to the configured attachment directory. "
+                "Returns only the local path and size, never the file content."
+            ),
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "message_id": {"type": "string"},
+                    "attachment_id": {
+                        "type": "string",
+                        "description": "Attachment ID from read_email",
+                    },
+                    "filename": {
+                        "type": "string",
+                        "description": "Attachment file name (selects the attachment when no ID is given)",
+                    },
+                },
+                "required": ["message_id"],
+            },
+            annotations=_WRITE,
+        ),
         types.Tool(
             name="gmail_search_and_summarize",
-            description="Search Gmail and return a brief summary",
+            description=(
+                "Search Gmail and return a brief summary. With stream=true, walks "
+                "every result page and reports counts by sender, domain, day, "
+                "label and thread."
+            ),
             inputSchema={
                 "type": "object",
                 "properties": {
                     "query": {"type": "string"},
                     "max_results": {"type": "integer", "default": 50},
+                    "stream": {
+                        "type": "boolean",
+                        "default": False,
+                        "description": "Aggregate over all matching messages instead of listing the first max_results",
+                    },
+                    "top_n": {
+                        "type": "integer",
+                        "default": 10,
+                        "description": "Rows per section in stream mode",
+                    },
+                },
+                "required": ["query"],
+            },
+            annotations=_READ_ONLY,
+        ),
+        types.Tool(
+            name="gmail_local_search",
+            description=(
+                "Ranked full-text search over the local Gmail index (subjects, "
+                "senders, snippets and bodies). Returns message IDs usable with "
+                "read_email, gmail_archive and gmail_label_apply. Requires "
+                "gmail_sync and gmail_fts."
+            ),
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "query": {
+                        "type": "string",
+                        "description": "Words to find; all must match, 'word*' matches a prefix",
+                    },
+                    "max_results": {"type": "integer", "default": 20},
                 },
                 "required": ["query"],
             },
@@ -641,7 +1240,10 @@ def _tools() -> List[types.Tool]:
         ),
         types.Tool(
             name="batch_delete_emails",
-            description="Delete multiple emails by their IDs. Defaults to dry_run=True for safety!",
+            description=(
+                "Delete multiple emails by their IDs or by Gmail query. "
+                "Defaults to dry_run=True for safety!"
+            ),
             inputSchema={
                 "type": "object",
                 "properties": {
@@ -650,13 +1252,25 @@ def _tools() -> List[types.Tool]:
                         "items": {"type": "string"},
                         "description": "List of message IDs to delete",
                     },
+                    "query": {
+                        "type": "string",
+                        "description": "Gmail search query selecting the emails to delete instead of message_ids",
+                    },
                     "dry_run": {
                         "type": "boolean",
                         "description": "If true (default), shows preview without deleting. Set to false to actually delete.",
                         "default": True,
                     },
+                    "expected_count": {
+                        "type": "integer",
+                        "description": "Required with query and dry_run=false: the count from the dry run.",
+                    },
+                    "selection_token": {
+                        "type": "string",
+                        "description": "Required with query and dry_run=false: the token from the dry run. Nothing is deleted if the query now selects different emails.",
+                    },
                 },
-                "required": ["message_ids"],
+                "required": [],
             },
             annotations=_DESTRUCTIVE,
         ),
@@ -673,18 +1287,50 @@ def _tools() -> List[types.Tool]:
             },
             annotations=_WRITE,
         ),
+        types.Tool(
+            name="gmail_bulk_archive",
+            description=(
+                "Archive every message matching a Gmail query (or a list of IDs) "
+                "in bulk. Dry-run count preview by default."
+            ),
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "query": {
+                        "type": "string",
+                        "description": "Gmail search query (e.g. 'older_than:30d category:promotions')",
+                    },
+                    "message_ids": {"type": "array", "items": {"type": "string"}},
+                    "dry_run": {"type": "boolean", "default": True},
+                },
+                "required": [],
+            },
+            annotations=_WRITE,
+        ),
         types.Tool(
             name="gmail_label_apply",
-            description="Apply a label to messages with dry-run preview",
+            description=(
+                "Apply a label to messages (by ID or to every message matching "
+                "a Gmail query) with dry-run preview"
+            ),
             inputSchema={
                 "type": "object",
                 "properties": {
                     "message_ids": {"type": "array", "items": {"type": "string"}},
+                    "query": {
+                        "type": "string",
+                        "description": "Gmail search query selecting the messages instead of message_ids",
+                    },
                     "label_name": {"type": "string"},
+                    "label_names": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "Further labels to apply in the same request",
+                    },
                     "dry_run": {"type": "boolean", "default": True},
                     "create_if_missing": {"type": "boolean", "default": True},
                 },
-                "required": ["message_ids", "label_name"],
+                "required": [],
             },
             annotations=_WRITE,
         ),
@@ -776,11 +1422,215 @@ def _tools() -> List[types.Tool]:
     ]
 
 
+def _resources() -> List[types.Resource]:
+    """Return the static resource definitions."""
+    return [
+        types.Resource(
+            uri="gdrive://recent",
+            name="Recent Google Drive Files",
+            description="Lists the 20 most recently modified files in Google Drive",
+            mimeType="text/plain",
+        ),
+        types.Resource(
+            uri="gmail://inbox",
+            name="Gmail Inbox",
+            description="Recent unread messages in the Gmail inbox",
+            mimeType="text/plain",
+        ),
+        types.Resource(
+            uri="gcalendar://upcoming",
+            name="Upcoming Calendar Events",
+            description="Upcoming events from the primary Google Calendar (next 7 days)",
+            mimeType="text/plain",
+        ),
+    ]
+
+
+def _resource_templates() -> List[types.ResourceTemplate]:
+    """Return the parameterised resource templates."""
+    return [
+        types.ResourceTemplate(
+            uriTemplate="gdrive://file/{file_id}",
+            name="Google Drive File",
+            description="Metadata for a specific Google Drive file (ID required)",
+            mimeType="text/plain",
+        ),
+        types.ResourceTemplate(
+            uriTemplate="gsheets://{spreadsheet_id}/{range}",
+            name="Google Sheets Range",
+            description=(
+                "Data from a specific spreadsheet range, e.g. "
+                "gsheets://SPREADSHEET_ID/Sheet1!A1:Z100"
+            ),
+            mimeType="text/plain",
+        ),
+        types.ResourceTemplate(
+            uriTemplate="gdocs://{document_id}",
+            name="Google Document",
+            description="Full text content of a specific Google Doc (ID required)",
+            mimeType="text/plain",
+        ),
+    ]
+
+
+def _prompts() -> List[types.Prompt]:
+    """Return the prompt definitions."""
+    return [
+        types.Prompt(
+            name="summarize_inbox",
+            description=(
+                "Fetch recent Gmail messages and prepare them for AI summarization. "
+                "Optionally filter by a Gmail search query."
+            ),
+            arguments=[
+                types.PromptArgument(
+                    name="query",
+                    description="Gmail search query (default: 'is:unread in:inbox')",
+                    required=False,
+                ),
+                types.PromptArgument(
+                    name="max_results",
+                    description="Maximum number of emails to include (default: 20)",
+                    required=False,
+                ),
+            ],
+        ),
+        types.Prompt(
+            name="analyze_spreadsheet",
+            description=(
+                "Read a Google Sheet range and prepare the data for AI analysis "
+                "or visualization."
+            ),
+            arguments=[
+                types.PromptArgument(
+                    name="spreadsheet_id",
+                    description="The Google Spreadsheet ID",
+                    required=True,
+                ),
+                types.PromptArgument(
+                    name="range",
+                    description="Sheet range to read (default: Sheet1)",
+                    required=False,
+                ),
+            ],
+        ),
+        types.Prompt(
+            name="plan_week",
+            description=(
+                "Fetch upcoming calendar events and prepare a weekly planning summary "
+                "for AI-assisted scheduling."
+            ),
+            arguments=[
+                types.PromptArgument(
+                    name="days_ahead",
+                    description="Number of days to look ahead (default: 7)",
+                    required=False,
+                ),
+            ],
+        ),
+        types.Prompt(
+            name="search_drive",
+            description=(
+                "Search Google Drive for files and prepare a structured list "
+                "for AI review or organisation suggestions."
+            ),
+            arguments=[
+                types.PromptArgument(
+                    name="query",
+                    description="Drive search query (e.g. 'name contains \"budget\"')",
+                    required=True,
+                ),
+                types.PromptArgument(
+                    name="limit",
+                    description="Maximum number of results (default: 20)",
+                    required=False,
+                ),
+            ],
+        ),
+    ]
+
+
+# ---------------------------------------------------------------------------
+# Cached catalog for the list_* endpoints
+# ---------------------------------------------------------------------------
+@dataclass(frozen=True)
+class _Catalog:
+    tools: List[types.Tool]
+    resources: List[types.Resource]
+    resource_templates: List[types.ResourceTemplate]
+    prompts: List[types.Prompt]
+    version: str
+
+
+_catalog_cache: Optional[_Catalog] = None
+
+
+def _catalog() -> _Catalog:
+    """Return the tool/resource/prompt definitions, built once.
+
+    Building ~45 pydantic ``Tool`` objects per ``tools/list`` is wasted work
+    since the definitions are static. ``version`` is a hash of their JSON
+    form that clients and logs can compare; it is computed once, here.
+    """
+    global _catalog_cache
+    if _catalog_cache is None:
+        tools = _tools()
+        resources = _resources()
+        resource_templates = _resource_templates()
+        prompts = _prompts()
+        serialized = json.dumps(
+            {
+                kind: [item.model_dump(mode="json", exclude_none=True) for item in items]
+                for kind, items in (
+                    ("tools", tools),
+                    ("resources", resources),
+                    ("resourceTemplates", resource_templates),
+                    ("prompts", prompts),
+                )
+            },
+            sort_keys=True,
+            separators=(",", ":"),
+        ).encode("utf-8")
+        _catalog_cache = _Catalog(
+            tools=tools,
+            resources=resources,
+            resource_templates=resource_templates,
+            prompts=prompts,
+            version=hashlib.sha256(serialized).hexdigest()[:16],
+        )
+    return _catalog_cache
+
+
+def catalog_version() -> str:
+    """Hash of the current tool/resource/prompt definitions."""
+    return _catalog().version
+
+
 async def run() -> None:
     config = load_config()
     logger = setup_logging(config.log_file, level=config.log_level)
 
     server = Server("My Google Tools")
+    executors = ServiceExecutors(config)
+    cache_policies = {
+        name: (config.result_cache_ttls.get(name, ttl), tags)
+        for name, (ttl, tags) in _CACHE_POLICIES.items()
+    }
+    registry = build_registry(
+        _catalog().tools,
+        _TOOL_HANDLERS,
+        _ASYNC_TOOL_HANDLERS,
+        _TOOL_SERVICES,
+        cache_policies if config.result_cache_max_bytes > 0 else {},
+        _INVALIDATIONS,
+    )
+    logger.info(
+        "Tool catalog version %s (%s tools)", catalog_version(), len(registry)
+    )
+    coalescer = InflightCoalescer()
+    gmail_sync.start(config)
+    drive_sync.start(config)
+    cache = ResultCache(config.result_cache_max_bytes)
 
     # ------------------------------------------------------------------
     # Tools
@@ -788,7 +1638,7 @@ async def run() -> None:
 
     @server.list_tools()
     async def handle_list_tools() -> List[types.Tool]:
-        return _tools()
+        return _catalog().tools
 
     @server.call_tool()
     async def handle_call_tool(
@@ -800,190 +1650,39 @@ async def run() -> None:
         try:
             require_token_configured(config.mcp_auth_token)
 
-            handlers = {
-                "find_files": lambda a: find_files_handler(config, logger, a.get("query")),
-                "read_sheet": lambda a: read_sheet_handler(
-                    config, logger, a.get("spreadsheet_id"), a.get("range_name")
-                ),
-                "append_row": lambda a: append_row_handler(
-                    config, logger, a.get("spreadsheet_id"), a.get("range_name"), a.get("values")
-                ),
-                "update_sheet": lambda a: update_sheet_handler(
-                    config, logger, a.get("spreadsheet_id"), a.get("range_name"), a.get("values")
-                ),
-                "create_script_project": lambda a: create_script_project_handler(
-                    config, logger, a.get("title"), a.get("parent_id")
-                ),
-                "get_script_content": lambda a: get_script_content_handler(
-                    config, logger, a.get("script_id")
-                ),
-                "prepare_script_update": lambda a: prepare_script_update_handler(
-                    config, logger, a.get("script_id"), a.get("files")
-                ),
-                "execute_operation": lambda a: execute_operation_handler(
-                    config, logger, a.get("operation_id")
-                ),
-                "cancel_operation": lambda a: cancel_operation_handler(
-                    config, logger, a.get("operation_id")
-                ),
-                "restore_script_backup": lambda a: restore_script_backup_handler(
-                    config, logger, a.get("backup_path")
-                ),
-                "read_doc": lambda a: read_doc_handler(config, logger, a.get("document_id")),
-                "create_doc": lambda a: create_doc_handler(config, logger, a.get("title")),
-                "append_to_doc": lambda a: append_to_doc_handler(
-                    config, logger, a.get("document_id"), a.get("text")
-                ),
-                "doc_fill_template": lambda a: doc_fill_template_handler(
-                    config, logger, a.get("document_id"), a.get("replacements"), a.get("confirm", False)
-                ),
-                "doc_export_pdf": lambda a: doc_export_pdf_handler(
-                    config, logger, a.get("document_id")
-                ),
-                "create_spreadsheet": lambda a: create_spreadsheet_handler(
-                    config, logger, a.get("title")
-                ),
-                "add_sheet": lambda a: add_sheet_handler(
-                    config, logger, a.get("spreadsheet_id"), a.get("title")
-                ),
-                "clear_range": lambda a: clear_range_handler(
-                    config, logger, a.get("spreadsheet_id"), a.get("range_name"), a.get("confirm", False)
-                ),
-                "sheet_create_filter_view": lambda a: sheet_create_filter_view_handler(
-                    config,
-                    logger,
-                    a.get("spreadsheet_id"),
-                    a.get("sheet_id"),
-                    a.get("title"),
-                    a.get("start_row", 0),
-                    a.get("end_row"),
-                    a.get("start_col", 0),
-                    a.get("end_col"),
-                ),
-                "sheet_export_csv": lambda a: sheet_export_csv_handler(
-                    config, logger, a.get("spreadsheet_id"), a.get("range_name"), a.get("max_rows", 5000)
-                ),
-                "sheet_find_replace": lambda a: sheet_find_replace_handler(
-                    config,
-                    logger,
-                    a.get("spreadsheet_id"),
-                    a.get("range_name"),
-                    a.get("find_text"),
-                    a.get("replace_text"),
-                    a.get("dry_run", True),
-                    a.get("match_case", False),
-                ),
-                "sheet_create_named_range": lambda a: sheet_create_named_range_handler(
-                    config,
-                    logger,
-                    a.get("spreadsheet_id"),
-                    a.get("name"),
-                    a.get("sheet_id"),
-                    a.get("start_row"),
-                    a.get("end_row"),
-                    a.get("start_col"),
-                    a.get("end_col"),
-                ),
-                "get_spreadsheet_meta": lambda a: get_spreadsheet_meta_handler(
-                    config, logger, a.get("spreadsheet_id")
-                ),
-                "send_email": lambda a: send_email_handler(
-                    config, logger, a.get("to"), a.get("subject"), a.get("body_text"), a.get("draft_mode", True)
-                ),
-                "send_draft": lambda a: send_draft_handler(config, logger, a.get("draft_id")),
-                "get_gmail_profile": lambda a: get_gmail_profile_handler(config, logger),
-                "create_draft": lambda a: create_draft_handler(
-                    config, logger, a.get("to"), a.get("subject"), a.get("body_text")
-                ),
-                "list_emails": lambda a: list_emails_handler(
-                    config, logger, a.get("max_results", 10), a.get("query")
-                ),
-                "read_email": lambda a: read_email_handler(config, logger, a.get("message_id")),
-                "delete_email": lambda a: delete_email_handler(
-                    config, logger, a.get("message_id"), a.get("confirm", False)
-                ),
-                "batch_delete_emails": lambda a: batch_delete_emails_handler(
-                    config, logger, a.get("message_ids"), a.get("dry_run", True)
-                ),
-                "gmail_search_and_summarize": lambda a: gmail_search_and_summarize_handler(
-                    config, logger, a.get("query"), a.get("max_results", 50)
-                ),
-                "gmail_archive": lambda a: gmail_archive_handler(
-                    config, logger, a.get("message_id"), a.get("confirm", False)
-                ),
-                "gmail_label_apply": lambda a: gmail_label_apply_handler(
-                    config,
-                    logger,
-                    a.get("message_ids"),
-                    a.get("label_name"),
-                    a.get("dry_run", True),
-                    a.get("create_if_missing", True),
-                ),
-                "list_events": lambda a: list_events_handler(
-                    config, logger, a.get("calendar_id", "primary"), a.get("max_results", 10)
-                ),
-                "create_event": lambda a: create_event_handler(
-                    config,
-                    logger,
-                    a.get("summary"),
-                    a.get("start_time"),
-                    a.get("end_time"),
-                    a.get("description", ""),
-                    a.get("calendar_id", "primary"),
-                ),
-                "calendar_find_free_slots": lambda a: calendar_find_free_slots_handler(
-                    config,
-                    logger,
-                    a.get("calendar_id", "primary"),
-                    a.get("start_time"),
-                    a.get("end_time"),
-                    a.get("duration_minutes", 30),
-                    a.get("max_results", 5),
-                ),
-                "calendar_create_meeting": lambda a: calendar_create_meeting_handler(
-                    config,
-                    logger,
-                    a.get("summary"),
-                    a.get("start_time"),
-                    a.get("end_time"),
-                    a.get("attendees"),
-                    a.get("description", ""),
-                    a.get("location", ""),
-                    a.get("confirm", False),
-                ),
-                "create_folder": lambda a: create_folder_handler(
-                    config, logger, a.get("name"), a.get("parent_id")
-                ),
-                "move_file": lambda a: move_file_handler(
-                    config, logger, a.get("file_id"), a.get("folder_id")
-                ),
-                "share_file": lambda a: share_file_handler(
-                    config,
-                    logger,
-                    a.get("file_id"),
-                    a.get("role"),
-                    a.get("type", "user"),
-                    a.get("email_address"),
-                    a.get("allow_public", False),
-                ),
-                "drive_search_advanced": lambda a: drive_search_advanced_handler(
-                    config, logger, a.get("query"), a.get("limit", 50)
-                ),
-                "drive_list_permissions": lambda a: drive_list_permissions_handler(
-                    config, logger, a.get("file_id")
-                ),
-                "drive_revoke_public": lambda a: drive_revoke_public_handler(
-                    config, logger, a.get("file_id"), a.get("confirm", False)
-                ),
-                "drive_copy_file": lambda a: drive_copy_file_handler(
-                    config, logger, a.get("file_id"), a.get("name"), a.get("parent_id")
-                ),
-            }
-
-            if name not in handlers:
+            spec = registry.get(name)
+            if spec is None:
                 raise ValueError(f"Unknown tool: {name}")
 
-            result = await asyncio.to_thread(handlers[name], arguments)
+            spec.validate(arguments)
+            kwargs = spec.bind(arguments)
+
+            async def invoke() -> Any:
+                executor = executors[spec.service]
+                if spec.async_handler is not None:
+                    return await executor.run_async(
+                        spec.async_handler, config, logger, **kwargs
+                    )
+                return await executor.run(spec.handler, config, logger, **kwargs)
+
+            if spec.read_only:
+                key = call_key(name, kwargs)
+                tags = expand_tags(spec.cache_tags, kwargs)
+                hit, result = cache.get(key) if spec.cache_ttl else (False, None)
+                if not hit:
+                    result = await cached_call(
+                        cache, coalescer, key, tags, spec.cache_ttl, invoke
+                    )
+            else:
+                try:
+                    result = await invoke()
+                finally:
+                    cache.invalidate(expand_tags(spec.invalidates, kwargs))
+                    if spec.service == "gmail":
+                        gmail_sync.expire(config)
+                    elif spec.service in ("drive", "sheets", "docs", "script"):
+                        # These writes can create or move Drive files.
+                        drive_sync.expire(config)
 
             if isinstance(result, BinaryResult):
                 return [
@@ -1009,70 +1708,33 @@ async def run() -> None:
 
     @server.list_resources()
     async def handle_list_resources() -> List[types.Resource]:
-        return [
-            types.Resource(
-                uri="gdrive://recent",
-                name="Recent Google Drive Files",
-                description="Lists the 20 most recently modified files in Google Drive",
-                mimeType="text/plain",
-            ),
-            types.Resource(
-                uri="gmail://inbox",
-                name="Gmail Inbox",
-                description="Recent unread messages in the Gmail inbox",
-                mimeType="text/plain",
-            ),
-            types.Resource(
-                uri="gcalendar://upcoming",
-                name="Upcoming Calendar Events",
-                description="Upcoming events from the primary Google Calendar (next 7 days)",
-                mimeType="text/plain",
-            ),
-        ]
+        return _catalog().resources
 
     @server.list_resource_templates()
     async def handle_list_resource_templates() -> List[types.ResourceTemplate]:
-        return [
-            types.ResourceTemplate(
-                uriTemplate="gdrive://file/{file_id}",
-                name="Google Drive File",
-                description="Metadata for a specific Google Drive file (ID required)",
-                mimeType="text/plain",
-            ),
-            types.ResourceTemplate(
-                uriTemplate="gsheets://{spreadsheet_id}/{range}",
-                name="Google Sheets Range",
-                description=(
-                    "Data from a specific spreadsheet range, e.g. "
-                    "gsheets://SPREADSHEET_ID/Sheet1!A1:Z100"
-                ),
-                mimeType="text/plain",
-            ),
-            types.ResourceTemplate(
-                uriTemplate="gdocs://{document_id}",
-                name="Google Document",
-                description="Full text content of a specific Google Doc (ID required)",
-                mimeType="text/plain",
-            ),
-        ]
+        return _catalog().resource_templates
 
     @server.read_resource()
     async def handle_read_resource(uri: AnyUrl) -> Iterable[ReadResourceContents]:
-        from .auth import get_creds
-        from googleapiclient.discovery import build
-
         uri_str = str(uri)
 
-        def _fetch() -> str:
+        async def _fetch() -> str:
             if uri_str == "gdrive://recent":
-                creds = get_creds(config)
-                svc = build("drive", "v3", credentials=creds)
-                results = svc.files().list(
-                    orderBy="modifiedTime desc",
-                    pageSize=20,
-                    fields="files(id,name,mimeType,modifiedTime,owners)",
-                ).execute()
-                files = results.get("files", [])
+                svc = await aio.get_service(config, "drive", "v3")
+                local = None
+                if config.drive_sync:
+                    local = await run_blocking(
+                        drive_sync.local_search, config, svc, None, 20
+                    )
+                if local is not None:
+                    files = local[0]
+                else:
+                    results = await aio.execute(config, svc.files().list(
+                        orderBy="modifiedTime desc",
+                        pageSize=20,
+                        fields="files(id,name,mimeType,modifiedTime,owners)",
+                    ))
+                    files = results.get("files", [])
                 if not files:
                     return "No files found."
                 lines = ["Recent Google Drive files (by last modified):\n"]
@@ -1086,45 +1748,42 @@ async def run() -> None:
                 return "\n".join(lines)
 
             elif uri_str == "gmail://inbox":
-                creds = get_creds(config)
-                svc = build("gmail", "v1", credentials=creds)
-                results = svc.users().messages().list(
-                    userId="me", maxResults=20, q="is:unread in:inbox"
-                ).execute()
-                messages = results.get("messages", [])
+                svc = await aio.get_service(config, "gmail", "v1")
+                local = None
+                if config.gmail_sync:
+                    local = await run_blocking(
+                        gmail_sync.local_search, config, svc, "is:unread in:inbox", 20
+                    )
+                if local is not None:
+                    messages = local[0]
+                else:
+                    message_ids, _ = await list_message_ids_async(
+                        config, svc, "is:unread in:inbox", 20
+                    )
+                    messages = await fetch_messages_async(config, svc, message_ids)
                 if not messages:
                     return "No unread messages in inbox."
                 lines = [f"Unread inbox messages ({len(messages)}):\n"]
-                for msg in messages:
-                    full = svc.users().messages().get(
-                        userId="me",
-                        id=msg["id"],
-                        format="metadata",
-                        metadataHeaders=["From", "Subject", "Date"],
-                    ).execute()
-                    hdrs = {
-                        h["name"]: h["value"]
-                        for h in full.get("payload", {}).get("headers", [])
-                    }
+                for full in messages:
+                    hdrs = message_headers(full)
                     lines.append(
-                        f"- [{msg['id']}] {hdrs.get('Date', '')} | "
+                        f"- [{full['id']}] {hdrs.get('Date', '')} | "
                         f"{hdrs.get('From', '')} | {hdrs.get('Subject', '(no subject)')}"
                     )
                 return "\n".join(lines)
 
             elif uri_str == "gcalendar://upcoming":
-                creds = get_creds(config)
-                svc = build("calendar", "v3", credentials=creds)
+                svc = await aio.get_service(config, "calendar", "v3")
                 now = datetime.now(timezone.utc)
                 time_max = (now + timedelta(days=7)).isoformat()
-                results = svc.events().list(
+                results = await aio.execute(config, svc.events().list(
                     calendarId="primary",
                     timeMin=now.isoformat(),
                     timeMax=time_max,
                     maxResults=25,
                     singleEvents=True,
                     orderBy="startTime",
-                ).execute()
+                ))
                 events = results.get("items", [])
                 if not events:
                     return "No upcoming events in the next 7 days."
@@ -1142,12 +1801,17 @@ async def run() -> None:
                 file_id = uri_str.removeprefix("gdrive://file/")
                 if not file_id:
                     raise ValueError("file_id is required in gdrive://file/{file_id}")
-                creds = get_creds(config)
-                svc = build("drive", "v3", credentials=creds)
-                f = svc.files().get(
-                    fileId=file_id,
-                    fields="id,name,mimeType,size,createdTime,modifiedTime,owners,webViewLink,parents",
-                ).execute()
+                svc = await aio.get_service(config, "drive", "v3")
+                f = None
+                if config.drive_sync:
+                    f = await run_blocking(
+                        drive_sync.local_file, config, svc, file_id
+                    )
+                if f is None:
+                    f = await aio.execute(config, svc.files().get(
+                        fileId=file_id,
+                        fields="id,name,mimeType,size,createdTime,modifiedTime,owners,webViewLink,parents",
+                    ))
                 owners = f.get("owners", [{}])
                 owner = owners[0].get("emailAddress", "?") if owners else "?"
                 size_bytes = int(f.get("size", 0))
@@ -1170,11 +1834,10 @@ async def run() -> None:
                 range_name = parts[1] if len(parts) > 1 else "Sheet1"
                 if not spreadsheet_id:
                     raise ValueError("spreadsheet_id is required in gsheets://{spreadsheet_id}/{range}")
-                creds = get_creds(config)
-                svc = build("sheets", "v4", credentials=creds)
-                result = svc.spreadsheets().values().get(
+                svc = await aio.get_service(config, "sheets", "v4")
+                result = await aio.execute(config, svc.spreadsheets().values().get(
                     spreadsheetId=spreadsheet_id, range=range_name
-                ).execute()
+                ))
                 values = result.get("values", [])
                 if not values:
                     return "No data found."
@@ -1188,9 +1851,10 @@ async def run() -> None:
                 document_id = uri_str.removeprefix("gdocs://")
                 if not document_id:
                     raise ValueError("document_id is required in gdocs://{document_id}")
-                creds = get_creds(config)
-                svc = build("docs", "v1", credentials=creds)
-                doc = svc.documents().get(documentId=document_id).execute()
+                svc = await aio.get_service(config, "docs", "v1")
+                doc = await aio.execute(
+                    config, svc.documents().get(documentId=document_id)
+                )
                 content = doc.get("body", {}).get("content", [])
                 text_parts = []
                 for value in content:
@@ -1202,7 +1866,10 @@ async def run() -> None:
             else:
                 raise ValueError(f"Unknown resource URI scheme: {uri_str}")
 
-        text = await asyncio.to_thread(_fetch)
+        service = _RESOURCE_SERVICES.get(uri_str.split("://", 1)[0])
+        if service is None:
+            raise ValueError(f"Unknown resource URI scheme: {uri_str}")
+        text = await executors[service].run_async(_fetch)
         return [ReadResourceContents(content=text, mime_type="text/plain")]
 
     # ------------------------------------------------------------------
@@ -1211,86 +1878,13 @@ async def run() -> None:
 
     @server.list_prompts()
     async def handle_list_prompts() -> List[types.Prompt]:
-        return [
-            types.Prompt(
-                name="summarize_inbox",
-                description=(
-                    "Fetch recent Gmail messages and prepare them for AI summarization. "
-                    "Optionally filter by a Gmail search query."
-                ),
-                arguments=[
-                    types.PromptArgument(
-                        name="query",
-                        description="Gmail search query (default: 'is:unread in:inbox')",
-                        required=False,
-                    ),
-                    types.PromptArgument(
-                        name="max_results",
-                        description="Maximum number of emails to include (default: 20)",
-                        required=False,
-                    ),
-                ],
-            ),
-            types.Prompt(
-                name="analyze_spreadsheet",
-                description=(
-                    "Read a Google Sheet range and prepare the data for AI analysis "
-                    "or visualization."
-                ),
-                arguments=[
-                    types.PromptArgument(
-                        name="spreadsheet_id",
-                        description="The Google Spreadsheet ID",
-                        required=True,
-                    ),
-                    types.PromptArgument(
-                        name="range",
-                        description="Sheet range to read (default: Sheet1)",
-                        required=False,
-                    ),
-                ],
-            ),
-            types.Prompt(
-                name="plan_week",
-                description=(
-                    "Fetch upcoming calendar events and prepare a weekly planning summary "
-                    "for AI-assisted scheduling."
-                ),
-                arguments=[
-                    types.PromptArgument(
-                        name="days_ahead",
-                        description="Number of days to look ahead (default: 7)",
-                        required=False,
-                    ),
-                ],
-            ),
-            types.Prompt(
-                name="search_drive",
-                description=(
-                    "Search Google Drive for files and prepare a structured list "
-                    "for AI review or organisation suggestions."
-                ),
-                arguments=[
-                    types.PromptArgument(
-                        name="query",
-                        description="Drive search query (e.g. 'name contains \"budget\"')",
-                        required=True,
-                    ),
-                    types.PromptArgument(
-                        name="limit",
-                        description="Maximum number of results (default: 20)",
-                        required=False,
-                    ),
-                ],
-            ),
-        ]
+        return _catalog().prompts
 
     @server.get_prompt()
     async def handle_get_prompt(
         name: str, arguments: dict[str, str] | None
     ) -> types.GetPromptResult:
-        from .auth import get_creds
-        from googleapiclient.discovery import build
+        from .services import get_service
 
         args = arguments or {}
 
@@ -1299,29 +1893,16 @@ async def run() -> None:
             max_results = int(args.get("max_results", "20"))
 
             def _fetch_emails() -> str:
-                creds = get_creds(config)
-                svc = build("gmail", "v1", credentials=creds)
-                results = svc.users().messages().list(
-                    userId="me", maxResults=min(max_results, 50), q=query
-                ).execute()
-                messages = results.get("messages", [])
-                if not messages:
+                svc = get_service(config, "gmail", "v1")
+                message_ids, _ = list_message_ids(svc, query, min(max_results, 50))
+                if not message_ids:
                     return f"No messages found for query: {query}"
-                lines = [f"Found {len(messages)} message(s) for '{query}':\n"]
-                for msg in messages:
-                    full = svc.users().messages().get(
-                        userId="me",
-                        id=msg["id"],
-                        format="metadata",
-                        metadataHeaders=["From", "Subject", "Date"],
-                    ).execute()
-                    hdrs = {
-                        h["name"]: h["value"]
-                        for h in full.get("payload", {}).get("headers", [])
-                    }
+                lines = [f"Found {len(message_ids)} message(s) for '{query}':\n"]
+                for full in fetch_messages(svc, message_ids):
+                    hdrs = message_headers(full)
                     snippet = full.get("snippet", "")[:120]
                     lines.append(
-                        f"\n---\nID: {msg['id']}\n"
+                        f"\n---\nID: {full['id']}\n"
                         f"Date: {hdrs.get('Date', '')}\n"
                         f"From: {hdrs.get('From', '')}\n"
                         f"Subject: {hdrs.get('Subject', '(no subject)')}\n"
@@ -1329,7 +1910,7 @@ async def run() -> None:
                     )
                 return "\n".join(lines)
 
-            email_data = await asyncio.to_thread(_fetch_emails)
+            email_data = await executors["gmail"].run(_fetch_emails)
             return types.GetPromptResult(
                 description=f"Gmail inbox summary — query: {query}",
                 messages=[
@@ -1355,8 +1936,7 @@ async def run() -> None:
             range_name = args.get("range", "Sheet1")
 
             def _fetch_sheet() -> tuple[str, str]:
-                creds = get_creds(config)
-                svc = build("sheets", "v4", credentials=creds)
+                svc = get_service(config, "sheets", "v4")
                 meta = svc.spreadsheets().get(spreadsheetId=spreadsheet_id).execute()
                 title = meta.get("properties", {}).get("title", spreadsheet_id)
                 result = svc.spreadsheets().values().get(
@@ -1371,7 +1951,7 @@ async def run() -> None:
                 ]
                 return title, "\n".join(rows)
 
-            title, sheet_data = await asyncio.to_thread(_fetch_sheet)
+            title, sheet_data = await executors["sheets"].run(_fetch_sheet)
             return types.GetPromptResult(
                 description=f"Analysis prompt for spreadsheet: {title}",
                 messages=[
@@ -1396,8 +1976,7 @@ async def run() -> None:
             days_ahead = int(args.get("days_ahead", "7"))
 
             def _fetch_events() -> str:
-                creds = get_creds(config)
-                svc = build("calendar", "v3", credentials=creds)
+                svc = get_service(config, "calendar", "v3")
                 now = datetime.now(timezone.utc)
                 time_max = (now + timedelta(days=days_ahead)).isoformat()
                 results = svc.events().list(
@@ -1433,7 +2012,7 @@ async def run() -> None:
                     )
                 return "\n".join(lines)
 
-            events_data = await asyncio.to_thread(_fetch_events)
+            events_data = await executors["calendar"].run(_fetch_events)
             return types.GetPromptResult(
                 description=f"Weekly planning — next {days_ahead} days",
                 messages=[
@@ -1460,8 +2039,7 @@ async def run() -> None:
             limit = int(args.get("limit", "20"))
 
             def _fetch_drive() -> str:
-                creds = get_creds(config)
-                svc = build("drive", "v3", credentials=creds)
+                svc = get_service(config, "drive", "v3")
                 results = svc.files().list(
                     q=query,
                     pageSize=min(limit, 50),
@@ -1482,7 +2060,7 @@ async def run() -> None:
                     )
                 return "\n".join(lines)
 
-            drive_data = await asyncio.to_thread(_fetch_drive)
+            drive_data = await executors["drive"].run(_fetch_drive)
             return types.GetPromptResult(
                 description=f"Drive search results — query: {query}",
                 messages=[
@@ -1508,9 +2086,14 @@ async def run() -> None:
     # Start server
     # ------------------------------------------------------------------
 
-    async with stdio_server() as (read, write):
-        await server.run(
-            read_stream=read,
-            write_stream=write,
-            initialization_options=server.create_initialization_options(),
-        )
+    try:
+        async with stdio_server() as (read, write):
+            await server.run(
+                read_stream=read,
+                write_stream=write,
+                initialization_options=server.create_initialization_options(),
+            )
+    finally:
+        await aio.aclose()
+        executors.shutdown()
+        transport.close_all()
@@ -0,0 +1,44 @@
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+from googleapiclient.discovery import build
+
+from .auth import get_creds
+from .config import Config
+from .transport import get_http
+
+_services: Dict[Tuple[str, str, str], Tuple[Any, Any]] = {}
+_services_lock = threading.Lock()
+
+
+def get_service(config: Config, api: str, version: str) -> Any:
+    """Return a reusable discovery client for ``api``/``version``.
+
+    ``build()`` parses the discovery document, so clients are built once and
+    shared. All clients of one account use the same pooled keep-alive
+    transport (see :mod:`mcp_google.transport`), which is thread-safe, so a
+    single client per process is enough. A client is rebuilt when the
+    credential manager hands out a different ``Credentials`` object (e.g.
+    after re-auth or an external token change).
+    """
+    creds = get_creds(config)
+    cached = cached_service(config, api, version, creds)
+    if cached is not None:
+        return cached
+
+    key = (api, version, config.token_file)
+    service = build(api, version, http=get_http(config))
+    with _services_lock:
+        _services[key] = (creds, service)
+    return service
+
+
+def cached_service(
+    config: Config, api: str, version: str, creds: Any
+) -> Optional[Any]:
+    """The client :func:`get_service` built for ``creds``, without building one."""
+    with _services_lock:
+        cached = _services.get((api, version, config.token_file))
+    if cached is not None and cached[0] is creds:
+        return cached[1]
+    return None
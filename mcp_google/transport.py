@@ -0,0 +1,143 @@
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+import httplib2
+from google.auth import credentials as ga_credentials
+from google.auth.transport.requests import AuthorizedSession
+from requests.adapters import HTTPAdapter
+
+from .auth import CredentialManager, get_credential_manager
+from .config import Config
+
+# Matches googleapiclient.http.DEFAULT_HTTP_TIMEOUT_SEC.
+REQUEST_TIMEOUT = 60
+# Distinct hosts kept in the pool (www/gmail/sheets/docs/script/oauth2...).
+_POOL_HOSTS = 10
+
+
+class ManagedCredentials(ga_credentials.Credentials):
+    """Credentials view that defers every refresh to a ``CredentialManager``.
+
+    ``AuthorizedSession`` refreshes its credentials itself, before a request
+    with an expired token and again after a 401, on whichever thread gets
+    there first. Routing both through the manager keeps refreshes
+    single-flight and persisted to ``token.json``.
+    """
+
+    def __init__(self, manager: CredentialManager) -> None:
+        super().__init__()
+        self._manager = manager
+        # Token sent by the current thread, so a 401 refreshes only that one.
+        self._local = threading.local()
+
+    def refresh(self, request: Any) -> None:
+        self._manager.refresh_rejected(getattr(self._local, "token", None))
+
+    def before_request(
+        self, request: Any, method: str, url: str, headers: Dict[str, str]
+    ) -> None:
+        creds = self._manager.get()
+        self._local.token = creds.token
+        creds.apply(headers)
+
+
+class PooledHttp:
+    """``httplib2.Http``-compatible transport over a pooled ``AuthorizedSession``.
+
+    googleapiclient only calls ``request()`` on the object passed as ``http``,
+    so this adapter lets discovery clients share one keep-alive urllib3 pool
+    (and its TLS sessions) across all services and threads. Unlike httplib2,
+    the underlying session is safe to use from several threads at once.
+    """
+
+    def __init__(
+        self,
+        credentials: ga_credentials.Credentials,
+        pool_size: int,
+        idle_timeout: float,
+    ) -> None:
+        self._adapter = HTTPAdapter(
+            pool_connections=_POOL_HOSTS, pool_maxsize=pool_size, max_retries=1
+        )
+        self.session = AuthorizedSession(credentials)
+        self.session.mount("https://", self._adapter)
+        self._idle_timeout = idle_timeout
+        self._last_used = time.monotonic()
+        self._lock = threading.Lock()
+
+    def request(
+        self,
+        uri: str,
+        method: str = "GET",
+        body: Any = None,
+        headers: Optional[Dict[str, str]] = None,
+        redirections: int = 5,
+        connection_type: Any = None,
+    ) -> Tuple[httplib2.Response, bytes]:
+        self._expire_idle_connections()
+        resp = self.session.request(
+            method,
+            uri,
+            data=body,
+            headers=headers,
+            allow_redirects=redirections > 0,
+            timeout=REQUEST_TIMEOUT,
+        )
+
+        info = {key.lower(): value for key, value in resp.headers.items()}
+        # requests has already decoded the body; drop headers describing the
+        # encoded form, as httplib2 does.
+        info.pop("content-encoding", None)
+        info.pop("content-length", None)
+        info["status"] = str(resp.status_code)
+        response = httplib2.Response(info)
+        response.reason = resp.reason
+        return response, resp.content
+
+    def close(self) -> None:
+        self.session.close()
+
+    def _expire_idle_connections(self) -> None:
+        """Drop pooled sockets that sat idle longer than the idle timeout.
+
+        Google front ends silently close idle keep-alive connections; reusing
+        one of those costs a failed request instead of a fresh handshake.
+        """
+        with self._lock:
+            now = time.monotonic()
+            if now - self._last_used > self._idle_timeout:
+                self._adapter.poolmanager.clear()
+            self._last_used = now
+
+
+_transports: Dict[str, PooledHttp] = {}
+_transports_lock = threading.Lock()
+
+
+def get_http(config: Config) -> PooledHttp:
+    """Return the shared pooled transport for ``config.token_file``.
+
+    ``ManagedCredentials`` asks the credential manager for the current token
+    on every request, so one transport serves every ``Credentials`` object
+    the manager hands out; services built before a token reload keep
+    working on it. Transports are closed only by :func:`close_all`.
+    """
+    with _transports_lock:
+        http = _transports.get(config.token_file)
+        if http is None:
+            http = _transports[config.token_file] = PooledHttp(
+                ManagedCredentials(get_credential_manager(config)),
+                config.http_pool_size,
+                config.http_idle_timeout,
+            )
+        return http
+
+
+def close_all() -> None:
+    """Close every pooled transport (call at shutdown)."""
+    with _transports_lock:
+        transports = list(_transports.values())
+        _transports.clear()
+    for http in transports:
+        http.close()
@@ -0,0 +1,52 @@
+import asyncio
+
+from mcp_google.cache import ResultCache
+from mcp_google.dispatch import InflightCoalescer, cached_call
+
+
+def test_join_after_write_does_not_store_stale_result():
+    cache = ResultCache(1 << 20)
+    coalescer = InflightCoalescer()
+    tags = ["sheet:x"]
+
+    async def scenario():
+        started = asyncio.Event()
+        release = asyncio.Event()
+        calls = []
+
+        async def read():
+            calls.append(1)
+            started.set()
+            await release.wait()
+            return "old"
+
+        first = asyncio.ensure_future(
+            cached_call(cache, coalescer, "k", tags, 60, read)
+        )
+        await started.wait()
+        cache.invalidate(tags)
+        second = asyncio.ensure_future(
+            cached_call(cache, coalescer, "k", tags, 60, read)
+        )
+        await asyncio.sleep(0)
+        release.set()
+        return await first, await second, len(calls)
+
+    first, second, calls = asyncio.run(scenario())
+
+    assert (first, second, calls) == ("old", "old", 1)
+    assert cache.get("k") == (False, None)
+
+
+def test_read_without_write_is_cached():
+    cache = ResultCache(1 << 20)
+
+    async def read():
+        return "value"
+
+    result = asyncio.run(
+        cached_call(cache, InflightCoalescer(), "k", ["sheet:x"], 60, read)
+    )
+
+    assert result == "value"
+    assert cache.get("k") == (True, "value")